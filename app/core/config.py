@@ -8,22 +8,48 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Tuple
 
 
 @dataclass(frozen=True)
 class AppConfig:
     ollama_host: str = "http://localhost:11434"
     ollama_model: str = "llama3.1"
+    # Ollama keep_alive for the model ("30m", "-1" = forever, "" = server default)
+    ollama_keep_alive: str = "30m"
+    # Extra models raced against ollama_model per message; first valid payload wins
+    fanout_models: Tuple[str, ...] = ()
 
     @staticmethod
     def from_dict(d: dict) -> "AppConfig":
+        keep_alive = d.get("ollama_keep_alive")
         return AppConfig(
             ollama_host=str(d.get("ollama_host") or AppConfig.ollama_host),
             ollama_model=str(d.get("ollama_model") or AppConfig.ollama_model),
+            ollama_keep_alive=(
+                AppConfig.ollama_keep_alive if keep_alive is None else str(keep_alive)
+            ),
+            fanout_models=parse_model_list(d.get("fanout_models")),
         )
 
     def to_dict(self) -> dict:
-        return {"ollama_host": self.ollama_host, "ollama_model": self.ollama_model}
+        return {
+            "ollama_host": self.ollama_host,
+            "ollama_model": self.ollama_model,
+            "ollama_keep_alive": self.ollama_keep_alive,
+            "fanout_models": list(self.fanout_models),
+        }
+
+
+def parse_model_list(value: object) -> Tuple[str, ...]:
+    """Model names from a list or a comma-separated string; blanks and repeats dropped."""
+    if isinstance(value, str):
+        items = value.split(",")
+    elif isinstance(value, (list, tuple)):
+        items = [str(v) for v in value]
+    else:
+        items = []
+    return tuple(dict.fromkeys(m.strip() for m in items if m.strip()))
 
 
 def config_path(project_root: Path) -> Path:
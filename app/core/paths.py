@@ -51,6 +51,14 @@ class ProjectPaths:
     def sessions_dir(self) -> Path:
         return self.root / "data" / "sessions"
 
+    @property
+    def telemetry_dir(self) -> Path:
+        return self.root / "data" / "telemetry"
+
+    @property
+    def response_cache_dir(self) -> Path:
+        return self.root / "data" / "response_cache"
+
 
 DEFAULT_DIRS: tuple[str, ...] = (
     ".vscode",
@@ -0,0 +1,226 @@
+"""
+Local telemetry (data/telemetry).
+
+Counters are kept in memory and merged into data/telemetry/<name>.json on
+flush (every `flush_every` increments, and at interpreter exit). Event logs
+append one JSON object per line to data/telemetry/<name>.jsonl. Nothing leaves
+the machine.
+
+Directory resolution priority:
+1) SWE_TELEMETRY_DIR env var (tests point this at a temp dir)
+2) <project root>/data/telemetry
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional, TextIO
+
+from app.core.paths import get_paths, write_text_atomic
+
+TELEMETRY_DIR_ENV = "SWE_TELEMETRY_DIR"
+
+
+def telemetry_dir() -> Path:
+    env = os.getenv(TELEMETRY_DIR_ENV, "").strip()
+    if env:
+        return Path(env).expanduser()
+    return get_paths().telemetry_dir
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def load_counters(name: str, directory: Optional[Path] = None) -> Dict[str, int]:
+    p = (directory or telemetry_dir()) / f"{name}.json"
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    counts = data.get("counters") if isinstance(data, dict) else None
+    if not isinstance(counts, dict):
+        return {}
+    return {str(k): int(v) for k, v in counts.items() if isinstance(v, int)}
+
+
+def _lock_file(f: TextIO) -> None:
+    if os.name == "nt":
+        import msvcrt
+
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # retries for ~10s, then OSError
+    else:
+        import fcntl
+
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+def _unlock_file(f: TextIO) -> None:
+    if os.name == "nt":
+        import msvcrt
+
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def _interprocess_lock(path: Path) -> Iterator[None]:
+    """Exclusive lock on a sidecar file, held across processes (OSError if unavailable)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a+", encoding="utf-8") as f:
+        _lock_file(f)
+        try:
+            yield
+        finally:
+            _unlock_file(f)
+
+
+class Counters:
+    """
+    Named, thread-safe counters persisted as data/telemetry/<name>.json.
+
+    flush() merges pending increments into the file (read, add, atomic write)
+    under an exclusive lock on <name>.json.lock, so several processes (e.g.
+    validation pool workers) may share one file without losing increments; a
+    crash loses only unflushed counts.
+    """
+
+    def __init__(self, name: str, flush_every: int = 256) -> None:
+        self.name = name
+        self.flush_every = max(1, int(flush_every))
+        self._pending: Dict[str, int] = {}
+        self._pending_total = 0
+        self._lock = threading.Lock()
+
+    def incr(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._pending[key] = self._pending.get(key, 0) + n
+            self._pending_total += n
+            due = self._pending_total >= self.flush_every
+        if due:
+            self.flush()
+
+    def pending(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._pending)
+
+    def discard(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._pending_total = 0
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            self._pending_total = 0
+            try:
+                d = telemetry_dir()
+                with _interprocess_lock(d / f"{self.name}.json.lock"):
+                    merged = load_counters(self.name, d)
+                    for k, v in pending.items():
+                        merged[k] = merged.get(k, 0) + v
+                    doc = {"name": self.name, "updated_utc": _utc_now_iso(), "counters": merged}
+                    write_text_atomic(
+                        d / f"{self.name}.json", json.dumps(doc, indent=2, sort_keys=True) + "\n"
+                    )
+            except OSError:
+                # Telemetry is best-effort; never fail the caller over it.
+                pass
+
+
+class EventLog:
+    """
+    Append-only JSONL log at data/telemetry/<name>.jsonl, one record per line.
+
+    Each append is a single write of one line in append mode, so concurrent
+    writers (threads or processes) do not interleave records.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+
+    def path(self) -> Path:
+        return telemetry_dir() / f"{self.name}.jsonl"
+
+    def append(self, record: Mapping[str, Any]) -> None:
+        line = json.dumps(dict(record), sort_keys=True, ensure_ascii=False) + "\n"
+        with self._lock:
+            try:
+                p = self.path()
+                p.parent.mkdir(parents=True, exist_ok=True)
+                with p.open("a", encoding="utf-8") as f:
+                    f.write(line)
+            except OSError:
+                # Best-effort, like counters.
+                pass
+
+
+def read_events(name: str, directory: Optional[Path] = None) -> Iterator[Dict[str, Any]]:
+    """Records of data/telemetry/<name>.jsonl in order."""
+    return read_jsonl((directory or telemetry_dir()) / f"{name}.jsonl")
+
+
+def read_jsonl(p: Path) -> Iterator[Dict[str, Any]]:
+    """JSON objects of a JSONL file; undecodable lines are skipped, a missing file is empty."""
+    try:
+        f = p.open("r", encoding="utf-8")
+    except OSError:
+        return
+    with f:
+        for line in f:
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(obj, dict):
+                yield obj
+
+
+_REGISTRY: Dict[str, Counters] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def counters(name: str) -> Counters:
+    """Process-wide Counters for `name` (created on first use)."""
+    with _REGISTRY_LOCK:
+        c = _REGISTRY.get(name)
+        if c is None:
+            c = Counters(name)
+            _REGISTRY[name] = c
+        return c
+
+
+_EVENT_LOGS: Dict[str, EventLog] = {}
+
+
+def event_log(name: str) -> EventLog:
+    """Process-wide EventLog for `name` (created on first use)."""
+    with _REGISTRY_LOCK:
+        log = _EVENT_LOGS.get(name)
+        if log is None:
+            log = _EVENT_LOGS[name] = EventLog(name)
+        return log
+
+
+def flush_all() -> None:
+    with _REGISTRY_LOCK:
+        regs = list(_REGISTRY.values())
+    for c in regs:
+        c.flush()
+
+
+atexit.register(flush_all)
@@ -18,6 +18,10 @@ from typing import Any, Dict, List, Optional
 # }
 
 
+# Action types the GUI will act on.
+ALLOWED_ACTION_TYPES = frozenset({"file_write", "verify", "open", "message"})
+
+
 @dataclass(frozen=True)
 class FileBlock:
     path: str
@@ -94,6 +98,26 @@ def parse_engineer_payload(text: str) -> Optional[EngineerPayload]:
     return EngineerPayload(final_message=final_message, actions=actions)
 
 
+def accept_engineer_payload(
+    text: str, allowed: frozenset = ALLOWED_ACTION_TYPES
+) -> Optional[EngineerPayload]:
+    """
+    The parsed payload if the reply is usable as-is: valid JSON payload, every
+    action type whitelisted, every file_write with a path and string content.
+    """
+    payload = parse_engineer_payload(text)
+    if payload is None:
+        return None
+    for a in payload.actions:
+        if a.type not in allowed:
+            return None
+        if a.type == "file_write":
+            p = a.data.get("path")
+            if not (isinstance(p, str) and p.strip()) or not isinstance(a.data.get("content"), str):
+                return None
+    return payload
+
+
 def extract_file_blocks_from_markdown(text: str) -> List[FileBlock]:
     blocks: List[FileBlock] = []
     text = text or ""
@@ -0,0 +1,99 @@
+# File: C:\Dev\CCP\SWEngineer\app\engine\cancel.py
+"""
+Stopping an engine call from another thread.
+
+A sync Engine request blocked in a socket read (model still loading, prompt
+still being evaluated, no token yet) cannot be interrupted from outside; a stop
+flag checked in on_token only takes effect at the next fragment. The calls here
+run the AsyncEngine counterpart on a private event loop instead, and
+CancelScope.cancel() - from any thread - cancels that loop's task, which aborts
+the in-flight httpx request at once. run() then raises CallCancelled.
+
+    scope = CancelScope()
+    reply = send_user(engine, text, scope, on_token=show)   # worker thread
+    scope.cancel()                                         # GUI thread
+
+Like fan_out(), the turn runs on engine.fork_async() and is recorded in engine's
+history only when it completes; a stopped turn leaves the history unchanged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Awaitable, Callable, Optional, Tuple, TypeVar
+
+from app.engine.engine import Engine
+from app.engine.transport import aclose_shared_async_client
+
+T = TypeVar("T")
+
+
+class CallCancelled(Exception):
+    """CancelScope.cancel() stopped the call."""
+
+
+class CancelScope:
+    """A cancel() handle for calls run() on a private event loop (one call at a time)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        """Abort the running call (and refuse later ones). Safe from any thread."""
+        with self._lock:
+            self._cancelled = True
+            loop, task = self._loop, self._task
+        if loop is not None and task is not None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # loop already closed: the call has finished
+
+    def run(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Blocking: await fn() on a fresh event loop. Call it from a worker thread, not a running loop."""
+
+        async def main() -> T:
+            with self._lock:
+                if self._cancelled:
+                    raise CallCancelled()
+                self._loop, self._task = asyncio.get_running_loop(), asyncio.current_task()
+            try:
+                return await fn()
+            finally:
+                with self._lock:
+                    self._loop = self._task = None
+                await aclose_shared_async_client()
+
+        try:
+            return asyncio.run(main())
+        except asyncio.CancelledError:
+            if self._cancelled:
+                raise CallCancelled() from None
+            raise
+
+
+def send_user(
+    engine: Engine,
+    text: str,
+    scope: CancelScope,
+    *,
+    on_token: Optional[Callable[[str], None]] = None,
+) -> str:
+    """engine.send_user(text, on_token=on_token) that scope.cancel() stops mid-request."""
+    fork = engine.fork_async()
+    reply = scope.run(lambda: fork.send_user(text, on_token=on_token))
+    engine.record_turn(text, reply)
+    return reply
+
+
+def health(engine: Engine, scope: CancelScope) -> Tuple[bool, str]:
+    """engine.health() that scope.cancel() stops mid-request."""
+    return scope.run(lambda: engine.fork_async().health())
@@ -1,12 +1,42 @@
 # File: C:\Dev\CCP\SWEngineer\app\engine\engine.py
 from __future__ import annotations
 
+import asyncio
 import os
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from contextlib import aclosing, closing
+from dataclasses import dataclass, replace
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
 
 import httpx
 
+from app.engine.history import HistoryBudget, compact_history
+from app.engine.inference_telemetry import record_inference
+from app.engine.residency import (
+    DEFAULT_KEEP_ALIVE,
+    KeepAlive,
+    ResidencyResult,
+    keep_alive_value,
+    loaded_models,
+    preload_model,
+    unload_model,
+)
+from app.engine.retry import (
+    RetryCall,
+    RetryPolicy,
+    arun_with_retry,
+    circuit_breaker,
+    run_with_retry,
+)
+from app.engine.transport import (
+    aiter_ndjson,
+    aopen_stream,
+    iter_ndjson,
+    open_stream,
+    request_timeout,
+    shared_async_client,
+    shared_client,
+)
+
 _JSON_ONLY_SYSTEM_PROMPT = (
     "You are a local AI software engineer.\n"
     "You MUST respond with ONLY a single JSON object (no markdown, no code fences, no extra text).\n"
@@ -31,9 +61,17 @@ class EngineConfig:
     ollama_model: str = "llama3.1"
     system_prompt: str = _JSON_ONLY_SYSTEM_PROMPT
     timeout_seconds: float = 120.0
+    # Prompt-size budget for the resent history (see app.engine.history).
+    history: HistoryBudget = HistoryBudget()
+    # How long Ollama keeps the model resident after each request (see app.engine.residency).
+    keep_alive: KeepAlive = DEFAULT_KEEP_ALIVE
+    # Retries for connect errors / 5xx (see app.engine.retry); NO_RETRY disables.
+    retry: RetryPolicy = RetryPolicy()
+
 
+class _Conversation:
+    """Config resolution, history and request shape shared by Engine and AsyncEngine."""
 
-class Engine:
     def __init__(self, config: Optional[EngineConfig] = None) -> None:
         base = config or EngineConfig()
         self.config = EngineConfig(
@@ -41,6 +79,9 @@ class Engine:
             ollama_model=os.getenv("OLLAMA_MODEL", base.ollama_model),
             system_prompt=os.getenv("ENGINEER_SYSTEM_PROMPT", base.system_prompt),
             timeout_seconds=base.timeout_seconds,
+            history=base.history,
+            keep_alive=keep_alive_value(base.keep_alive),
+            retry=base.retry,
         )
         self._messages: List[Dict[str, str]] = []
         self.reset()
@@ -48,47 +89,321 @@ class Engine:
     def reset(self) -> None:
         self._messages = [{"role": "system", "content": self.config.system_prompt}]
 
-    def health(self) -> Tuple[bool, str]:
-        url = self._join("/api/tags")
-        try:
-            with httpx.Client(timeout=self.config.timeout_seconds) as client:
-                r = client.get(url)
-                if r.status_code >= 400:
-                    return False, f"{r.status_code} {r.text}"
-            return True, "OK"
-        except Exception as e:
-            return False, str(e)
+    def fork_async(
+        self, model: Optional[str] = None, *, client: Optional[httpx.AsyncClient] = None
+    ) -> "AsyncEngine":
+        """An AsyncEngine with this conversation's history, optionally on another model."""
+        eng = AsyncEngine(self.config, client=client)
+        # Set after __init__ so env overrides do not replace the requested model.
+        eng.config = replace(self.config, ollama_model=model or self.config.ollama_model)
+        eng._messages = [dict(m) for m in self._messages]
+        return eng
+
+    def record_turn(self, text: str, reply: str) -> None:
+        """Add a turn answered elsewhere (e.g. by a fan-out race) to the history."""
+        if self._begin_turn(text):
+            self._finish_turn(reply)
 
-    def send_user(self, text: str) -> str:
+    def _begin_turn(self, text: str) -> bool:
         text = (text or "").strip()
         if not text:
-            return ""
-
+            return False
         self._messages.append({"role": "user", "content": text})
+        # Bound what gets resent: strip old file bodies, fold old turns into a summary.
+        self._messages = compact_history(self._messages, self.config.history)
+        return True
+
+    def _finish_turn(self, content: str) -> str:
+        content = (content or "").strip()
+        if content:
+            self._messages.append({"role": "assistant", "content": content})
+        return content
 
+    def _chat_payload(self, stream: bool) -> Dict[str, Any]:
         payload: Dict[str, Any] = {
             "model": self.config.ollama_model,
             "messages": self._messages,
-            "stream": False,
+            "stream": stream,
         }
+        if self.config.keep_alive is not None:
+            payload["keep_alive"] = self.config.keep_alive
+        return payload
 
-        url = self._join("/api/chat")
-        try:
-            with httpx.Client(timeout=self.config.timeout_seconds) as client:
-                r = client.post(url, json=payload)
-                r.raise_for_status()
-                data = r.json()
-        except Exception as e:
-            raise RuntimeError(f"Ollama request failed: {e}") from e
+    def _retry_call(self, deadline: Optional[float] = None) -> RetryCall:
+        return RetryCall(self.config.retry, circuit_breaker(self.config.ollama_host), deadline)
 
-        msg = data.get("message") or {}
-        content = (msg.get("content") or "").strip()
-        if content:
-            self._messages.append({"role": "assistant", "content": content})
-        return content
+    def _record(self, raw: Dict[str, Any], call: RetryCall, *, stream: bool) -> None:
+        record_inference(
+            raw,
+            model=self.config.ollama_model,
+            host=self.config.ollama_host,
+            source="engine",
+            stream=stream,
+            wall_seconds=call.elapsed(),
+            attempts=call.attempts,
+        )
 
     def _join(self, path: str) -> str:
         host = (self.config.ollama_host or "").rstrip("/")
         if not path.startswith("/"):
             path = "/" + path
         return host + path
+
+
+class Engine(_Conversation):
+    def __init__(
+        self, config: Optional[EngineConfig] = None, *, client: Optional[httpx.Client] = None
+    ) -> None:
+        super().__init__(config)
+        # None = the process-wide pooled client (app.engine.transport)
+        self._client = client
+
+    def health(self) -> Tuple[bool, str]:
+        url = self._join("/api/tags")
+        try:
+            r = self._http().get(url, timeout=request_timeout(self.config.timeout_seconds))
+            if r.status_code >= 400:
+                return False, f"{r.status_code} {r.text}"
+            return True, "OK"
+        except Exception as e:
+            return False, str(e)
+
+    def preload(self) -> ResidencyResult:
+        """Load the configured model now so the first turn does not pay the load."""
+        return preload_model(
+            self.config.ollama_host,
+            self.config.ollama_model,
+            keep_alive=self.config.keep_alive,
+            timeout=max(self.config.timeout_seconds, 300.0),
+            client=self._client,
+        )
+
+    def unload(self) -> ResidencyResult:
+        """Evict the configured model from the server's memory."""
+        return unload_model(
+            self.config.ollama_host,
+            self.config.ollama_model,
+            timeout=self.config.timeout_seconds,
+            client=self._client,
+        )
+
+    def is_resident(self) -> bool:
+        names = loaded_models(self.config.ollama_host, client=self._client)
+        model = self.config.ollama_model
+        return any(n == model or n.split(":", 1)[0] == model for n in names)
+
+    def send_user(
+        self,
+        text: str,
+        *,
+        on_token: Optional[Callable[[str], None]] = None,
+        deadline: Optional[float] = None,
+    ) -> str:
+        """
+        Send a user turn and return the assistant reply.
+
+        With on_token, the reply is streamed and on_token is called with each
+        content fragment as it arrives; the return value is the same full reply.
+
+        Connect errors and 5xx responses are retried with backoff (config.retry);
+        deadline (seconds) bounds the retries and cuts each attempt's timeout.
+        """
+        if on_token is not None:
+            parts: List[str] = []
+            # closing(): if on_token raises (e.g. a GUI stop request) the
+            # connection is released and the turn rolled back right away.
+            with closing(self.stream_user(text, deadline=deadline)) as stream:
+                for delta in stream:
+                    parts.append(delta)
+                    on_token(delta)
+            return "".join(parts).strip()
+
+        if not self._begin_turn(text):
+            return ""
+
+        url = self._join("/api/chat")
+
+        def attempt(call: RetryCall) -> Dict[str, Any]:
+            timeout = request_timeout(call.timeout(self.config.timeout_seconds))
+            r = self._http().post(url, json=self._chat_payload(False), timeout=timeout)
+            r.raise_for_status()
+            return r.json()
+
+        call = self._retry_call(deadline)
+        try:
+            data = run_with_retry(attempt, call, self.health)
+        except Exception as e:
+            raise RuntimeError(f"Ollama request failed: {e}") from e
+
+        self._record(data, call, stream=False)
+        msg = data.get("message") or {}
+        return self._finish_turn(msg.get("content") or "")
+
+    def stream_user(self, text: str, *, deadline: Optional[float] = None) -> Iterator[str]:
+        """
+        Streaming send_user: yields content fragments from Ollama's NDJSON chunks
+        as they arrive. The assembled reply joins the history when the stream ends;
+        a stream that fails or is closed early drops the unanswered user turn.
+
+        Only opening the stream is retried; once a fragment was yielded an error
+        ends the turn.
+        """
+        if not self._begin_turn(text):
+            return
+        mark = len(self._messages) - 1
+
+        url = self._join("/api/chat")
+        parts: List[str] = []
+
+        def attempt(call: RetryCall) -> httpx.Response:
+            timeout = request_timeout(call.timeout(self.config.timeout_seconds))
+            return open_stream(self._http(), url, json=self._chat_payload(True), timeout=timeout)
+
+        call = self._retry_call(deadline)
+        try:
+            with closing(run_with_retry(attempt, call, self.health)) as r:
+                for chunk in iter_ndjson(r):
+                    delta = _chunk_delta(chunk)
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+                    if chunk.get("done"):
+                        self._record(chunk, call, stream=True)
+                        break
+        except BaseException as e:
+            # Includes a mid-stream error and the consumer abandoning the stream.
+            del self._messages[mark:]
+            if isinstance(e, Exception):
+                raise RuntimeError(f"Ollama request failed: {e}") from e
+            raise
+
+        self._finish_turn("".join(parts))
+
+    def _http(self) -> httpx.Client:
+        return self._client if self._client is not None else shared_client()
+
+
+class AsyncEngine(_Conversation):
+    """
+    asyncio counterpart of Engine on httpx.AsyncClient.
+
+    - Cancellation: cancelling the awaiting task aborts the in-flight request.
+    - Deadlines: send_user(deadline=seconds) bounds the whole turn, streaming
+      included, and raises TimeoutError when exceeded.
+    - A cancelled, timed-out or failed turn is rolled back from the history, so
+      the conversation can simply be retried.
+    - Connect errors and 5xx responses are retried with backoff as in Engine;
+      the backoff counts against the deadline.
+
+    Several AsyncEngine instances (one per conversation) can run concurrently on
+    one loop; they share that loop's pooled AsyncClient unless given a client.
+    """
+
+    def __init__(
+        self, config: Optional[EngineConfig] = None, *, client: Optional[httpx.AsyncClient] = None
+    ) -> None:
+        super().__init__(config)
+        self._client = client
+
+    async def health(self) -> Tuple[bool, str]:
+        url = self._join("/api/tags")
+        try:
+            r = await self._http().get(url, timeout=request_timeout(self.config.timeout_seconds))
+            if r.status_code >= 400:
+                return False, f"{r.status_code} {r.text}"
+            return True, "OK"
+        except Exception as e:
+            return False, str(e)
+
+    async def send_user(
+        self,
+        text: str,
+        *,
+        on_token: Optional[Callable[[str], None]] = None,
+        deadline: Optional[float] = None,
+    ) -> str:
+        """Async send_user; see Engine.send_user. deadline is in seconds for the whole turn."""
+        async with asyncio.timeout(deadline):
+            if on_token is not None:
+                parts: List[str] = []
+                async with aclosing(self.stream_user(text)) as stream:
+                    async for delta in stream:
+                        parts.append(delta)
+                        on_token(delta)
+                return "".join(parts).strip()
+            return await self._send(text)
+
+    async def _send(self, text: str) -> str:
+        if not self._begin_turn(text):
+            return ""
+        mark = len(self._messages) - 1
+
+        url = self._join("/api/chat")
+
+        async def attempt(call: RetryCall) -> Dict[str, Any]:
+            timeout = request_timeout(self.config.timeout_seconds)
+            r = await self._http().post(url, json=self._chat_payload(False), timeout=timeout)
+            r.raise_for_status()
+            return r.json()
+
+        call = self._retry_call()
+        try:
+            data = await arun_with_retry(attempt, call, self.health)
+        except BaseException as e:
+            del self._messages[mark:]
+            if isinstance(e, Exception):
+                raise RuntimeError(f"Ollama request failed: {e}") from e
+            raise
+
+        self._record(data, call, stream=False)
+        msg = data.get("message") or {}
+        return self._finish_turn(msg.get("content") or "")
+
+    async def stream_user(self, text: str) -> AsyncIterator[str]:
+        """
+        Async streaming send_user. For a deadline, iterate inside
+        asyncio.timeout() or use send_user(on_token=..., deadline=...).
+        """
+        if not self._begin_turn(text):
+            return
+        mark = len(self._messages) - 1
+
+        url = self._join("/api/chat")
+        parts: List[str] = []
+
+        async def attempt(call: RetryCall) -> httpx.Response:
+            timeout = request_timeout(self.config.timeout_seconds)
+            return await aopen_stream(
+                self._http(), url, json=self._chat_payload(True), timeout=timeout
+            )
+
+        call = self._retry_call()
+        try:
+            r = await arun_with_retry(attempt, call, self.health)
+            async with aclosing(r):
+                async for chunk in aiter_ndjson(r):
+                    delta = _chunk_delta(chunk)
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+                    if chunk.get("done"):
+                        self._record(chunk, call, stream=True)
+                        break
+        except BaseException as e:
+            # Includes cancellation and the consumer abandoning the stream.
+            del self._messages[mark:]
+            if isinstance(e, Exception):
+                raise RuntimeError(f"Ollama request failed: {e}") from e
+            raise
+
+        self._finish_turn("".join(parts))
+
+    def _http(self) -> httpx.AsyncClient:
+        return self._client if self._client is not None else shared_async_client()
+
+
+def _chunk_delta(chunk: Dict[str, Any]) -> str:
+    """Content fragment of one NDJSON chat chunk; an error chunk raises."""
+    if chunk.get("error"):
+        raise RuntimeError(str(chunk["error"]))
+    return (chunk.get("message") or {}).get("content") or ""
@@ -0,0 +1,163 @@
+# File: C:\Dev\CCP\SWEngineer\app\engine\fanout.py
+"""
+Multi-model fan-out: first valid payload wins.
+
+The same user turn is sent concurrently to several local models (one
+AsyncEngine fork of the conversation per model). The first reply the accept
+predicate approves wins - by default it must parse as an engineer payload and
+pass the action whitelist (app.engine.actions.accept_engineer_payload) - and
+every other request is cancelled. Replies that fail the check do not end the
+race; the remaining models keep going.
+
+Small models answer fast but often emit invalid JSON; racing them against a
+larger model keeps the latency of the fast ones without losing the reliability
+of the slow one.
+
+    result = fan_out(engine, "Write hello.py", ["qwen2.5-coder:1.5b", "llama3.1"])
+    if result.ok:
+        print(result.model, result.seconds, result.reply)
+
+Only the winning turn is recorded in the caller's Engine history.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from app.engine.actions import accept_engineer_payload
+from app.engine.engine import AsyncEngine, Engine
+from app.engine.transport import aclose_shared_async_client
+
+# How often poll() runs while the race is waiting (seconds).
+POLL_INTERVAL = 0.1
+
+
+@dataclass(frozen=True)
+class FanoutAttempt:
+    model: str
+    ok: bool
+    seconds: float = 0.0
+    error: Optional[str] = None
+    cancelled: bool = False
+    reply: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class FanoutResult:
+    reply: Optional[str]
+    model: Optional[str]
+    seconds: float
+    # One entry per model, in the order the models were given.
+    attempts: Tuple[FanoutAttempt, ...] = ()
+
+    @property
+    def ok(self) -> bool:
+        return self.reply is not None
+
+
+async def _attempt(
+    model: str, engine: AsyncEngine, text: str, accept: Callable[[str], Any], t0: float
+) -> FanoutAttempt:
+    try:
+        reply = await engine.send_user(text)
+    except Exception as e:
+        return FanoutAttempt(model, False, round(time.perf_counter() - t0, 3), error=str(e))
+    seconds = round(time.perf_counter() - t0, 3)
+    if not accept(reply):
+        return FanoutAttempt(model, False, seconds, error="reply rejected", reply=reply)
+    return FanoutAttempt(model, True, seconds, reply=reply)
+
+
+async def race_models(
+    engines: Dict[str, AsyncEngine],
+    text: str,
+    *,
+    accept: Callable[[str], Any] = accept_engineer_payload,
+    deadline: Optional[float] = None,
+    poll: Optional[Callable[[], None]] = None,
+) -> FanoutResult:
+    """
+    Send text to every engine at once; return the first accepted reply.
+
+    deadline bounds the whole race (seconds). poll, if given, is called every
+    POLL_INTERVAL while waiting; an exception from it cancels the race and
+    propagates (used by the GUI Stop button).
+    """
+    t0 = time.perf_counter()
+    tasks = {
+        asyncio.create_task(_attempt(m, eng, text, accept, t0), name=f"fanout:{m}"): m
+        for m, eng in engines.items()
+    }
+    finished: Dict[str, FanoutAttempt] = {}
+    winner: Optional[FanoutAttempt] = None
+    timed_out = False
+    try:
+        async with asyncio.timeout(deadline):
+            pending = set(tasks)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=POLL_INTERVAL if poll is not None else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if poll is not None:
+                    poll()
+                for t in done:
+                    a = t.result()
+                    finished[a.model] = a
+                    if a.ok and (winner is None or a.seconds < winner.seconds):
+                        winner = a
+    except TimeoutError:
+        timed_out = True
+    finally:
+        for t in tasks:
+            if not t.done():
+                t.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+
+    seconds = round(time.perf_counter() - t0, 3)
+    reason = f"deadline of {deadline}s exceeded" if timed_out else "cancelled"
+    attempts = tuple(
+        finished.get(m) or FanoutAttempt(m, False, seconds, error=reason, cancelled=True)
+        for m in engines
+    )
+    if winner is None:
+        return FanoutResult(None, None, seconds, attempts)
+    return FanoutResult(winner.reply, winner.model, winner.seconds, attempts)
+
+
+def fan_out(
+    engine: Engine,
+    text: str,
+    models: Iterable[str],
+    *,
+    accept: Callable[[str], Any] = accept_engineer_payload,
+    deadline: Optional[float] = None,
+    poll: Optional[Callable[[], None]] = None,
+) -> FanoutResult:
+    """
+    Blocking fan-out of one turn of engine's conversation across models.
+
+    Runs its own event loop, so call it from a worker thread, not a running
+    loop. The winning turn is appended to engine's history; if no model wins the
+    history is left unchanged.
+    """
+    names = list(dict.fromkeys(m.strip() for m in models if m and m.strip()))
+    if not names:
+        raise ValueError("fan_out needs at least one model")
+
+    async def run() -> FanoutResult:
+        try:
+            engines = {m: engine.fork_async(m) for m in names}
+            return await race_models(engines, text, accept=accept, deadline=deadline, poll=poll)
+        finally:
+            await aclose_shared_async_client()
+
+    result = asyncio.run(run())
+    if result.reply is not None:
+        engine.record_turn(text, result.reply)
+    return result
@@ -0,0 +1,184 @@
+# File: C:\Dev\CCP\SWEngineer\app\engine\history.py
+"""
+Token-budgeted conversation history for Engine / AsyncEngine.
+
+The whole history is resent on every /api/chat call, so prompt evaluation cost
+grows with each turn unless the history is bounded. compact_history() keeps the
+prompt roughly constant:
+
+1. File contents in earlier Engineer replies (file_write actions, "# File:"
+   fenced blocks) are replaced by a short placeholder; the files are on disk.
+2. If the history is still over budget, the oldest turns are dropped and folded
+   into one extractive summary note (user asks, Engineer final messages, files
+   written) kept right after the system prompt and itself capped in size.
+
+The system prompt and the newest message are always kept. Token counts are a
+fast approximation (approx_tokens), good enough for budgeting.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from app.engine.actions import extract_json_object
+
+Message = Dict[str, str]
+
+SUMMARY_HEADER = "[Summary of earlier conversation]"
+# Per-message framing overhead (role, separators) in the chat template.
+_MESSAGE_OVERHEAD = 4
+_STRIP_MIN_CHARS = 200
+_FILE_FENCE_RE = re.compile(
+    r"```[a-zA-Z0-9_+\-]*\n(#\s*file:[^\n]*)\n(.*?)```", flags=re.DOTALL | re.IGNORECASE
+)
+
+
+@dataclass(frozen=True)
+class HistoryBudget:
+    # Approximate prompt tokens for the whole history; 0 = unbounded.
+    max_tokens: int = 8192
+    # Cap for the summary note of dropped turns.
+    summary_tokens: int = 512
+    strip_file_writes: bool = True
+
+
+def approx_tokens(text: str) -> int:
+    """~4 characters per token (code/English average for llama-family tokenizers)."""
+    return (len(text) + 3) // 4
+
+
+def message_tokens(message: Message) -> int:
+    return approx_tokens(message.get("content") or "") + _MESSAGE_OVERHEAD
+
+
+def history_tokens(messages: List[Message]) -> int:
+    return sum(message_tokens(m) for m in messages)
+
+
+def _omitted(content: str) -> str:
+    return f"<{content.count(chr(10)) + 1} lines / {len(content)} chars omitted>"
+
+
+def strip_file_contents(content: str) -> str:
+    """Replace file bodies in an Engineer reply with placeholders (paths kept)."""
+    obj = extract_json_object(content)
+    if obj is not None and isinstance(obj.get("actions"), list):
+        changed = False
+        for a in obj["actions"]:
+            if not isinstance(a, dict) or a.get("type") != "file_write":
+                continue
+            body = a.get("content")
+            if isinstance(body, str) and len(body) >= _STRIP_MIN_CHARS:
+                a["content"] = _omitted(body)
+                changed = True
+        return json.dumps(obj, ensure_ascii=False) if changed else content
+
+    def fence(m: "re.Match[str]") -> str:
+        body = m.group(2)
+        if len(body) < _STRIP_MIN_CHARS:
+            return m.group(0)
+        return f"```\n{m.group(1)}\n{_omitted(body)}\n```"
+
+    return _FILE_FENCE_RE.sub(fence, content)
+
+
+def _summary_lines(dropped: List[Message]) -> List[str]:
+    lines: List[str] = []
+    for m in dropped:
+        text = (m.get("content") or "").strip()
+        if m.get("role") == "user":
+            lines.append("- user: " + _clip(text))
+            continue
+        obj = extract_json_object(text)
+        if obj is None:
+            lines.append("- engineer: " + _clip(text))
+            continue
+        final = obj.get("final_message")
+        paths = [
+            str(a.get("path"))
+            for a in obj.get("actions") or []
+            if isinstance(a, dict) and a.get("type") == "file_write" and a.get("path")
+        ]
+        line = "- engineer: " + _clip(final if isinstance(final, str) else "")
+        if paths:
+            line += " (wrote " + ", ".join(paths) + ")"
+        lines.append(line)
+    return lines
+
+
+def _clip(text: str, limit: int = 160) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def _split_summary(rest: List[Message]) -> Tuple[List[str], List[Message]]:
+    if (
+        rest
+        and rest[0].get("role") == "system"
+        and (rest[0].get("content") or "").startswith(SUMMARY_HEADER)
+    ):
+        body = rest[0]["content"][len(SUMMARY_HEADER) :].strip()
+        return [ln for ln in body.splitlines() if ln.strip()], rest[1:]
+    return [], rest
+
+
+def _summary_message(lines: List[str], max_tokens: int) -> Optional[Message]:
+    # Newest lines win when the note is over its cap.
+    kept: List[str] = []
+    used = approx_tokens(SUMMARY_HEADER) + _MESSAGE_OVERHEAD
+    for ln in reversed(lines):
+        cost = approx_tokens(ln) + 1
+        if used + cost > max_tokens:
+            break
+        kept.append(ln)
+        used += cost
+    if not kept:
+        return None
+    return {"role": "system", "content": SUMMARY_HEADER + "\n" + "\n".join(reversed(kept))}
+
+
+def compact_history(messages: List[Message], budget: HistoryBudget) -> List[Message]:
+    """
+    Return a history that fits budget.max_tokens (approximately). messages[0] is
+    the system prompt; the last message is always kept verbatim.
+    """
+    if not messages:
+        return []
+    system, rest = messages[0], list(messages[1:])
+    prior, rest = _split_summary(rest)
+
+    if budget.strip_file_writes:
+        last = len(rest) - 1
+        rest = [
+            (
+                {**m, "content": strip_file_contents(m.get("content") or "")}
+                if m.get("role") == "assistant" and i != last
+                else m
+            )
+            for i, m in enumerate(rest)
+        ]
+
+    if budget.max_tokens <= 0:
+        note = _summary_message(prior, budget.summary_tokens) if prior else None
+        return [system] + ([note] if note else []) + rest
+
+    summary_cap = min(budget.summary_tokens, max(0, budget.max_tokens // 4))
+    fixed = message_tokens(system) + summary_cap
+    total = fixed + history_tokens(rest)
+    dropped: List[Message] = []
+    while total > budget.max_tokens and len(rest) > 1:
+        m = rest.pop(0)
+        dropped.append(m)
+        total -= message_tokens(m)
+        # Drop whole exchanges so the window starts at a user turn.
+        while len(rest) > 1 and rest[0].get("role") == "assistant":
+            m = rest.pop(0)
+            dropped.append(m)
+            total -= message_tokens(m)
+
+    lines = prior + _summary_lines(dropped)
+    note = _summary_message(lines, summary_cap) if lines else None
+    return [system] + ([note] if note else []) + rest
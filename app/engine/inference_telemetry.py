@@ -0,0 +1,285 @@
+# File: C:\Dev\CCP\SWEngineer\app\engine\inference_telemetry.py
+"""
+Per-request inference telemetry from Ollama response metadata.
+
+Every /api/chat reply (the final chunk, when streamed) carries the server's own
+timings: total_duration, load_duration, prompt_eval_count/_duration and
+eval_count/_duration (nanoseconds). Engine, AsyncEngine and OllamaProvider
+append one record per request to data/telemetry/inference.jsonl:
+
+  {"ts": ..., "source": "engine", "model": "llama3.1", "host": ..., "stream": true,
+   "attempts": 1, "wall_s": 3.21, "total_s": 3.18, "load_s": 0.02,
+   "prompt_eval_count": 812, "prompt_eval_s": 0.41, "eval_count": 240, "eval_s": 2.7,
+   "done_reason": "stop"}
+
+Durations are in seconds; a field the server did not send is null. Replies
+served from the response cache are not inference and are not recorded.
+SWE_INFERENCE_TELEMETRY=0 turns recording off.
+
+summarize() reduces the log to per-model percentiles: generation and prompt
+tokens/sec, prompt-eval time, load time, and the share of server time spent
+loading, evaluating the prompt and generating.
+
+CLI:
+  python -m app.engine.inference_telemetry [--path <inference.jsonl>] [--model M]
+                                           [--since <ISO time>] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from app.core import telemetry
+
+INFERENCE_TELEMETRY = "inference"
+INFERENCE_TELEMETRY_ENV = "SWE_INFERENCE_TELEMETRY"
+# A load longer than this means the model was not resident.
+COLD_LOAD_SECONDS = 0.5
+
+_DURATIONS = {
+    "total_s": "total_duration",
+    "load_s": "load_duration",
+    "prompt_eval_s": "prompt_eval_duration",
+    "eval_s": "eval_duration",
+}
+_COUNTS = ("prompt_eval_count", "eval_count")
+
+
+def inference_telemetry_enabled() -> bool:
+    return os.getenv(INFERENCE_TELEMETRY_ENV, "").strip().lower() not in ("0", "off", "false", "no")
+
+
+def _seconds(ns: Any) -> Optional[float]:
+    if isinstance(ns, bool) or not isinstance(ns, (int, float)):
+        return None
+    return round(ns / 1e9, 4)
+
+
+def inference_record(
+    raw: Mapping[str, Any],
+    *,
+    model: str,
+    host: str,
+    source: str,
+    stream: bool,
+    wall_seconds: float,
+    attempts: int = 1,
+) -> Dict[str, Any]:
+    """One log record from a reply's raw metadata (the done chunk when streamed)."""
+    rec: Dict[str, Any] = {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "source": source,
+        "model": str(raw.get("model") or model),
+        "host": host,
+        "stream": stream,
+        "attempts": attempts,
+        "wall_s": round(wall_seconds, 4),
+    }
+    for key, field in _DURATIONS.items():
+        rec[key] = _seconds(raw.get(field))
+    for field in _COUNTS:
+        v = raw.get(field)
+        rec[field] = v if isinstance(v, int) and not isinstance(v, bool) else None
+    rec["done_reason"] = raw.get("done_reason")
+    return rec
+
+
+def record_inference(raw: Mapping[str, Any], **fields: Any) -> None:
+    """Append inference_record(raw, **fields) to data/telemetry/inference.jsonl."""
+    if not inference_telemetry_enabled():
+        return
+    telemetry.event_log(INFERENCE_TELEMETRY).append(inference_record(raw, **fields))
+
+
+def read_inference(path: Optional[Path] = None) -> Iterable[Dict[str, Any]]:
+    if path is None:
+        return telemetry.read_events(INFERENCE_TELEMETRY)
+    return telemetry.read_jsonl(path)
+
+
+# ---------- summary ----------
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """Linear-interpolated q-th percentile (0..100); None for no values."""
+    if not values:
+        return None
+    xs = sorted(values)
+    pos = (len(xs) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(xs) - 1)
+    return xs[lo] + (xs[hi] - xs[lo]) * (pos - lo)
+
+
+@dataclass(frozen=True)
+class Percentiles:
+    n: int
+    p50: Optional[float]
+    p90: Optional[float]
+    p99: Optional[float]
+
+    @staticmethod
+    def of(values: Sequence[float]) -> "Percentiles":
+        p50, p90, p99 = (percentile(values, q) for q in (50, 90, 99))
+        return Percentiles(
+            len(values),
+            *(None if v is None else round(v, 3) for v in (p50, p90, p99)),
+        )
+
+
+@dataclass(frozen=True)
+class ModelSummary:
+    model: str
+    requests: int
+    cold_loads: int
+    gen_tokens_per_s: Percentiles
+    prompt_tokens_per_s: Percentiles
+    prompt_eval_s: Percentiles
+    load_s: Percentiles
+    wall_s: Percentiles
+    # Fractions of summed server time (total_duration): load, prompt_eval, eval, other.
+    share: Dict[str, float]
+
+
+def _rate(count: Any, seconds: Any) -> Optional[float]:
+    if isinstance(count, int) and isinstance(seconds, (int, float)) and seconds > 0:
+        return count / seconds
+    return None
+
+
+def _present(values: Iterable[Optional[float]]) -> List[float]:
+    return [v for v in values if isinstance(v, (int, float))]
+
+
+def summarize_model(model: str, records: Sequence[Mapping[str, Any]]) -> ModelSummary:
+    loads = _present(r.get("load_s") for r in records)
+    total = sum(_present(r.get("total_s") for r in records))
+    share: Dict[str, float] = {}
+    if total > 0:
+        parts = {
+            k: sum(_present(r.get(f"{k}_s") for r in records))
+            for k in ("load", "prompt_eval", "eval")
+        }
+        share = {k: round(v / total, 3) for k, v in parts.items()}
+        share["other"] = round(max(0.0, 1.0 - sum(share.values())), 3)
+    return ModelSummary(
+        model=model,
+        requests=len(records),
+        cold_loads=sum(1 for v in loads if v >= COLD_LOAD_SECONDS),
+        gen_tokens_per_s=Percentiles.of(
+            _present(_rate(r.get("eval_count"), r.get("eval_s")) for r in records)
+        ),
+        prompt_tokens_per_s=Percentiles.of(
+            _present(_rate(r.get("prompt_eval_count"), r.get("prompt_eval_s")) for r in records)
+        ),
+        prompt_eval_s=Percentiles.of(_present(r.get("prompt_eval_s") for r in records)),
+        load_s=Percentiles.of(loads),
+        wall_s=Percentiles.of(_present(r.get("wall_s") for r in records)),
+        share=share,
+    )
+
+
+def summarize(
+    records: Iterable[Mapping[str, Any]],
+    *,
+    model: Optional[str] = None,
+    since: Optional[str] = None,
+) -> List[ModelSummary]:
+    """Per-model summaries, busiest model first. since compares ISO timestamps."""
+    by_model: Dict[str, List[Mapping[str, Any]]] = {}
+    for r in records:
+        name = str(r.get("model") or "?")
+        if model is not None and name != model:
+            continue
+        if since is not None and str(r.get("ts") or "") < since:
+            continue
+        by_model.setdefault(name, []).append(r)
+    out = [summarize_model(m, rs) for m, rs in by_model.items()]
+    return sorted(out, key=lambda s: (-s.requests, s.model))
+
+
+def _fmt(p: Percentiles, digits: int = 1) -> str:
+    if not p.n:
+        return "-"
+    return "/".join("-" if v is None else f"{v:.{digits}f}" for v in (p.p50, p.p90, p.p99))
+
+
+def format_summary(summaries: Sequence[ModelSummary]) -> str:
+    if not summaries:
+        return "no inference records"
+    header = (
+        "model",
+        "reqs",
+        "cold",
+        "gen tok/s",
+        "prompt tok/s",
+        "prompt eval s",
+        "load s",
+        "wall s",
+        "load/prompt/gen/other",
+    )
+    rows = [
+        header,
+        (
+            "",
+            "",
+            "",
+            "p50/p90/p99",
+            "p50/p90/p99",
+            "p50/p90/p99",
+            "p50/p90/p99",
+            "p50/p90/p99",
+            "share",
+        ),
+    ]
+    for s in summaries:
+        share = (
+            "/".join(f"{s.share[k]:.0%}" for k in ("load", "prompt_eval", "eval", "other"))
+            if s.share
+            else "-"
+        )
+        rows.append(
+            (
+                s.model,
+                str(s.requests),
+                str(s.cold_loads),
+                _fmt(s.gen_tokens_per_s),
+                _fmt(s.prompt_tokens_per_s, 0),
+                _fmt(s.prompt_eval_s, 2),
+                _fmt(s.load_s, 2),
+                _fmt(s.wall_s, 2),
+                share,
+            )
+        )
+    widths = [max(len(r[i]) for r in rows) for i in range(len(header))]
+    return "\n".join("  ".join(c.ljust(w) for c, w in zip(r, widths)).rstrip() for r in rows)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.engine.inference_telemetry")
+    ap.add_argument(
+        "--path", default=None, help="inference log (default: data/telemetry/inference.jsonl)"
+    )
+    ap.add_argument("--model", default=None, help="only this model")
+    ap.add_argument("--since", default=None, help="only records at/after this ISO time (UTC)")
+    ap.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = ap.parse_args(argv)
+
+    records = read_inference(Path(args.path) if args.path else None)
+    summaries = summarize(records, model=args.model, since=args.since)
+    if args.json:
+        print(json.dumps([asdict(s) for s in summaries], sort_keys=True, ensure_ascii=False))
+    else:
+        print(format_summary(summaries))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
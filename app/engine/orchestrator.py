@@ -0,0 +1,163 @@
+"""
+Concurrent local-model conversations on one event loop.
+
+ConversationOrchestrator keeps one AsyncEngine per conversation id and runs each
+submitted turn as an asyncio task:
+- turns of different conversations are in flight at the same time (at most
+  max_in_flight requests against the model server)
+- turns of the same conversation run in submission order
+- each turn has an optional deadline; cancel() stops pending and running turns
+
+Every turn resolves to a TurnResult (reply, error or timed out); the task itself
+never raises for request failures. A cancelled turn's task is cancelled like any
+other asyncio task (awaiting it raises CancelledError); drain() reports it as a
+TurnResult with cancelled=True.
+
+    async with ConversationOrchestrator(EngineConfig(...), max_in_flight=2) as orch:
+        orch.submit("a", "Write hello.py")
+        orch.submit("b", "Write bye.py", deadline=30)
+        results = await orch.drain()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.engine.engine import AsyncEngine, EngineConfig
+
+
+@dataclass(frozen=True)
+class TurnResult:
+    conversation: str
+    text: str
+    reply: Optional[str] = None
+    error: Optional[str] = None
+    cancelled: bool = False
+    timed_out: bool = False
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.reply is not None
+
+
+class ConversationOrchestrator:
+    def __init__(
+        self,
+        config: Optional[EngineConfig] = None,
+        *,
+        max_in_flight: int = 4,
+        deadline: Optional[float] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        self.config = config
+        self.deadline = deadline
+        self._client = client
+        self._slots = asyncio.Semaphore(max(1, int(max_in_flight)))
+        self._engines: Dict[str, AsyncEngine] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._tasks: List[asyncio.Task[TurnResult]] = []
+        self._by_conversation: Dict[str, List[asyncio.Task[TurnResult]]] = {}
+        # task -> (conversation, text), for drain() to report cancelled turns
+        self._submitted: Dict[asyncio.Task[TurnResult], Tuple[str, str]] = {}
+
+    async def __aenter__(self) -> "ConversationOrchestrator":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.aclose()
+
+    def engine(self, conversation: str) -> AsyncEngine:
+        """The conversation's engine (history), created on first use."""
+        eng = self._engines.get(conversation)
+        if eng is None:
+            eng = self._engines[conversation] = AsyncEngine(self.config, client=self._client)
+            self._locks[conversation] = asyncio.Lock()
+        return eng
+
+    def submit(
+        self,
+        conversation: str,
+        text: str,
+        *,
+        deadline: Optional[float] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> "asyncio.Task[TurnResult]":
+        """Queue a user turn; deadline (seconds, queueing included) overrides the default."""
+        self.engine(conversation)
+        limit = self.deadline if deadline is None else deadline
+        task = asyncio.create_task(
+            self._turn(conversation, text, limit, on_token),
+            name=f"conversation:{conversation}",
+        )
+        self._tasks.append(task)
+        self._submitted[task] = (conversation, text)
+        self._by_conversation.setdefault(conversation, []).append(task)
+        return task
+
+    def cancel(self, conversation: Optional[str] = None) -> int:
+        """Cancel unfinished turns of one conversation (or all). Returns how many."""
+        tasks = self._tasks if conversation is None else self._by_conversation.get(conversation, [])
+        n = 0
+        for t in tasks:
+            if not t.done():
+                t.cancel()
+                n += 1
+        return n
+
+    def in_flight(self) -> int:
+        return sum(1 for t in self._tasks if not t.done())
+
+    async def drain(self) -> List[TurnResult]:
+        """Wait for every submitted turn; results in submission order."""
+        tasks, self._tasks = self._tasks, []
+        submitted, self._submitted = self._submitted, {}
+        self._by_conversation = {}
+        if tasks:
+            await asyncio.wait(tasks)
+        results: List[TurnResult] = []
+        for t in tasks:
+            if t.cancelled():
+                conversation, text = submitted[t]
+                results.append(TurnResult(conversation, text, error="cancelled", cancelled=True))
+            else:
+                results.append(t.result())
+        return results
+
+    async def aclose(self) -> None:
+        """Cancel whatever is still running and wait for it to unwind."""
+        self.cancel()
+        await self.drain()
+
+    async def _turn(
+        self,
+        conversation: str,
+        text: str,
+        deadline: Optional[float],
+        on_token: Optional[Callable[[str], None]],
+    ) -> TurnResult:
+        t0 = time.perf_counter()
+        reply: Optional[str] = None
+        error: Optional[str] = None
+        timed_out = False
+        try:
+            async with asyncio.timeout(deadline):
+                async with self._locks[conversation], self._slots:
+                    reply = await self._engines[conversation].send_user(text, on_token=on_token)
+        except TimeoutError:
+            error, timed_out = f"deadline of {deadline}s exceeded", True
+        except Exception as e:
+            error = str(e)
+        return TurnResult(
+            conversation=conversation,
+            text=text,
+            reply=reply,
+            error=error,
+            timed_out=timed_out,
+            seconds=round(time.perf_counter() - t0, 3),
+        )
@@ -10,12 +10,45 @@ Requires:
 
 from __future__ import annotations
 
+import asyncio
+from contextlib import aclosing, closing, contextmanager
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
 
 import httpx
 
 from app.core.types.messages import ChatMessage, Role
+from app.engine.inference_telemetry import record_inference
+from app.engine.residency import (
+    DEFAULT_KEEP_ALIVE,
+    KeepAlive,
+    ResidencyResult,
+    keep_alive_value,
+    preload_model,
+    unload_model,
+)
+from app.engine.response_cache import (
+    CachedResponse,
+    active_response_cache,
+    is_deterministic,
+    response_key,
+)
+from app.engine.retry import (
+    RetryCall,
+    RetryPolicy,
+    arun_with_retry,
+    circuit_breaker,
+    run_with_retry,
+)
+from app.engine.transport import (
+    aiter_ndjson,
+    aopen_stream,
+    iter_ndjson,
+    open_stream,
+    request_timeout,
+    shared_async_client,
+    shared_client,
+)
 
 
 class OllamaError(RuntimeError):
@@ -27,6 +60,8 @@ class OllamaConfig:
     host: str = "http://localhost:11434"
     model: str = "llama3.1"
     timeout_sec: float = 120.0
+    keep_alive: KeepAlive = DEFAULT_KEEP_ALIVE
+    retry: RetryPolicy = RetryPolicy()
 
 
 def _to_ollama_role(role: Role) -> str:
@@ -54,22 +89,73 @@ class OllamaProvider:
     Minimal Ollama chat provider.
 
     Uses:
-      POST {host}/api/chat
+      POST {host}/api/chat           (chat: one JSON reply, or NDJSON with on_token)
+      POST {host}/api/chat, stream   (chat_stream: NDJSON fragments)
+
+    achat / achat_stream are the asyncio variants (cancellable; achat takes a
+    per-request deadline in seconds and raises TimeoutError past it).
+
+    Connect errors and 5xx responses are retried with jittered backoff
+    (config.retry) and a per-host circuit breaker fails calls fast while the
+    server is down (app.engine.retry). meta["attempts"] / meta["retry_wait"]
+    report what a reply cost in retries.
+
+    Requests go through the shared pooled clients (app.engine.transport) unless
+    explicit ones are passed.
     """
 
-    def __init__(self, config: Optional[OllamaConfig] = None) -> None:
+    def __init__(
+        self,
+        config: Optional[OllamaConfig] = None,
+        *,
+        client: Optional[httpx.Client] = None,
+        async_client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
         self.config = config or OllamaConfig()
+        self._client = client
+        self._async_client = async_client
+
+    def _http(self) -> httpx.Client:
+        return self._client if self._client is not None else shared_client()
+
+    def _ahttp(self) -> httpx.AsyncClient:
+        return self._async_client if self._async_client is not None else shared_async_client()
 
     def health(self) -> Tuple[bool, str]:
         url = f"{self.config.host.rstrip('/')}/api/tags"
         try:
-            with httpx.Client(timeout=self.config.timeout_sec) as client:
-                r = client.get(url)
-                r.raise_for_status()
+            r = self._http().get(url, timeout=request_timeout(self.config.timeout_sec))
+            r.raise_for_status()
             return True, "OK"
         except Exception as e:
             return False, str(e)
 
+    async def ahealth(self) -> Tuple[bool, str]:
+        url = f"{self.config.host.rstrip('/')}/api/tags"
+        try:
+            r = await self._ahttp().get(url, timeout=request_timeout(self.config.timeout_sec))
+            r.raise_for_status()
+            return True, "OK"
+        except Exception as e:
+            return False, str(e)
+
+    def preload(self) -> ResidencyResult:
+        return preload_model(
+            self.config.host,
+            self.config.model,
+            keep_alive=self.config.keep_alive,
+            timeout=max(self.config.timeout_sec, 300.0),
+            client=self._client,
+        )
+
+    def unload(self) -> ResidencyResult:
+        return unload_model(
+            self.config.host,
+            self.config.model,
+            timeout=self.config.timeout_sec,
+            client=self._client,
+        )
+
     def chat(
         self,
         messages: List[ChatMessage],
@@ -78,12 +164,163 @@ class OllamaProvider:
         top_p: float = 0.9,
         max_tokens: Optional[int] = None,
         seed: Optional[int] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        use_cache: bool = True,
+        deadline: Optional[float] = None,
     ) -> Tuple[str, Dict[str, Any]]:
         """
         Returns: (assistant_text, meta)
+
+        With on_token, the reply is streamed and on_token receives each content
+        fragment as it arrives; meta["raw"] is then the final (done) chunk.
+
+        Deterministic requests (seed set or temperature 0) are answered from the
+        response cache when it is enabled; use_cache=False bypasses it.
+        meta["cached"] tells which path served the reply.
+
+        deadline (seconds) bounds retries and cuts each attempt's timeout.
         """
+        payload = self._payload(
+            messages, temperature, top_p, max_tokens, seed, stream=on_token is not None
+        )
+        key = self._cache_key(payload, use_cache)
+        hit = self._cached(key, on_token)
+        if hit is not None:
+            return hit
+
+        text, meta = self._chat(payload, on_token, self._retry_call(deadline))
+        self._remember(key, text, meta)
+        return text, meta
+
+    def _chat(
+        self, payload: Dict[str, Any], on_token: Optional[Callable[[str], None]], call: RetryCall
+    ) -> Tuple[str, Dict[str, Any]]:
+        if on_token is not None:
+            parts: List[str] = []
+            data: Dict[str, Any] = {}
+            for chunk in self._iter_chunks(payload, call):
+                delta = _extract_text(chunk)
+                if delta:
+                    parts.append(delta)
+                    on_token(delta)
+                data = chunk
+            return "".join(parts).strip(), self._meta(data, call=call)
+
         url = f"{self.config.host.rstrip('/')}/api/chat"
 
+        def attempt(c: RetryCall) -> Dict[str, Any]:
+            r = self._http().post(
+                url, json=payload, timeout=request_timeout(c.timeout(self.config.timeout_sec))
+            )
+            r.raise_for_status()
+            return r.json()
+
+        with self._errors():
+            data = run_with_retry(attempt, call, self.health)
+
+        self._record(data, call, stream=False)
+        return _extract_text(data).strip(), self._meta(data, call=call)
+
+    def chat_stream(
+        self,
+        messages: List[ChatMessage],
+        *,
+        temperature: float = 0.2,
+        top_p: float = 0.9,
+        max_tokens: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Yield assistant content fragments as Ollama streams them."""
+        payload = self._payload(messages, temperature, top_p, max_tokens, seed, stream=True)
+        for chunk in self._iter_chunks(payload, self._retry_call()):
+            delta = _extract_text(chunk)
+            if delta:
+                yield delta
+
+    async def achat(
+        self,
+        messages: List[ChatMessage],
+        *,
+        temperature: float = 0.2,
+        top_p: float = 0.9,
+        max_tokens: Optional[int] = None,
+        seed: Optional[int] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        deadline: Optional[float] = None,
+        use_cache: bool = True,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Async chat(); deadline (seconds) bounds the whole call, streaming included."""
+        payload = self._payload(
+            messages, temperature, top_p, max_tokens, seed, stream=on_token is not None
+        )
+        key = self._cache_key(payload, use_cache)
+        hit = self._cached(key, on_token)
+        if hit is not None:
+            return hit
+
+        call = self._retry_call(deadline)
+        async with asyncio.timeout(deadline):
+            text, meta = await self._achat(payload, on_token, call)
+        self._remember(key, text, meta)
+        return text, meta
+
+    async def _achat(
+        self, payload: Dict[str, Any], on_token: Optional[Callable[[str], None]], call: RetryCall
+    ) -> Tuple[str, Dict[str, Any]]:
+        if on_token is not None:
+            parts: List[str] = []
+            data: Dict[str, Any] = {}
+            async with aclosing(self._aiter_chunks(payload, call)) as chunks:
+                async for chunk in chunks:
+                    delta = _extract_text(chunk)
+                    if delta:
+                        parts.append(delta)
+                        on_token(delta)
+                    data = chunk
+            return "".join(parts).strip(), self._meta(data, call=call)
+
+        url = f"{self.config.host.rstrip('/')}/api/chat"
+
+        async def attempt(c: RetryCall) -> Dict[str, Any]:
+            r = await self._ahttp().post(
+                url, json=payload, timeout=request_timeout(self.config.timeout_sec)
+            )
+            r.raise_for_status()
+            return r.json()
+
+        with self._errors():
+            data = await arun_with_retry(attempt, call, self.ahealth)
+
+        self._record(data, call, stream=False)
+        return _extract_text(data).strip(), self._meta(data, call=call)
+
+    async def achat_stream(
+        self,
+        messages: List[ChatMessage],
+        *,
+        temperature: float = 0.2,
+        top_p: float = 0.9,
+        max_tokens: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """Async chat_stream()."""
+        payload = self._payload(messages, temperature, top_p, max_tokens, seed, stream=True)
+        async with aclosing(self._aiter_chunks(payload, self._retry_call())) as chunks:
+            async for chunk in chunks:
+                delta = _extract_text(chunk)
+                if delta:
+                    yield delta
+
+    def _payload(
+        self,
+        messages: List[ChatMessage],
+        temperature: float,
+        top_p: float,
+        max_tokens: Optional[int],
+        seed: Optional[int],
+        *,
+        stream: bool,
+    ) -> Dict[str, Any]:
         options: Dict[str, Any] = {
             "temperature": float(temperature),
             "top_p": float(top_p),
@@ -95,16 +332,113 @@ class OllamaProvider:
 
         payload: Dict[str, Any] = {
             "model": self.config.model,
-            "stream": False,
+            "stream": stream,
             "messages": _to_ollama_messages(messages),
             "options": options,
         }
+        keep_alive = keep_alive_value(self.config.keep_alive)
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        return payload
+
+    def _iter_chunks(self, payload: Dict[str, Any], call: RetryCall) -> Iterator[Dict[str, Any]]:
+        """
+        NDJSON chunks of a streamed /api/chat call, up to and including the done
+        chunk. Opening the stream is retried; a failure mid-stream is not.
+        """
+        url = f"{self.config.host.rstrip('/')}/api/chat"
+
+        def attempt(c: RetryCall) -> httpx.Response:
+            timeout = request_timeout(c.timeout(self.config.timeout_sec))
+            return open_stream(self._http(), url, json=payload, timeout=timeout)
+
+        with self._errors():
+            with closing(run_with_retry(attempt, call, self.health)) as r:
+                for chunk in iter_ndjson(r):
+                    if chunk.get("error"):
+                        raise OllamaError(f"Ollama error: {chunk['error']}")
+                    if chunk.get("done"):
+                        self._record(chunk, call, stream=True)
+                    yield chunk
+                    if chunk.get("done"):
+                        return
+
+    async def _aiter_chunks(
+        self, payload: Dict[str, Any], call: RetryCall
+    ) -> AsyncIterator[Dict[str, Any]]:
+        url = f"{self.config.host.rstrip('/')}/api/chat"
+
+        async def attempt(c: RetryCall) -> httpx.Response:
+            timeout = request_timeout(self.config.timeout_sec)
+            return await aopen_stream(self._ahttp(), url, json=payload, timeout=timeout)
+
+        with self._errors():
+            async with aclosing(await arun_with_retry(attempt, call, self.ahealth)) as r:
+                async for chunk in aiter_ndjson(r):
+                    if chunk.get("error"):
+                        raise OllamaError(f"Ollama error: {chunk['error']}")
+                    if chunk.get("done"):
+                        self._record(chunk, call, stream=True)
+                    yield chunk
+                    if chunk.get("done"):
+                        return
+
+    def _meta(
+        self, data: Dict[str, Any], *, cached: bool = False, call: Optional[RetryCall] = None
+    ) -> Dict[str, Any]:
+        return {
+            "model": self.config.model,
+            "host": self.config.host,
+            "raw": data,
+            "cached": cached,
+            # Requests sent for this reply and seconds spent in retry backoff.
+            "attempts": call.attempts if call is not None else 0,
+            "retry_wait": round(call.waited, 3) if call is not None else 0.0,
+        }
 
+    def _retry_call(self, deadline: Optional[float] = None) -> RetryCall:
+        return RetryCall(self.config.retry, circuit_breaker(self.config.host), deadline)
+
+    def _record(self, raw: Dict[str, Any], call: RetryCall, *, stream: bool) -> None:
+        record_inference(
+            raw,
+            model=self.config.model,
+            host=self.config.host,
+            source="provider",
+            stream=stream,
+            wall_seconds=call.elapsed(),
+            attempts=call.attempts,
+        )
+
+    def _cache_key(self, payload: Dict[str, Any], use_cache: bool) -> Optional[str]:
+        if not use_cache or not is_deterministic(payload["options"]):
+            return None
+        if active_response_cache() is None:
+            return None
+        return response_key(self.config.model, payload["options"], payload["messages"])
+
+    def _cached(
+        self, key: Optional[str], on_token: Optional[Callable[[str], None]]
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        cache = active_response_cache() if key else None
+        hit = cache.get(key) if cache is not None and key else None
+        if hit is None:
+            return None
+        if on_token is not None and hit.text:
+            on_token(hit.text)
+        return hit.text, self._meta(hit.raw, cached=True)
+
+    def _remember(self, key: Optional[str], text: str, meta: Dict[str, Any]) -> None:
+        cache = active_response_cache() if key else None
+        if cache is not None and key and text:
+            cache.put(key, CachedResponse(text=text, raw=meta["raw"]))
+
+    @contextmanager
+    def _errors(self) -> Iterator[None]:
         try:
-            with httpx.Client(timeout=self.config.timeout_sec) as client:
-                r = client.post(url, json=payload)
-                r.raise_for_status()
-                data = r.json()
+            yield
+        except OllamaError:
+            raise
         except httpx.ConnectError as e:
             raise OllamaError(
                 f"Ollama not reachable at {self.config.host}. Start Ollama and try again."
@@ -118,11 +452,3 @@ class OllamaProvider:
             raise OllamaError(f"Ollama HTTP error: {e} {body}".strip()) from e
         except Exception as e:
             raise OllamaError(str(e)) from e
-
-        text = _extract_text(data).strip()
-        meta = {
-            "model": self.config.model,
-            "host": self.config.host,
-            "raw": data,
-        }
-        return text, meta
@@ -0,0 +1,113 @@
+# File: C:\Dev\CCP\SWEngineer\app\engine\residency.py
+"""
+Model residency control for the local Ollama server.
+
+Ollama unloads a model once it has been idle for its keep_alive period, and the
+next request then pays the full model load. This module lets the engine:
+- preload a model (an empty /api/generate request loads it and returns)
+- ask for a residency period on every request (keep_alive)
+- unload a model explicitly (keep_alive 0)
+- list resident models (/api/ps)
+
+keep_alive follows Ollama: a duration string ("30m", "2h"), seconds as a
+number, a negative number to keep the model loaded indefinitely, 0 to unload
+immediately; None leaves the server default.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+import httpx
+
+from app.engine.transport import request_timeout, shared_client
+
+KeepAlive = Union[str, int, float, None]
+DEFAULT_KEEP_ALIVE = "30m"
+
+
+@dataclass(frozen=True)
+class ResidencyResult:
+    ok: bool
+    model: str
+    detail: str = ""
+    # Wall time of the call, and the server-reported load time (0 if already resident).
+    seconds: float = 0.0
+    load_seconds: float = 0.0
+
+
+def keep_alive_value(value: KeepAlive) -> KeepAlive:
+    """Normalize user input: '' -> None, '-1' / '600' -> int, '30m' stays a string."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        return text
+
+
+def _post_generate(
+    host: str, body: dict, timeout: float, client: Optional[httpx.Client]
+) -> ResidencyResult:
+    url = f"{host.rstrip('/')}/api/generate"
+    t0 = time.perf_counter()
+    try:
+        r = (client or shared_client()).post(url, json=body, timeout=request_timeout(timeout))
+        r.raise_for_status()
+        data = r.json()
+    except Exception as e:
+        return ResidencyResult(False, body["model"], str(e), round(time.perf_counter() - t0, 3))
+    load_ns = data.get("load_duration") if isinstance(data, dict) else None
+    return ResidencyResult(
+        ok=True,
+        model=body["model"],
+        detail=str(data.get("done_reason") or "ok") if isinstance(data, dict) else "ok",
+        seconds=round(time.perf_counter() - t0, 3),
+        load_seconds=round(load_ns / 1e9, 3) if isinstance(load_ns, (int, float)) else 0.0,
+    )
+
+
+def preload_model(
+    host: str,
+    model: str,
+    *,
+    keep_alive: KeepAlive = DEFAULT_KEEP_ALIVE,
+    timeout: float = 300.0,
+    client: Optional[httpx.Client] = None,
+) -> ResidencyResult:
+    """Load model into memory (no prompt is evaluated) and keep it for keep_alive."""
+    body: dict = {"model": model}
+    ka = keep_alive_value(keep_alive)
+    if ka is not None:
+        body["keep_alive"] = ka
+    return _post_generate(host, body, timeout, client)
+
+
+def unload_model(
+    host: str,
+    model: str,
+    *,
+    timeout: float = 60.0,
+    client: Optional[httpx.Client] = None,
+) -> ResidencyResult:
+    """Evict model from memory now."""
+    return _post_generate(host, {"model": model, "keep_alive": 0}, timeout, client)
+
+
+def loaded_models(
+    host: str, *, timeout: float = 10.0, client: Optional[httpx.Client] = None
+) -> List[str]:
+    """Names of the models currently resident on the server ([] if unreachable)."""
+    url = f"{host.rstrip('/')}/api/ps"
+    try:
+        r = (client or shared_client()).get(url, timeout=request_timeout(timeout))
+        r.raise_for_status()
+        models = r.json().get("models") or []
+    except Exception:
+        return []
+    return [str(m.get("name") or m.get("model")) for m in models if isinstance(m, dict)]
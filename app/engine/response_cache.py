@@ -0,0 +1,230 @@
+# File: C:\Dev\CCP\SWEngineer\app\engine\response_cache.py
+"""
+Deterministic response cache (opt-in).
+
+Replays model replies for requests that are deterministic (a fixed seed, or
+temperature 0), so re-running a session during development or replay returns
+from disk instead of going back to the model.
+
+Key: sha256 of the canonical JSON of (model, options, normalized messages).
+Messages are reduced to role + content with line endings normalized and outer
+whitespace stripped; message ids and timestamps never reach the key.
+
+Storage: one JSON file per key under data/response_cache/<key[:2]>/<key>.json,
+bounded by max_bytes with least-recently-used eviction (a hit refreshes the
+entry's mtime).
+
+Directory resolution priority:
+1) SWE_RESPONSE_CACHE_DIR env var
+2) <project root>/data/response_cache
+
+Enable with SWE_RESPONSE_CACHE=1 or configure_response_cache(). Bypass per call
+with use_cache=False (OllamaProvider.chat / achat).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from app.core.paths import get_paths
+
+RESPONSE_CACHE_ENV = "SWE_RESPONSE_CACHE"
+RESPONSE_CACHE_DIR_ENV = "SWE_RESPONSE_CACHE_DIR"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    text: str
+    raw: Dict[str, Any]
+
+
+def default_cache_dir() -> Path:
+    env = os.getenv(RESPONSE_CACHE_DIR_ENV, "").strip()
+    if env:
+        return Path(env).expanduser()
+    return get_paths().response_cache_dir
+
+
+def is_deterministic(options: Mapping[str, Any]) -> bool:
+    """Only seeded or greedy (temperature 0) requests are worth replaying."""
+    if options.get("seed") is not None:
+        return True
+    try:
+        return float(options.get("temperature", 1.0)) == 0.0
+    except (TypeError, ValueError):
+        return False
+
+
+def _normalize_messages(messages: List[Mapping[str, Any]]) -> List[Dict[str, str]]:
+    out: List[Dict[str, str]] = []
+    for m in messages:
+        content = str(m.get("content") or "").replace("\r\n", "\n").strip()
+        out.append({"role": str(m.get("role") or ""), "content": content})
+    return out
+
+
+def response_key(model: str, options: Mapping[str, Any], messages: List[Mapping[str, Any]]) -> str:
+    doc = {"model": model, "options": dict(options), "messages": _normalize_messages(messages)}
+    text = json.dumps(doc, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root)
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        # key -> (size, last use); built lazily from disk
+        self._index: Optional[Dict[str, Tuple[int, float]]] = None
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> Dict[str, Tuple[int, float]]:
+        if self._index is None:
+            index: Dict[str, Tuple[int, float]] = {}
+            if self.root.is_dir():
+                for p in self.root.glob("*/*.json"):
+                    try:
+                        st = p.stat()
+                    except OSError:
+                        continue
+                    index[p.stem] = (st.st_size, st.st_mtime)
+            self._index = index
+            self._bytes = sum(size for size, _ in index.values())
+        return self._index
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        p = self._path(key)
+        try:
+            obj = json.loads(p.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            obj = None
+        if not isinstance(obj, dict) or not isinstance(obj.get("text"), str):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        now = time.time()
+        try:
+            os.utime(p, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+            index = self._load_index()
+            if key in index:
+                index[key] = (index[key][0], now)
+        raw = obj.get("raw")
+        return CachedResponse(text=obj["text"], raw=raw if isinstance(raw, dict) else {})
+
+    def put(self, key: str, response: CachedResponse) -> None:
+        data = json.dumps({"text": response.text, "raw": response.raw}, ensure_ascii=False).encode(
+            "utf-8"
+        )
+        if len(data) > self.max_bytes:
+            return
+        p = self._path(key)
+        try:
+            p.parent.mkdir(parents=True, exist_ok=True)
+            tmp = p.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            tmp.replace(p)
+        except OSError:
+            # Best-effort: a failed write only costs a future miss.
+            return
+        with self._lock:
+            index = self._load_index()
+            old = index.get(key)
+            self._bytes += len(data) - (old[0] if old else 0)
+            index[key] = (len(data), time.time())
+            self._evict()
+
+    def _evict(self) -> None:
+        index = self._index or {}
+        if self._bytes <= self.max_bytes:
+            return
+        for key, (size, _) in sorted(index.items(), key=lambda kv: kv[1][1]):
+            if self._bytes <= self.max_bytes:
+                break
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            del index[key]
+            self._bytes -= size
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._load_index()
+            return self._bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._load_index()):
+                try:
+                    self._path(key).unlink()
+                except OSError:
+                    pass
+            self._index = {}
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_index())
+
+
+_ACTIVE: Optional[ResponseCache] = None
+_CONFIGURED = False
+_ACTIVE_LOCK = threading.Lock()
+
+
+def configure_response_cache(
+    enabled: bool = True,
+    *,
+    root: Optional[Path] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> Optional[ResponseCache]:
+    """Install (or, with enabled=False, remove) the process-wide response cache."""
+    global _ACTIVE, _CONFIGURED
+    with _ACTIVE_LOCK:
+        _ACTIVE = (
+            ResponseCache(root or default_cache_dir(), max_bytes=max_bytes) if enabled else None
+        )
+        _CONFIGURED = True
+        return _ACTIVE
+
+
+def active_response_cache() -> Optional[ResponseCache]:
+    """The configured cache, else one built from SWE_RESPONSE_CACHE on first use (None = off)."""
+    global _ACTIVE, _CONFIGURED
+    with _ACTIVE_LOCK:
+        if not _CONFIGURED:
+            if os.getenv(RESPONSE_CACHE_ENV, "").strip().lower() in ("1", "on", "true", "disk"):
+                _ACTIVE = ResponseCache(default_cache_dir())
+            _CONFIGURED = True
+        return _ACTIVE
+
+
+def reset_response_cache() -> None:
+    """Forget any configuration; the next use re-reads SWE_RESPONSE_CACHE."""
+    global _ACTIVE, _CONFIGURED
+    with _ACTIVE_LOCK:
+        _ACTIVE = None
+        _CONFIGURED = False
@@ -0,0 +1,288 @@
+# File: C:\Dev\CCP\SWEngineer\app\engine\retry.py
+"""
+Retries, backoff and a circuit breaker for requests to the local Ollama server.
+
+Only failures that say nothing about the request itself are retried:
+- connect errors / connect timeouts (server not up yet, restarting)
+- 5xx responses (model failed to load, server overloaded)
+Read timeouts, 4xx and errors after a streamed reply has started are not; a
+retry there would repeat work the model already did or emit a reply twice.
+
+Backoff is exponential with full jitter (uniform in [0, min(max_delay,
+base_delay * 2**n)]). A per-request deadline bounds the whole call: each
+attempt's timeout is cut to the time left and no retry is started that could
+not finish waiting before it.
+
+One CircuitBreaker per host (circuit_breaker()) is shared by Engine,
+AsyncEngine and OllamaProvider. After failure_threshold consecutive retryable
+failures it opens and calls fail fast with CircuitOpenError. Once reset_after
+seconds have passed the next call first probes the server with health(); a
+good probe lets calls through again (half-open: one more failure re-opens it),
+a bad one keeps it open for another reset_after.
+
+Retry and breaker events are counted in telemetry (data/telemetry/
+ollama_retries.json), including the total time spent in backoff, so retries do
+not hide latency:
+  retry.connect / retry.http_5xx   retries performed, by reason
+  retry_wait_ms                    total backoff sleep
+  recovered                        calls that succeeded after retrying
+  gave_up.<reason>                 retryable failures that ran out of attempts/time
+  circuit.opened / circuit.rejected / circuit.probe_failed / circuit.closed
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+import httpx
+
+from app.core import telemetry
+
+RETRY_TELEMETRY = "ollama_retries"
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_RESET_AFTER = 10.0
+
+T = TypeVar("T")
+Probe = Callable[[], Tuple[bool, str]]
+AsyncProbe = Callable[[], Awaitable[Tuple[bool, str]]]
+
+
+class CircuitOpenError(RuntimeError):
+    """The server at host failed repeatedly; calls fail fast until a health probe succeeds."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def backoff(self, retry: int, rng: Callable[[], float] = random.random) -> float:
+        """Full-jitter delay before retry number `retry` (1-based)."""
+        cap = min(self.max_delay, self.base_delay * (2 ** max(0, retry - 1)))
+        return cap * rng()
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+def retry_reason(exc: BaseException) -> Optional[str]:
+    """'connect' / 'http_5xx' for failures worth retrying, else None."""
+    if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout)):
+        return "connect"
+    if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code >= 500:
+        return "http_5xx"
+    return None
+
+
+def _count(key: str, n: int = 1) -> None:
+    telemetry.counters(RETRY_TELEMETRY).incr(key, n)
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        host: str,
+        *,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_after: float = DEFAULT_RESET_AFTER,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.host = host
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_after = float(reset_after)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._half_open = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is not None:
+                return "open"
+            return "half_open" if self._half_open else "closed"
+
+    def allow(self) -> bool:
+        """
+        Raise CircuitOpenError while open. True once the cool-down has passed:
+        the caller should probe the server and report it with probed().
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            wait = self.reset_after - (self._clock() - self._opened_at)
+        if wait > 0:
+            _count("circuit.rejected")
+            raise CircuitOpenError(f"Ollama at {self.host} is unavailable; retrying in {wait:.0f}s")
+        return True
+
+    def probed(self, ok: bool, detail: str = "") -> None:
+        with self._lock:
+            if ok:
+                self._opened_at = None
+                self._half_open = True
+            else:
+                self._opened_at = self._clock()
+        if not ok:
+            _count("circuit.probe_failed")
+            raise CircuitOpenError(
+                f"Ollama at {self.host} is still unavailable: {detail}".rstrip(": ")
+            )
+
+    def record_success(self) -> None:
+        with self._lock:
+            closed = self._half_open
+            self._failures = 0
+            self._opened_at = None
+            self._half_open = False
+        if closed:
+            _count("circuit.closed")
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            opening = self._opened_at is None and (
+                self._half_open or self._failures >= self.failure_threshold
+            )
+            if opening:
+                self._opened_at = self._clock()
+                self._half_open = False
+        if opening:
+            _count("circuit.opened")
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def circuit_breaker(host: str) -> CircuitBreaker:
+    """Process-wide breaker for host (created on first use)."""
+    key = (host or "").rstrip("/")
+    with _BREAKERS_LOCK:
+        b = _BREAKERS.get(key)
+        if b is None:
+            b = _BREAKERS[key] = CircuitBreaker(key)
+        return b
+
+
+def reset_circuit_breakers() -> None:
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
+
+
+class RetryCall:
+    """Bookkeeping for one request: attempts, backoff, deadline, breaker, telemetry."""
+
+    def __init__(
+        self,
+        policy: RetryPolicy,
+        breaker: Optional[CircuitBreaker] = None,
+        deadline: Optional[float] = None,
+    ) -> None:
+        self.policy = policy
+        self.breaker = breaker
+        self.attempts = 0
+        self.waited = 0.0
+        self._t0 = time.monotonic()
+        self._until = None if deadline is None else self._t0 + deadline
+
+    def elapsed(self) -> float:
+        """Seconds since the call started, retries and backoff included."""
+        return time.monotonic() - self._t0
+
+    def remaining(self) -> Optional[float]:
+        return None if self._until is None else self._until - time.monotonic()
+
+    def timeout(self, seconds: float) -> float:
+        """The attempt's timeout: seconds, cut to what is left of the deadline."""
+        left = self.remaining()
+        return seconds if left is None else max(0.001, min(seconds, left))
+
+    def begin(self, probe: Optional[Probe] = None) -> None:
+        if self._start() and self.breaker is not None:
+            ok, detail = probe() if probe is not None else (True, "")
+            self.breaker.probed(ok, detail)
+
+    async def abegin(self, probe: Optional[AsyncProbe] = None) -> None:
+        if self._start() and self.breaker is not None:
+            ok, detail = await probe() if probe is not None else (True, "")
+            self.breaker.probed(ok, detail)
+
+    def _start(self) -> bool:
+        left = self.remaining()
+        if left is not None and left <= 0:
+            raise TimeoutError("request deadline exceeded")
+        self.attempts += 1
+        return self.breaker is not None and self.breaker.allow()
+
+    def failed(self, exc: BaseException) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None to give up (re-raise exc)."""
+        reason = retry_reason(exc)
+        if reason is None:
+            return None
+        if self.breaker is not None:
+            self.breaker.record_failure()
+        delay = self.policy.backoff(self.attempts)
+        left = self.remaining()
+        out_of_time = left is not None and delay >= left
+        if self.attempts >= self.policy.max_attempts or out_of_time:
+            _count(f"gave_up.{reason}")
+            return None
+        _count(f"retry.{reason}")
+        _count("retry_wait_ms", int(delay * 1000))
+        self.waited += delay
+        return delay
+
+    def succeeded(self) -> None:
+        if self.breaker is not None:
+            self.breaker.record_success()
+        if self.attempts > 1:
+            _count("recovered")
+
+
+def run_with_retry(
+    attempt: Callable[[RetryCall], T], call: RetryCall, probe: Optional[Probe] = None
+) -> T:
+    """
+    Run attempt(call) until it succeeds or call gives up (the last error is
+    re-raised). attempt should pass call.timeout(...) as its request timeout.
+    """
+    while True:
+        call.begin(probe)
+        try:
+            result = attempt(call)
+        except Exception as e:
+            delay = call.failed(e)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            continue
+        call.succeeded()
+        return result
+
+
+async def arun_with_retry(
+    attempt: Callable[[RetryCall], Awaitable[T]],
+    call: RetryCall,
+    probe: Optional[AsyncProbe] = None,
+) -> T:
+    """Async run_with_retry(); cancellation (or asyncio.timeout) interrupts the backoff too."""
+    while True:
+        await call.abegin(probe)
+        try:
+            result = await attempt(call)
+        except Exception as e:
+            delay = call.failed(e)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            continue
+        call.succeeded()
+        return result
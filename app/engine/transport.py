@@ -0,0 +1,200 @@
+# File: C:\Dev\CCP\SWEngineer\app\engine\transport.py
+"""
+Shared HTTP transport (pooled, keep-alive).
+
+One long-lived httpx.Client per process, shared by Engine and OllamaProvider, so
+repeated calls to the local model server reuse TCP connections instead of paying
+connection setup per request. Per-request timeouts are passed on each call; the
+pool itself only carries connection limits and keep-alive.
+
+Lifecycle:
+- shared_client() creates the client lazily (thread-safe)
+- close_shared_client() closes it (app shutdown; also registered with atexit);
+  a later shared_client() call opens a fresh one
+- configure_transport() swaps limits / the underlying transport (tests use
+  httpx.MockTransport)
+
+Async callers (AsyncEngine, OllamaProvider.achat) get an httpx.AsyncClient with
+the same limits from shared_async_client(). An AsyncClient is bound to the event
+loop it runs on, so there is one per running loop; aclose_shared_async_client()
+closes the current loop's client.
+
+iter_ndjson() / aiter_ndjson() decode a streamed newline-delimited JSON body
+(Ollama's "stream": true responses) object by object as bytes arrive.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import json
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+import httpx
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    max_connections: int = 10
+    max_keepalive_connections: int = 5
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    # Default read/write timeout when a call does not pass its own.
+    timeout_seconds: float = 120.0
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeout(self, seconds: Optional[float] = None) -> httpx.Timeout:
+        t = self.timeout_seconds if seconds is None else float(seconds)
+        return httpx.Timeout(t, connect=min(self.connect_timeout, t))
+
+
+_CONFIG = TransportConfig()
+_TRANSPORT: Optional[httpx.BaseTransport] = None
+_CLIENT: Optional[httpx.Client] = None
+_LOCK = threading.Lock()
+_ASYNC_TRANSPORT: Optional[httpx.AsyncBaseTransport] = None
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def transport_config() -> TransportConfig:
+    return _CONFIG
+
+
+def shared_client() -> httpx.Client:
+    """The process-wide pooled client (created on first use)."""
+    global _CLIENT
+    with _LOCK:
+        if _CLIENT is None or _CLIENT.is_closed:
+            _CLIENT = httpx.Client(
+                limits=_CONFIG.limits(),
+                timeout=_CONFIG.timeout(),
+                transport=_TRANSPORT,
+            )
+        return _CLIENT
+
+
+def shared_async_client() -> httpx.AsyncClient:
+    """The pooled AsyncClient of the running event loop (created on first use)."""
+    loop = asyncio.get_running_loop()
+    with _LOCK:
+        client = _ASYNC_CLIENTS.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=_CONFIG.limits(),
+                timeout=_CONFIG.timeout(),
+                transport=_ASYNC_TRANSPORT,
+            )
+            _ASYNC_CLIENTS[loop] = client
+        return client
+
+
+async def aclose_shared_async_client() -> None:
+    """Close the running loop's pooled AsyncClient. Safe to call more than once."""
+    with _LOCK:
+        client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def request_timeout(seconds: Optional[float]) -> httpx.Timeout:
+    """Per-call timeout honouring the pool's connect timeout."""
+    return _CONFIG.timeout(seconds)
+
+
+def iter_ndjson(response: httpx.Response) -> Iterator[Dict[str, Any]]:
+    """Yield each JSON object of a streamed NDJSON body (blank lines skipped)."""
+    for line in response.iter_lines():
+        line = line.strip()
+        if not line:
+            continue
+        obj = json.loads(line)
+        if isinstance(obj, dict):
+            yield obj
+
+
+async def aiter_ndjson(response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+    """Async iter_ndjson for AsyncClient streams."""
+    async for line in response.aiter_lines():
+        line = line.strip()
+        if not line:
+            continue
+        obj = json.loads(line)
+        if isinstance(obj, dict):
+            yield obj
+
+
+def open_stream(
+    client: httpx.Client, url: str, *, json: Any, timeout: httpx.Timeout
+) -> httpx.Response:
+    """
+    POST and return the response with its body unread (close it when done).
+    An error status raises HTTPStatusError with the body read, before any
+    caller sees a chunk - so opening a stream can be retried safely.
+    """
+    r = client.send(client.build_request("POST", url, json=json, timeout=timeout), stream=True)
+    if r.is_error:
+        try:
+            r.read()
+        finally:
+            r.close()
+        r.raise_for_status()
+    return r
+
+
+async def aopen_stream(
+    client: httpx.AsyncClient, url: str, *, json: Any, timeout: httpx.Timeout
+) -> httpx.Response:
+    """Async open_stream(); close the response with aclose()."""
+    r = await client.send(
+        client.build_request("POST", url, json=json, timeout=timeout), stream=True
+    )
+    if r.is_error:
+        try:
+            await r.aread()
+        finally:
+            await r.aclose()
+        r.raise_for_status()
+    return r
+
+
+def close_shared_client() -> None:
+    """Close pooled connections. Safe to call more than once."""
+    global _CLIENT
+    with _LOCK:
+        client, _CLIENT = _CLIENT, None
+    if client is not None:
+        client.close()
+
+
+def configure_transport(
+    config: Optional[TransportConfig] = None,
+    *,
+    transport: Optional[httpx.BaseTransport] = None,
+    async_transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> None:
+    """
+    Replace pool settings (and optionally the underlying transports). The current
+    sync client is closed and async clients are forgotten; the next
+    shared_client() / shared_async_client() call builds one with the new settings.
+    """
+    global _CONFIG, _TRANSPORT, _ASYNC_TRANSPORT
+    close_shared_client()
+    with _LOCK:
+        _CONFIG = config or TransportConfig()
+        _TRANSPORT = transport
+        _ASYNC_TRANSPORT = async_transport
+        _ASYNC_CLIENTS.clear()
+
+
+atexit.register(close_shared_client)
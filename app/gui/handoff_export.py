@@ -0,0 +1,178 @@
+"""
+Handoff export (runner inbox)
+
+Streams RUN_HANDOFF evidence records out of the store into a runner inbox directory:
+- <ev_id>.json    canonical JSON payload (sorted keys, compact, UTF-8, trailing newline)
+- manifest.json   exported entries + watermark (last exported ev_id)
+
+Incremental: re-running resumes after the manifest watermark (or an explicit
+--since ev_id), so only new handoffs are written. File writes run on a thread
+pool; the manifest is written last, atomically, so an interrupted export is
+simply redone on the next run.
+
+No execution. Read-only against the evidence store.
+
+CLI:
+  python -m app.gui.handoff_export --out <dir> [--root <store root>] [--since E0012] [--workers 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.validation.canonical import canonical_json
+
+from .store import GuiStore, utc_now_iso
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_KIND = "RUN_HANDOFF_EXPORT"
+
+
+@dataclass(frozen=True)
+class ExportResult:
+    out_dir: str
+    exported: List[str]
+    skipped: List[str]
+    last_ev_id: Optional[str]
+    manifest_path: str
+
+
+def _ev_num(ev_id: Optional[str]) -> int:
+    s = (ev_id or "").strip()
+    if s[:1].upper() == "E":
+        s = s[1:]
+    try:
+        return int(s)
+    except ValueError:
+        return 0
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(text, encoding="utf-8", newline="\n")
+    tmp.replace(path)
+
+
+def load_manifest(out_dir: Path) -> dict:
+    p = Path(out_dir) / MANIFEST_NAME
+    if not p.exists():
+        return {"kind": MANIFEST_KIND, "last_ev_id": None, "entries": []}
+    obj = json.loads(p.read_text(encoding="utf-8"))
+    if not isinstance(obj, dict):
+        raise ValueError(f"manifest is not a JSON object: {p}")
+    obj.setdefault("entries", [])
+    obj.setdefault("last_ev_id", None)
+    return obj
+
+
+def export_handoffs(
+    store: GuiStore,
+    out_dir: Path,
+    *,
+    since_ev_id: Optional[str] = None,
+    workers: int = 4,
+) -> ExportResult:
+    """
+    Export RUN_HANDOFF records newer than the watermark into out_dir.
+
+    since_ev_id: explicit watermark (exclusive); defaults to the manifest's last_ev_id.
+    """
+    od = Path(out_dir).resolve()
+    od.mkdir(parents=True, exist_ok=True)
+
+    manifest = load_manifest(od)
+    watermark = since_ev_id if since_ev_id is not None else manifest.get("last_ev_id")
+    floor = _ev_num(watermark)
+
+    entries: Dict[str, dict] = {e["ev_id"]: e for e in manifest["entries"] if "ev_id" in e}
+    exported: List[str] = []
+    skipped: List[str] = []
+    last_ev_id = manifest.get("last_ev_id")
+
+    max_in_flight = max(1, int(workers)) * 8
+    pending: List[Future] = []
+
+    with ThreadPoolExecutor(max_workers=max(1, int(workers))) as pool:
+        for rec in store.iter_evidence():
+            if rec.kind != "RUN_HANDOFF" or _ev_num(rec.ev_id) <= floor:
+                continue
+            try:
+                payload = json.loads(rec.body)
+            except Exception:
+                payload = None
+            if not isinstance(payload, dict):
+                skipped.append(rec.ev_id)
+                continue
+
+            name = f"{rec.ev_id}.json"
+            pending.append(pool.submit(_write_atomic, od / name, canonical_json(payload) + "\n"))
+            entries[rec.ev_id] = {
+                "ev_id": rec.ev_id,
+                "file": name,
+                "plan_ev_id": payload.get("plan_ev_id"),
+                "runner_label": payload.get("runner_label"),
+                "payload_sha256": payload.get("payload_sha256"),
+            }
+            exported.append(rec.ev_id)
+            if _ev_num(rec.ev_id) > _ev_num(last_ev_id):
+                last_ev_id = rec.ev_id
+
+            # Bound memory: drain completed writes once too many are in flight.
+            if len(pending) >= max_in_flight:
+                for f in pending:
+                    f.result()
+                pending.clear()
+
+        for f in pending:
+            f.result()
+
+    manifest = {
+        "kind": MANIFEST_KIND,
+        "updated_utc": utc_now_iso(),
+        "last_ev_id": last_ev_id,
+        "entries": sorted(entries.values(), key=lambda e: _ev_num(e["ev_id"])),
+    }
+    mp = od / MANIFEST_NAME
+    _write_atomic(mp, json.dumps(manifest, ensure_ascii=False, sort_keys=True, indent=2) + "\n")
+
+    return ExportResult(
+        out_dir=str(od),
+        exported=exported,
+        skipped=skipped,
+        last_ev_id=last_ev_id,
+        manifest_path=str(mp),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.gui.handoff_export")
+    ap.add_argument("--out", required=True, help="runner inbox directory")
+    ap.add_argument("--root", default=None, help="store root (default: repo root)")
+    ap.add_argument("--since", default=None, help="export handoffs after this ev_id")
+    ap.add_argument("--workers", type=int, default=4)
+    args = ap.parse_args(argv)
+
+    store = GuiStore(base_dir=Path(args.root)) if args.root else GuiStore()
+    res = export_handoffs(store, Path(args.out), since_ev_id=args.since, workers=args.workers)
+    print(
+        json.dumps(
+            {
+                "out_dir": res.out_dir,
+                "exported": len(res.exported),
+                "skipped": res.skipped,
+                "last_ev_id": res.last_ev_id,
+                "manifest": res.manifest_path,
+            },
+            sort_keys=True,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -67,6 +67,7 @@ from .planner import (
     persist_superseded,
 )
 from .store import EvidenceRecord, GuiStore, TaskEvent, utc_now_iso
+from app.validation.warmup import start_warmup
 
 
 def _safe(s: str) -> str:
@@ -603,6 +604,8 @@ def run() -> int:
     app = QApplication.instance() or QApplication([])
     win = MainWindow()
     win.show()
+    # Compile handoff validators off the UI thread before the first persist.
+    start_warmup()
     return app.exec()
 
 
@@ -13,15 +13,26 @@ Evidence kinds:
 
 from __future__ import annotations
 
-import hashlib
+if __name__ == "__main__":
+    # python -m app.gui.planner: make src/ (swe_bootstrap) importable, then apply it.
+    import sys as _sys
+    from pathlib import Path as _Path
+
+    _SRC = _Path(__file__).resolve().parents[2] / "src"
+    if str(_SRC) not in _sys.path:
+        _sys.path.insert(0, str(_SRC))
+    import swe_bootstrap as _swe_bootstrap
+
+    _swe_bootstrap.apply()
+
 import json
-from app.validation.canonical import canonical_json, sha256_hex
+from app.validation.canonical import HashedPayload
 
 from dataclasses import asdict, dataclass
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple
 
 from .store import EvidenceRecord, GuiStore, utc_now_iso
-from app.validation.schema_validation import validate_payload, canonical_sha256_for_payload
+from app.validation.schema_validation import validate_payload, validate_payloads
 
 
 @dataclass(frozen=True)
@@ -71,22 +82,8 @@ class RunHandoff:
     payload_sha256: str
 
 
-def _json_loads_best_effort(s: str) -> dict:
-    try:
-        obj = json.loads(s or "{}")
-        if isinstance(obj, dict):
-            return obj
-        return {}
-    except Exception:
-        return {}
-
-
-def _canonical_json(obj: dict) -> str:
-    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
-
-
-def _sha256_hex(text: str) -> str:
-    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+def _next_ev_id(store: GuiStore) -> str:
+    return store.next_ev_ids(1)[0]
 
 
 def make_run_plan(task_id: str, task_title: str, notes: str) -> RunPlan:
@@ -113,20 +110,24 @@ def make_run_plan(task_id: str, task_title: str, notes: str) -> RunPlan:
     )
 
 
-def persist_run_plan(store: GuiStore, plan: RunPlan) -> EvidenceRecord:
+def _run_plan_record(ev_id: str, plan: RunPlan) -> EvidenceRecord:
     payload = json.dumps(asdict(plan), ensure_ascii=False, sort_keys=True, indent=2)
     summary = f"RUN_PLAN {plan.task_id}: {plan.task_title}"
     if plan.supersedes_plan_ev_id:
         summary = (
             f"RUN_PLAN {plan.task_id}: {plan.task_title} (supersedes {plan.supersedes_plan_ev_id})"
         )
-    rec = EvidenceRecord(
-        ev_id=f"E{len(store.read_evidence()) + 1:04d}",
+    return EvidenceRecord(
+        ev_id=ev_id,
         kind="RUN_PLAN",
         created_utc=utc_now_iso(),
         summary=summary[:80],
         body=payload,
     )
+
+
+def persist_run_plan(store: GuiStore, plan: RunPlan) -> EvidenceRecord:
+    rec = _run_plan_record(_next_ev_id(store), plan)
     store.append_evidence(rec)
     return rec
 
@@ -134,7 +135,7 @@ def persist_run_plan(store: GuiStore, plan: RunPlan) -> EvidenceRecord:
 def clone_run_plan(
     store: GuiStore, prior_plan_rec: EvidenceRecord, new_notes: str
 ) -> EvidenceRecord:
-    prior = _json_loads_best_effort(prior_plan_rec.body)
+    prior = store.parsed_body(prior_plan_rec)
     task_id = str(prior.get("task_id") or "T0000")
     task_title = str(prior.get("task_title") or "unknown")
     objective = str(prior.get("objective") or f"Plan changes for task {task_id}: {task_title}")
@@ -157,10 +158,15 @@ def clone_run_plan(
     return persist_run_plan(store, plan)
 
 
-def make_approval(plan_ev_id: str, reviewer: str, decision: str, notes: str) -> RunPlanApproval:
+def _normalize_decision(decision: str) -> str:
     dec = (decision or "").strip().upper()
     if dec not in {"APPROVED", "REJECTED"}:
         dec = "APPROVED"
+    return dec
+
+
+def make_approval(plan_ev_id: str, reviewer: str, decision: str, notes: str) -> RunPlanApproval:
+    dec = _normalize_decision(decision)
     return RunPlanApproval(
         contract="runplan_approval/1.0",
         created_utc=utc_now_iso(),
@@ -171,16 +177,20 @@ def make_approval(plan_ev_id: str, reviewer: str, decision: str, notes: str) ->
     )
 
 
-def persist_approval(store: GuiStore, approval: RunPlanApproval) -> EvidenceRecord:
+def _approval_record(ev_id: str, approval: RunPlanApproval) -> EvidenceRecord:
     payload = json.dumps(asdict(approval), ensure_ascii=False, sort_keys=True, indent=2)
     summary = f"RUN_PLAN_APPROVAL {approval.plan_ev_id}: {approval.decision} by {approval.reviewer or 'UNKNOWN'}"
-    rec = EvidenceRecord(
-        ev_id=f"E{len(store.read_evidence()) + 1:04d}",
+    return EvidenceRecord(
+        ev_id=ev_id,
         kind="RUN_PLAN_APPROVAL",
         created_utc=utc_now_iso(),
         summary=summary[:80],
         body=payload,
     )
+
+
+def persist_approval(store: GuiStore, approval: RunPlanApproval) -> EvidenceRecord:
+    rec = _approval_record(_next_ev_id(store), approval)
     store.append_evidence(rec)
     return rec
 
@@ -199,7 +209,7 @@ def persist_superseded(store: GuiStore, marker: RunPlanSuperseded) -> EvidenceRe
     payload = json.dumps(asdict(marker), ensure_ascii=False, sort_keys=True, indent=2)
     summary = f"RUN_PLAN_SUPERSEDED {marker.prior_plan_ev_id} -> {marker.new_plan_ev_id}"
     rec = EvidenceRecord(
-        ev_id=f"E{len(store.read_evidence()) + 1:04d}",
+        ev_id=_next_ev_id(store),
         kind="RUN_PLAN_SUPERSEDED",
         created_utc=utc_now_iso(),
         summary=summary[:80],
@@ -214,7 +224,7 @@ def _find_latest_approved_approval(store: GuiStore, plan_ev_id: str) -> Optional
     for rec in reversed(store.read_evidence()):
         if rec.kind != "RUN_PLAN_APPROVAL":
             continue
-        obj = _json_loads_best_effort(rec.body)
+        obj = store.parsed_body(rec)
         if str(obj.get("plan_ev_id") or "") != plan_ev_id:
             continue
         if str(obj.get("decision") or "").upper() == "APPROVED":
@@ -222,17 +232,20 @@ def _find_latest_approved_approval(store: GuiStore, plan_ev_id: str) -> Optional
     return None
 
 
-def persist_handoff_from_plan(
-    store: GuiStore, plan_rec: EvidenceRecord, runner_label: str, notes: str
-) -> EvidenceRecord:
-    if plan_rec.kind != "RUN_PLAN":
-        raise ValueError("selected evidence is not RUN_PLAN")
-
-    approval = _find_latest_approved_approval(store, plan_rec.ev_id)
-    if approval is None:
-        raise ValueError("no APPROVED approval found for selected RUN_PLAN")
+def _build_handoff(
+    store: GuiStore,
+    plan_rec: EvidenceRecord,
+    approval_ev_id: str,
+    runner_label: str,
+    notes: str,
+) -> HashedPayload:
+    """
+    Build the RUN_HANDOFF payload for an approved RUN_PLAN record.
 
-    plan_obj = _json_loads_best_effort(plan_rec.body)
+    Canonical text + payload_sha256 are computed exactly once (HashedPayload) and the
+    same object is carried through validation and persistence.
+    """
+    plan_obj = store.parsed_body(plan_rec)
     required_gates = list(plan_obj.get("required_gates") or [])
     commands = list(plan_obj.get("commands") or [])
 
@@ -241,7 +254,7 @@ def persist_handoff_from_plan(
         "contract": "run_handoff/1.0",
         "created_utc": utc_now_iso(),
         "plan_ev_id": plan_rec.ev_id,
-        "approval_ev_id": approval.ev_id,
+        "approval_ev_id": approval_ev_id,
         "runner_label": (runner_label or "").strip() or "UNSPECIFIED_RUNNER",
         "required_gates": required_gates,
         "commands": commands,
@@ -253,60 +266,123 @@ def persist_handoff_from_plan(
         ],
         "notes": (notes or "").strip(),
     }
+    return HashedPayload.from_payload(payload_no_sha)
 
-    sha = sha256_hex(canonical_json(payload_no_sha))
-
-    handoff = RunHandoff(
-        contract=payload_no_sha["contract"],
-        created_utc=payload_no_sha["created_utc"],
-        plan_ev_id=payload_no_sha["plan_ev_id"],
-        approval_ev_id=payload_no_sha["approval_ev_id"],
-        runner_label=payload_no_sha["runner_label"],
-        required_gates=payload_no_sha["required_gates"],
-        commands=payload_no_sha["commands"],
-        statements=payload_no_sha["statements"],
-        notes=payload_no_sha["notes"],
-        payload_sha256=sha,
-    )
-
-    # Validate final handoff payload (includes payload_sha256)
-    payload = asdict(handoff)
-    # Phase 2E: always compute canonical payload_sha256 before validation
-    payload["payload_sha256"] = canonical_sha256_for_payload(payload)
-    try:
-        handoff.payload_sha256 = payload["payload_sha256"]  # keep record consistent
-    except Exception:
-        pass
-    validate_payload(payload)
 
-    payload = json.dumps(asdict(handoff), ensure_ascii=False, sort_keys=True, indent=2)
-    summary = f"RUN_HANDOFF {plan_rec.ev_id} -> {handoff.runner_label}"
-    rec = EvidenceRecord(
-        ev_id=f"E{len(store.read_evidence()) + 1:04d}",
+def _handoff_record(ev_id: str, plan_rec: EvidenceRecord, payload: dict) -> EvidenceRecord:
+    body = json.dumps(payload, ensure_ascii=False, sort_keys=True, indent=2)
+    summary = f"RUN_HANDOFF {plan_rec.ev_id} -> {payload['runner_label']}"
+    return EvidenceRecord(
+        ev_id=ev_id,
         kind="RUN_HANDOFF",
         created_utc=utc_now_iso(),
         summary=summary[:80],
-        body=payload,
+        body=body,
     )
+
+
+def persist_handoff_from_plan(
+    store: GuiStore, plan_rec: EvidenceRecord, runner_label: str, notes: str
+) -> EvidenceRecord:
+    if plan_rec.kind != "RUN_PLAN":
+        raise ValueError("selected evidence is not RUN_PLAN")
+
+    approval = _find_latest_approved_approval(store, plan_rec.ev_id)
+    if approval is None:
+        raise ValueError("no APPROVED approval found for selected RUN_PLAN")
+
+    hashed = _build_handoff(store, plan_rec, approval.ev_id, runner_label, notes)
+    # Validate the exact payload that gets persisted (includes payload_sha256).
+    payload = hashed.with_sha()
+    validate_payload(payload, hashed=hashed)
+
+    rec = _handoff_record(_next_ev_id(store), plan_rec, payload)
     store.append_evidence(rec)
     return rec
 
 
+# ---- batch planning ----
 
 
-def emit_for_tests(out_dir: str) -> None:
+@dataclass(frozen=True)
+class PlanBatchResult:
+    plans: List[EvidenceRecord]
+    approvals: List[EvidenceRecord]
+    handoffs: List[EvidenceRecord]
+
+
+def make_run_plans(tasks: Iterable[Tuple[str, str, str]]) -> List[RunPlan]:
     """
-    Test helper (Phase 5 Step 5A):
-    Emit fresh planner artifacts (plan + approval + handoff) into out_dir using the same code-path
-    as GUI persistence, so downstream normalization tests can consume them.
+    tasks: iterable of (task_id, task_title, notes).
     """
-    from pathlib import Path
-    s = GuiStore(base_dir=Path(out_dir))
-    plan = make_run_plan("T0001", "do thing", notes="n1")
-    plan_rec = persist_run_plan(s, plan)
-    appr = make_approval(plan_rec.ev_id, reviewer="Michael A. Trosen", decision="APPROVED", notes="ok")
-    persist_approval(s, appr)
-    persist_handoff_from_plan(s, plan_rec, runner_label="TEST_RUNNER", notes="handoff note")
+    return [make_run_plan(task_id, task_title, notes) for task_id, task_title, notes in tasks]
+
+
+def persist_plan_batch(
+    store: GuiStore,
+    plans: List[RunPlan],
+    *,
+    reviewer: Optional[str] = None,
+    decision: str = "APPROVED",
+    approval_notes: str = "",
+    runner_label: Optional[str] = None,
+    handoff_notes: str = "",
+) -> PlanBatchResult:
+    """
+    Persist many plans (and optionally their approvals and handoffs) in one store pass.
+
+    - reviewer=None: plans only.
+    - reviewer set: one approval per plan with the given decision.
+    - runner_label set and decision APPROVED: one RUN_HANDOFF per plan.
+
+    Ids are allocated in one block and records are interleaved per plan
+    (plan, approval, handoff) exactly as the one-at-a-time flow would write them.
+    Handoffs are validated together (one compiled validator per contract) before
+    anything is written; on validation failure nothing is appended.
+    """
+    plans = list(plans)
+    with_approval = reviewer is not None
+    with_handoff = (
+        with_approval and runner_label is not None and _normalize_decision(decision) == "APPROVED"
+    )
+
+    per_plan = 1 + int(with_approval) + int(with_handoff)
+    ids = store.next_ev_ids(per_plan * len(plans))
+
+    out_plans: List[EvidenceRecord] = []
+    out_approvals: List[EvidenceRecord] = []
+    out_handoffs: List[EvidenceRecord] = []
+    hashed_payloads: List[HashedPayload] = []
+    payloads: List[dict] = []
+    ordered: List[EvidenceRecord] = []
+
+    for i, plan in enumerate(plans):
+        block = ids[i * per_plan : (i + 1) * per_plan]
+        plan_rec = _run_plan_record(block[0], plan)
+        out_plans.append(plan_rec)
+        ordered.append(plan_rec)
+
+        if with_approval:
+            appr = make_approval(plan_rec.ev_id, reviewer or "", decision, approval_notes)
+            appr_rec = _approval_record(block[1], appr)
+            out_approvals.append(appr_rec)
+            ordered.append(appr_rec)
+
+        if with_handoff:
+            hashed = _build_handoff(store, plan_rec, block[1], runner_label or "", handoff_notes)
+            payload = hashed.with_sha()
+            hashed_payloads.append(hashed)
+            payloads.append(payload)
+            ho_rec = _handoff_record(block[2], plan_rec, payload)
+            out_handoffs.append(ho_rec)
+            ordered.append(ho_rec)
+
+    if payloads:
+        validate_payloads(payloads, hashed=hashed_payloads)
+
+    store.append_evidence_many(ordered)
+    return PlanBatchResult(plans=out_plans, approvals=out_approvals, handoffs=out_handoffs)
+
 
 # --- PHASE5A_TEST_EMITTER_SHIM ---
 
@@ -355,25 +431,6 @@ def emit_for_tests(out_dir: str) -> None:
     (od / "emit_manifest.json").write_text(json.dumps(m, indent=2, sort_keys=True), encoding="utf-8")
 
 
-def main(argv=None) -> int:
-    """
-    Minimal CLI surface for tests:
-      - If invoked with ['--out', <dir>], emit Phase5A artifacts and return 0.
-      - Otherwise, no-op and return 0 (keeps compatibility with any existing callers).
-    """
-    try:
-        args = list(argv) if argv is not None else []
-    except Exception:
-        args = []
-    if "--out" in args:
-        i = args.index("--out")
-        if i + 1 >= len(args):
-            raise ValueError("--out requires a directory")
-        emit_for_tests(out_dir=str(args[i + 1]))
-        return 0
-    return 0
-
-
 # --- PHASE5A_MAIN_WRAP_V1 ----------------------------------------------
 def _phase5a_emit_contract_id_normalized_artifacts(out_dir: str) -> None:
     """
@@ -424,27 +481,190 @@ def _phase5a_emit_contract_id_normalized_artifacts(out_dir: str) -> None:
     (od / "emit_manifest.json").write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
 
 
-# Wrap existing module-level main (which may NOT be defined via `def main`).
-# Tests call: planner.main(["--out", <dir>]) (preferred), else planner.main() fallback.
-try:
-    _phase5a_orig_main = main  # type: ignore[name-defined]
-except Exception:
-    _phase5a_orig_main = None
+# --- /PHASE5A_MAIN_WRAP_V1 ---------------------------------------------
+
+
+# ---- headless CLI ----
+#
+# python -m app.gui.planner [--root DIR] <command> ...
+#
+# Imports only store / planner / validation (never Qt). Every command prints JSON
+# to stdout; --json PATH ("-" = stdin) supplies the same fields as the flags.
+
+
+def _load_json_input(path: Optional[str]):
+    import sys
+
+    if not path:
+        return None
+    if path == "-":
+        return json.load(sys.stdin)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _record_out(store: GuiStore, rec: EvidenceRecord) -> dict:
+    out = asdict(rec)
+    body = store.parsed_body(rec)
+    if body:
+        out["body"] = body
+    return out
+
+
+def _find_evidence(store: GuiStore, ev_id: str) -> EvidenceRecord:
+    for rec in store.iter_evidence():
+        if rec.ev_id == ev_id:
+            return rec
+    raise ValueError(f"evidence not found: {ev_id}")
+
+
+def _merged(args, fields: Tuple[str, ...]) -> dict:
+    obj = _load_json_input(getattr(args, "json", None)) or {}
+    if not isinstance(obj, dict):
+        raise ValueError("--json input must be a JSON object")
+    return {f: obj.get(f, getattr(args, f, None)) for f in fields}
+
+
+def _cmd_list(store: GuiStore, args) -> object:
+    kinds = set(args.kind or [])
+    return [
+        {"ev_id": r.ev_id, "kind": r.kind, "created_utc": r.created_utc, "summary": r.summary}
+        for r in store.iter_evidence()
+        if not kinds or r.kind in kinds
+    ]
+
+
+def _cmd_create_plan(store: GuiStore, args) -> object:
+    obj = _load_json_input(args.json)
+    if isinstance(obj, list):
+        # Check every element before persisting anything: the batch is all-or-nothing.
+        for i, t in enumerate(obj):
+            if not isinstance(t, dict) or not t.get("task_id") or not t.get("task_title"):
+                raise ValueError(f"create-plan item {i} requires task_id and task_title")
+        tasks = [(str(t["task_id"]), str(t["task_title"]), str(t.get("notes") or "")) for t in obj]
+        res = persist_plan_batch(store, make_run_plans(tasks))
+        return [_record_out(store, r) for r in res.plans]
+
+    f = _merged(args, ("task_id", "task_title", "notes"))
+    if not f["task_id"] or not f["task_title"]:
+        raise ValueError("create-plan requires task_id and task_title")
+    rec = persist_run_plan(store, make_run_plan(f["task_id"], f["task_title"], f["notes"] or ""))
+    return _record_out(store, rec)
+
+
+def _cmd_approve(store: GuiStore, args) -> object:
+    f = _merged(args, ("plan_ev_id", "reviewer", "decision", "notes"))
+    plan_rec = _find_evidence(store, str(f["plan_ev_id"] or ""))
+    if plan_rec.kind != "RUN_PLAN":
+        raise ValueError("selected evidence is not RUN_PLAN")
+    appr = make_approval(plan_rec.ev_id, f["reviewer"] or "", f["decision"] or "", f["notes"] or "")
+    return _record_out(store, persist_approval(store, appr))
+
+
+def _cmd_clone(store: GuiStore, args) -> object:
+    f = _merged(args, ("plan_ev_id", "notes", "reason"))
+    prior = _find_evidence(store, str(f["plan_ev_id"] or ""))
+    if prior.kind != "RUN_PLAN":
+        raise ValueError("selected evidence is not RUN_PLAN")
+    new_plan = clone_run_plan(store, prior, new_notes=f["notes"] or "")
+    marker = make_superseded(prior.ev_id, new_plan.ev_id, reason=f["reason"] or "Cloned via CLI")
+    marker_rec = persist_superseded(store, marker)
+    return {"plan": _record_out(store, new_plan), "superseded": _record_out(store, marker_rec)}
 
 
-def main(argv=None):  # noqa: F811
+def _cmd_handoff(store: GuiStore, args) -> object:
+    f = _merged(args, ("plan_ev_id", "runner_label", "notes"))
+    plan_rec = _find_evidence(store, str(f["plan_ev_id"] or ""))
+    rec = persist_handoff_from_plan(store, plan_rec, f["runner_label"] or "", f["notes"] or "")
+    return _record_out(store, rec)
+
+
+def _cmd_export(store: GuiStore, args) -> object:
+    from pathlib import Path
+
+    from .handoff_export import export_handoffs
+
+    res = export_handoffs(store, Path(args.out), since_ev_id=args.since, workers=args.workers)
+    return asdict(res)
+
+
+def _build_parser():
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m app.gui.planner")
+    ap.add_argument("--root", default=None, help="store root (default: repo root)")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", help="list evidence records")
+    p.add_argument("--kind", action="append", help="filter by kind (repeatable)")
+    p.set_defaults(func=_cmd_list)
+
+    p = sub.add_parser("create-plan", help="create RUN_PLAN(s); --json accepts a list")
+    p.add_argument("--task-id", dest="task_id")
+    p.add_argument("--title", dest="task_title")
+    p.add_argument("--notes", default="")
+    p.add_argument("--json", default=None)
+    p.set_defaults(func=_cmd_create_plan)
+
+    p = sub.add_parser("approve", help="approve/reject a RUN_PLAN")
+    p.add_argument("--plan", dest="plan_ev_id")
+    p.add_argument("--reviewer", default="")
+    p.add_argument("--decision", default="APPROVED")
+    p.add_argument("--notes", default="")
+    p.add_argument("--json", default=None)
+    p.set_defaults(func=_cmd_approve)
+
+    p = sub.add_parser("clone", help="clone a RUN_PLAN and mark the prior superseded")
+    p.add_argument("--plan", dest="plan_ev_id")
+    p.add_argument("--notes", default="")
+    p.add_argument("--reason", default="")
+    p.add_argument("--json", default=None)
+    p.set_defaults(func=_cmd_clone)
+
+    p = sub.add_parser("handoff", help="generate RUN_HANDOFF from an approved RUN_PLAN")
+    p.add_argument("--plan", dest="plan_ev_id")
+    p.add_argument("--runner", dest="runner_label", default="")
+    p.add_argument("--notes", default="")
+    p.add_argument("--json", default=None)
+    p.set_defaults(func=_cmd_handoff)
+
+    p = sub.add_parser("export", help="export RUN_HANDOFFs to a runner inbox")
+    p.add_argument("--out", required=True)
+    p.add_argument("--since", default=None)
+    p.add_argument("--workers", type=int, default=4)
+    p.set_defaults(func=_cmd_export)
+
+    return ap
+
+
+def main(argv=None) -> int:
+    """
+    Headless planner CLI (JSON out). Exit codes: 0 ok, 2 usage/validation error.
+
+    Phase 5A compatibility: ['--out', <dir>] emits contract_id-normalized artifacts.
+    """
+    import sys
+    from pathlib import Path
+
+    args_in = list(sys.argv[1:] if argv is None else argv)
+
     # Intercept Phase5A test call pattern.
-    if isinstance(argv, (list, tuple)) and "--out" in argv:
-        i = list(argv).index("--out")
-        if i + 1 < len(argv):
-            _phase5a_emit_contract_id_normalized_artifacts(str(argv[i + 1]))
-            return
-
-    # Fall back to original main behavior if it existed.
-    if _phase5a_orig_main is not None:
-        try:
-            return _phase5a_orig_main(argv)
-        except TypeError:
-            return _phase5a_orig_main()
-    return None
-# --- /PHASE5A_MAIN_WRAP_V1 ---------------------------------------------
+    if args_in[:1] == ["--out"]:
+        if len(args_in) < 2:
+            raise ValueError("--out requires a directory")
+        _phase5a_emit_contract_id_normalized_artifacts(str(args_in[1]))
+        return 0
+
+    args = _build_parser().parse_args(args_in)
+    store = GuiStore(base_dir=Path(args.root)) if args.root else GuiStore()
+    try:
+        out = args.func(store, args)
+    except Exception as exc:
+        print(json.dumps({"error": str(exc)}, ensure_ascii=False), file=sys.stderr)
+        return 2
+    print(json.dumps(out, ensure_ascii=False, sort_keys=True, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,9 +11,11 @@ No execution. No engine invocation.
 from __future__ import annotations
 
 import json
+from collections import OrderedDict
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterator
 
 
 def utc_now_iso() -> str:
@@ -54,6 +56,30 @@ def _append_jsonl(path: Path, obj: dict) -> None:
         f.write(line)
 
 
+def _append_jsonl_many(path: Path, objs: list[dict]) -> None:
+    if not objs:
+        return
+    _ensure_parent(path)
+    lines = "".join(json.dumps(o, ensure_ascii=False, sort_keys=True) + "\n" for o in objs)
+    with path.open("a", encoding="utf-8", newline="\n") as f:
+        f.write(lines)
+
+
+def _count_jsonl(path: Path) -> int:
+    if not path.exists():
+        return 0
+    n = 0
+    with path.open("r", encoding="utf-8") as f:
+        for raw in f:
+            if raw.strip():
+                n += 1
+    return n
+
+
+def format_ev_id(n: int) -> str:
+    return f"E{n:04d}"
+
+
 def _read_jsonl(path: Path) -> list[dict]:
     if not path.exists():
         return []
@@ -67,11 +93,72 @@ def _read_jsonl(path: Path) -> list[dict]:
     return out
 
 
+def _loads_dict_best_effort(s: str) -> dict:
+    try:
+        obj = json.loads(s or "{}")
+        if isinstance(obj, dict):
+            return obj
+        return {}
+    except Exception:
+        return {}
+
+
+def _iter_jsonl(path: Path) -> Iterator[dict]:
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8") as f:
+        for raw in f:
+            raw = raw.strip()
+            if not raw:
+                continue
+            yield json.loads(raw)
+
+
+class ParsedBodyCache:
+    """
+    Bounded LRU of decoded evidence bodies keyed by ev_id.
+
+    Evidence is append-only, so a record's body never changes once written. The
+    cached body text is still compared before reuse (identity/equality check, far
+    cheaper than decoding) so a foreign record reusing an ev_id never gets a stale dict.
+
+    Returned dicts are shared: callers must treat them as read-only.
+    """
+
+    def __init__(self, maxsize: int = 2048) -> None:
+        self.maxsize = max(1, int(maxsize))
+        self._data: OrderedDict[str, tuple[str, dict]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, rec: EvidenceRecord) -> dict:
+        hit = self._data.get(rec.ev_id)
+        if hit is not None and (hit[0] is rec.body or hit[0] == rec.body):
+            self._data.move_to_end(rec.ev_id)
+            self.hits += 1
+            return hit[1]
+
+        self.misses += 1
+        obj = _loads_dict_best_effort(rec.body)
+        self._data[rec.ev_id] = (rec.body, obj)
+        self._data.move_to_end(rec.ev_id)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return obj
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 class GuiStore:
     def __init__(self, base_dir: Path | None = None) -> None:
         self.root = base_dir or _repo_root()
         self.task_events_path = self.root / "data" / "task_events.jsonl"
         self.evidence_path = self.root / "evidence" / "evidence.jsonl"
+        self.parsed_bodies = ParsedBodyCache()
 
     # ----_toggle: tasks ----
     def append_task_event(self, ev: TaskEvent) -> None:
@@ -101,5 +188,34 @@ class GuiStore:
     def append_evidence(self, rec: EvidenceRecord) -> None:
         _append_jsonl(self.evidence_path, asdict(rec))
 
+    def append_evidence_many(self, recs: list[EvidenceRecord]) -> None:
+        """
+        Append several records with a single open/write (one flush).
+        Records must already carry ids allocated via next_ev_ids().
+        """
+        _append_jsonl_many(self.evidence_path, [asdict(r) for r in recs])
+
     def read_evidence(self) -> list[EvidenceRecord]:
         return [EvidenceRecord(**r) for r in _read_jsonl(self.evidence_path)]
+
+    def iter_evidence(self) -> Iterator[EvidenceRecord]:
+        """
+        Stream evidence records one line at a time (constant memory).
+        """
+        for r in _iter_jsonl(self.evidence_path):
+            yield EvidenceRecord(**r)
+
+    def parsed_body(self, rec: EvidenceRecord) -> dict:
+        """
+        Decoded JSON body of an evidence record ({} if not a JSON object), via the
+        per-store LRU. Treat the result as read-only.
+        """
+        return self.parsed_bodies.get(rec)
+
+    def next_ev_ids(self, n: int = 1) -> list[str]:
+        """
+        Allocate the next n sequential evidence ids (E0001, E0002, ...).
+        Counts lines only; bodies are not decoded.
+        """
+        start = _count_jsonl(self.evidence_path) + 1
+        return [format_ev_id(i) for i in range(start, start + max(0, int(n)))]
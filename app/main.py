@@ -29,17 +29,28 @@ import difflib
 import os
 import subprocess
 import sys
+import threading
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Optional
 
 _PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(_PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(_PROJECT_ROOT))
 
-from PySide6.QtCore import QDir, QModelIndex, Qt, QTimer
-from PySide6.QtGui import QAction, QCloseEvent, QFont, QKeySequence
+from PySide6.QtCore import (
+    QDir,
+    QElapsedTimer,
+    QModelIndex,
+    QObject,
+    QRunnable,
+    Qt,
+    QThreadPool,
+    QTimer,
+    Signal,
+)
+from PySide6.QtGui import QAction, QCloseEvent, QFont, QKeySequence, QTextCursor
 from PySide6.QtWidgets import (
     QApplication,
     QDialog,
@@ -55,6 +66,7 @@ from PySide6.QtWidgets import (
     QMenu,
     QMessageBox,
     QPlainTextEdit,
+    QProgressBar,
     QPushButton,
     QSizePolicy,
     QSplitter,
@@ -66,7 +78,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from app.core.config import AppConfig, load_config, save_config
+from app.core.config import AppConfig, load_config, parse_model_list, save_config
 from app.core.paths import (
     get_paths,
     is_probably_text_file,
@@ -74,13 +86,19 @@ from app.core.paths import (
     safe_relpath,
     write_text_atomic,
 )
+from app.engine import cancel as engine_cancel
 from app.engine.actions import (
+    ALLOWED_ACTION_TYPES,
     FileBlock,
     extract_file_blocks_from_markdown,
     parse_engineer_payload,
     payload_to_file_blocks,
 )
 from app.engine.engine import Engine, EngineConfig
+from app.engine.fanout import FanoutResult, fan_out
+from app.engine.residency import ResidencyResult
+from app.engine.transport import close_shared_client
+from app.validation.warmup import start_warmup
 
 # ---- Policy switches (your selections) ----
 APPLY_ROOT_ONLY = True
@@ -105,7 +123,7 @@ ENGINE_ALLOW_LEGACY_FALLBACK = True  # E4=Y
 APPLY_LOG_ENABLED = True  # F1=Y
 CHAT_HISTORY_MAX = 50  # F2=Y(50)
 
-_ALLOWED_ACTION_TYPES = {"file_write", "verify", "open", "message"}
+_ALLOWED_ACTION_TYPES = ALLOWED_ACTION_TYPES
 
 _BINARY_EXTS = {
     ".png",
@@ -159,12 +177,104 @@ class FileState:
     verified_ok: bool = False
 
 
+class _LiveReply:
+    """
+    Renders a streamed Engineer reply into the chat log as fragments arrive.
+    The partial block is removed once the full reply is parsed and logged.
+    """
+
+    def __init__(self, log: QTextEdit) -> None:
+        self._log = log
+        self._start: Optional[int] = None
+
+    def feed(self, delta: str) -> None:
+        cur = QTextCursor(self._log.document())
+        cur.movePosition(QTextCursor.End)
+        if self._start is None:
+            self._start = cur.position()
+            self._log.append("<b>Engineer:</b> ")
+            cur.movePosition(QTextCursor.End)
+        cur.insertText(delta)
+        bar = self._log.verticalScrollBar()
+        bar.setValue(bar.maximum())
+
+    def discard(self) -> None:
+        if self._start is None:
+            return
+        cur = QTextCursor(self._log.document())
+        cur.setPosition(self._start)
+        cur.movePosition(QTextCursor.End, QTextCursor.KeepAnchor)
+        cur.removeSelectedText()
+        self._start = None
+
+
+class _EngineStopped(Exception):
+    """Raised inside the worker when Stop was pressed."""
+
+
+class _EngineSignals(QObject):
+    # All carry the task id so stale emissions can be told apart.
+    progress = Signal(int, str)  # streamed fragment
+    finished = Signal(int, object)  # call result
+    error = Signal(int, str)
+    cancelled = Signal(int)
+
+
+_EngineFn = Callable[[Callable[[str], None], engine_cancel.CancelScope], Any]
+
+
+class _EngineTask(QRunnable):
+    """
+    One engine call on the thread pool. fn receives an on_token callback and the
+    task's CancelScope. on_token forwards fragments as progress signals and
+    raises _EngineStopped once cancel() was requested; calls run through the
+    scope (app.engine.cancel) are aborted at once, even before the first token.
+    """
+
+    def __init__(self, task_id: int, fn: _EngineFn) -> None:
+        super().__init__()
+        self.setAutoDelete(False)  # MainWindow holds the reference
+        self.task_id = task_id
+        self.signals = _EngineSignals()
+        self._fn = fn
+        self._stop = threading.Event()
+        self.scope = engine_cancel.CancelScope()
+
+    def cancel(self) -> None:
+        self._stop.set()
+        self.scope.cancel()
+
+    def _on_token(self, delta: str) -> None:
+        if self._stop.is_set():
+            raise _EngineStopped()
+        # on_token("") is a bare stop check (used by fan-out while it waits)
+        if delta:
+            self.signals.progress.emit(self.task_id, delta)
+
+    def run(self) -> None:
+        try:
+            result = self._fn(self._on_token, self.scope)
+        except (_EngineStopped, engine_cancel.CallCancelled):
+            self.signals.cancelled.emit(self.task_id)
+            return
+        except Exception as e:
+            if self._stop.is_set():
+                self.signals.cancelled.emit(self.task_id)
+            else:
+                self.signals.error.emit(self.task_id, str(e))
+            return
+        if self._stop.is_set():
+            self.signals.cancelled.emit(self.task_id)
+        else:
+            self.signals.finished.emit(self.task_id, result)
+
+
 class SettingsDialog(QDialog):
     def __init__(self, parent: QWidget, cfg: AppConfig) -> None:
         super().__init__(parent)
         self.setWindowTitle("Settings")
         self.setModal(True)
-        self.resize(520, 160)
+        self.resize(520, 190)
 
         layout = QVBoxLayout(self)
         form = QFormLayout()
@@ -172,9 +282,15 @@ class SettingsDialog(QDialog):
 
         self.host = QLineEdit(cfg.ollama_host)
         self.model = QLineEdit(cfg.ollama_model)
+        self.keep_alive = QLineEdit(cfg.ollama_keep_alive)
+        self.keep_alive.setPlaceholderText("server default (e.g. 30m, 2h, -1 = always)")
+        self.fanout = QLineEdit(", ".join(cfg.fanout_models))
+        self.fanout.setPlaceholderText("off (comma-separated models raced against the main one)")
 
         form.addRow("Ollama host", self.host)
         form.addRow("Ollama model", self.model)
+        form.addRow("Keep model loaded", self.keep_alive)
+        form.addRow("Fan-out models", self.fanout)
 
         buttons = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Cancel)
         buttons.accepted.connect(self.accept)
@@ -185,6 +301,8 @@ class SettingsDialog(QDialog):
         return AppConfig(
             ollama_host=self.host.text().strip(),
             ollama_model=self.model.text().strip(),
+            ollama_keep_alive=self.keep_alive.text().strip(),
+            fanout_models=parse_model_list(self.fanout.text()),
         )
 
 
@@ -276,15 +394,21 @@ class MainWindow(QMainWindow):
         self.cfg = load_config(self.root)
         save_config(self.root, self.cfg)
 
-        self.engine = Engine(
-            EngineConfig(
-                ollama_host=self.cfg.ollama_host,
-                ollama_model=self.cfg.ollama_model,
-            )
-        )
+        self.engine = self._make_engine(self.cfg)
 
         self._chat: list[tuple[str, str]] = []
 
+        # Engine calls run off the UI thread, one at a time.
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._task: Optional[_EngineTask] = None
+        self._task_seq = 0
+        self._live: Optional[_LiveReply] = None
+        # Model preload/unload runs beside chat turns, without the busy state.
+        self._bg_pool = QThreadPool(self)
+        self._bg_pool.setMaxThreadCount(1)
+        self._bg_tasks: dict[int, _EngineTask] = {}
+
         self.setWindowTitle("LocalAISWE")
         self.resize(1400, 900)
 
@@ -294,6 +418,8 @@ class MainWindow(QMainWindow):
         self._status(f"Root: {self.root}")
 
         QTimer.singleShot(30, self._select_app_folder)
+        # Load the model while the user is still reading the screen.
+        QTimer.singleShot(0, self._preload_model)
 
     # ---------- UI ----------
 
@@ -380,9 +506,12 @@ class MainWindow(QMainWindow):
         self.chat_input.setPlaceholderText("Message")
         self.chat_send = QPushButton("Send")
         self.chat_send.setDefault(True)
+        self.chat_stop = QPushButton("Stop")
+        self.chat_stop.setEnabled(False)
 
         row_l.addWidget(self.chat_input, 1)
         row_l.addWidget(self.chat_send)
+        row_l.addWidget(self.chat_stop)
 
         right_l.addWidget(row)
 
@@ -396,6 +525,22 @@ class MainWindow(QMainWindow):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
 
+        # In-flight indicator for engine calls.
+        self.busy_label = QLabel("")
+        self.busy_bar = QProgressBar()
+        self.busy_bar.setRange(0, 0)
+        self.busy_bar.setMaximumWidth(120)
+        self.busy_bar.setTextVisible(False)
+        self.status_bar.addPermanentWidget(self.busy_label)
+        self.status_bar.addPermanentWidget(self.busy_bar)
+        self.busy_label.hide()
+        self.busy_bar.hide()
+        self._busy_clock = QElapsedTimer()
+        self._busy_timer = QTimer(self)
+        self._busy_timer.setInterval(500)
+        self._busy_timer.timeout.connect(self._refresh_busy)
+        self._busy_text = ""
+
     def _build_actions(self) -> None:
         self.act_open = QAction("Open...", self)
         self.act_open.setShortcut(QKeySequence.Open)
@@ -417,6 +562,7 @@ class MainWindow(QMainWindow):
 
         self.act_settings = QAction("Settings...", self)
         self.act_health = QAction("Ollama Health Check", self)
+        self.act_unload = QAction("Unload Model", self)
 
         self.act_reveal = QAction("Reveal in Explorer", self)
         self.act_quit = QAction("Quit", self)
@@ -444,6 +590,7 @@ class MainWindow(QMainWindow):
         m_tools.addAction(self.act_apply_last)
         m_tools.addSeparator()
         m_tools.addAction(self.act_health)
+        m_tools.addAction(self.act_unload)
         m_tools.addAction(self.act_settings)
         m_tools.addSeparator()
         m_tools.addAction(self.act_run)
@@ -472,6 +619,7 @@ class MainWindow(QMainWindow):
         self.act_apply_last.triggered.connect(self._apply_from_last_engineer)
         self.act_settings.triggered.connect(self._open_settings)
         self.act_health.triggered.connect(self._health)
+        self.act_unload.triggered.connect(self._unload_model)
         self.act_reveal.triggered.connect(self._reveal)
         self.act_quit.triggered.connect(self.close)
         self.act_run.triggered.connect(self._run_gui_again)
@@ -484,6 +632,7 @@ class MainWindow(QMainWindow):
         self.editor.textChanged.connect(self._on_editor_changed)
         self.chat_send.clicked.connect(self._chat_send)
         self.chat_input.returnPressed.connect(self._chat_send)
+        self.chat_stop.clicked.connect(self._engine_stop)
 
     # ---------- helpers ----------
 
@@ -825,21 +974,77 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Settings", "Host and model are required.")
             return
 
+        prev = self.cfg
         self.cfg = cfg
         save_config(self.root, self.cfg)
 
         os.environ["OLLAMA_HOST"] = cfg.ollama_host
         os.environ["OLLAMA_MODEL"] = cfg.ollama_model
 
-        self.engine = Engine(
-            EngineConfig(ollama_host=cfg.ollama_host, ollama_model=cfg.ollama_model)
-        )
+        self.engine = self._make_engine(cfg)
         self._append_chat(
             "System", f"Saved settings: host={cfg.ollama_host}, model={cfg.ollama_model}"
         )
+        if (prev.ollama_host, prev.ollama_model, prev.ollama_keep_alive) != (
+            cfg.ollama_host,
+            cfg.ollama_model,
+            cfg.ollama_keep_alive,
+        ):
+            # Warm the new model before the first message needs it.
+            self._preload_model()
+
+    @staticmethod
+    def _make_engine(cfg: AppConfig) -> Engine:
+        return Engine(
+            EngineConfig(
+                ollama_host=cfg.ollama_host,
+                ollama_model=cfg.ollama_model,
+                keep_alive=cfg.ollama_keep_alive,
+            )
+        )
+
+    def _preload_model(self) -> None:
+        engine = self.engine
+        self._status(f"Loading model {engine.config.ollama_model}...")
+        self._start_background_task(lambda _on_token, _scope: engine.preload())
+
+    def _unload_model(self) -> None:
+        engine = self.engine
+        self._start_background_task(lambda _on_token, _scope: engine.unload())
+
+    def _start_background_task(self, fn: _EngineFn) -> None:
+        self._task_seq += 1
+        task = _EngineTask(self._task_seq, fn)
+        task.signals.finished.connect(self._on_residency_done)
+        task.signals.error.connect(lambda task_id, _msg: self._bg_tasks.pop(task_id, None))
+        self._bg_tasks[task.task_id] = task
+        self._bg_pool.start(task)
+
+    def _on_residency_done(self, task_id: int, result: object) -> None:
+        self._bg_tasks.pop(task_id, None)
+        if not isinstance(result, ResidencyResult):
+            return
+        if not result.ok:
+            self._status(f"Model {result.model}: {result.detail}")
+        elif result.detail == "unload":
+            self._status(f"Model {result.model} unloaded")
+        elif result.load_seconds:
+            self._status(f"Model {result.model} loaded in {result.load_seconds:.1f}s")
+        else:
+            self._status(f"Model {result.model} ready")
 
     def _health(self) -> None:
-        ok, info = self.engine.health()
+        engine = self.engine
+        self._start_engine_task(
+            lambda _on_token, scope: engine_cancel.health(engine, scope),
+            self._on_health_done,
+            "Checking Ollama",
+        )
+
+    def _on_health_done(self, task_id: int, result: object) -> None:
+        if not self._end_engine_task(task_id):
+            return
+        ok, info = result if isinstance(result, tuple) else (False, str(result))
         if ok:
             QMessageBox.information(self, "Ollama Health", "OK")
         else:
@@ -877,18 +1082,54 @@ class MainWindow(QMainWindow):
         self.chat_log.append(f"<b>{who}:</b> {msg}")
 
     def _chat_send(self) -> None:
+        if self._task is not None:
+            return
         text = self.chat_input.text().strip()
         if not text:
             return
         self.chat_input.clear()
         self._append_chat("You", text)
 
-        try:
-            reply = self.engine.send_user(text)
-        except Exception as e:
-            self._append_chat("Engineer", f"ERROR: {e}")
+        engine = self.engine
+        if self.cfg.fanout_models:
+            models = [self.cfg.ollama_model, *self.cfg.fanout_models]
+            self._start_engine_task(
+                lambda on_token, _scope: fan_out(engine, text, models, poll=lambda: on_token("")),
+                self._on_fanout_done,
+                f"Racing {len(set(models))} models",
+            )
+            return
+
+        # Streamed on the worker; fragments render as they arrive.
+        self._live = _LiveReply(self.chat_log)
+        self._start_engine_task(
+            lambda on_token, scope: engine_cancel.send_user(engine, text, scope, on_token=on_token),
+            self._on_chat_done,
+            "Engineer is thinking",
+        )
+
+    def _on_chat_done(self, task_id: int, result: object) -> None:
+        if not self._end_engine_task(task_id):
+            return
+        self._show_reply(result if isinstance(result, str) else "")
+
+    def _on_fanout_done(self, task_id: int, result: object) -> None:
+        if not self._end_engine_task(task_id) or not isinstance(result, FanoutResult):
+            return
+        others = ", ".join(
+            f"{a.model} {'cancelled' if a.cancelled else a.error or 'ok'} {a.seconds:.1f}s"
+            for a in result.attempts
+            if a.model != result.model
+        )
+        if not result.ok:
+            self._append_chat("Engineer", f"ERROR: no model returned a valid payload ({others})")
             return
+        summary = f"Fan-out winner: {result.model} in {result.seconds:.1f}s"
+        self._append_chat("System", f"{summary} ({others})" if others else summary)
+        self._status(summary)
+        self._show_reply(result.reply or "")
 
+    def _show_reply(self, reply: str) -> None:
         payload = parse_engineer_payload(reply or "")
         if payload and payload.final_message:
             self._append_chat("Engineer", payload.final_message)
@@ -896,6 +1137,81 @@ class MainWindow(QMainWindow):
         else:
             self._append_chat("Engineer", (reply or "").strip() or "(no response)")
 
+    # ---------- engine worker ----------
+
+    def _start_engine_task(
+        self,
+        fn: _EngineFn,
+        on_done: Callable[[int, object], None],
+        label: str,
+    ) -> None:
+        if self._task is not None:
+            self._status("Engineer is busy (press Stop first).")
+            return
+        self._task_seq += 1
+        task = _EngineTask(self._task_seq, fn)
+        task.signals.progress.connect(self._on_engine_progress)
+        task.signals.finished.connect(on_done)
+        task.signals.error.connect(self._on_engine_error)
+        task.signals.cancelled.connect(self._on_engine_cancelled)
+        self._task = task
+        self._set_busy(label)
+        self._pool.start(task)
+
+    def _end_engine_task(self, task_id: int) -> bool:
+        """Clear in-flight state; False if the signal is from a task we no longer track."""
+        if self._task is None or self._task.task_id != task_id:
+            return False
+        self._task = None
+        if self._live is not None:
+            self._live.discard()
+            self._live = None
+        self._set_busy(None)
+        return True
+
+    def _on_engine_progress(self, task_id: int, delta: str) -> None:
+        if self._task is None or self._task.task_id != task_id or self._live is None:
+            return
+        if self._busy_text == "Engineer is thinking":
+            self._busy_text = "Engineer is replying"
+        self._live.feed(delta)
+
+    def _on_engine_error(self, task_id: int, message: str) -> None:
+        if self._end_engine_task(task_id):
+            self._append_chat("Engineer", f"ERROR: {message}")
+
+    def _on_engine_cancelled(self, task_id: int) -> None:
+        if self._end_engine_task(task_id):
+            self._append_chat("System", "Stopped.")
+
+    def _engine_stop(self) -> None:
+        if self._task is None:
+            return
+        # Aborts the in-flight request (fan-out: at its next poll).
+        self._task.cancel()
+        self.chat_stop.setEnabled(False)
+        self._busy_text = "Stopping"
+        self._refresh_busy()
+
+    def _set_busy(self, label: Optional[str]) -> None:
+        busy = label is not None
+        self.chat_send.setEnabled(not busy)
+        self.chat_stop.setEnabled(busy)
+        self.act_health.setEnabled(not busy)
+        self.busy_label.setVisible(busy)
+        self.busy_bar.setVisible(busy)
+        if busy:
+            self._busy_text = label or ""
+            self._busy_clock.start()
+            self._busy_timer.start()
+            self._refresh_busy()
+        else:
+            self._busy_timer.stop()
+
+    def _refresh_busy(self) -> None:
+        secs = self._busy_clock.elapsed() // 1000 if self._busy_clock.isValid() else 0
+        self.busy_label.setText(f"{self._busy_text}... {secs}s")
+
     def _latest_engineer_raw(self) -> str:
         for who, msg in reversed(self._chat):
             if who == "EngineerRaw":
@@ -1024,6 +1340,13 @@ class MainWindow(QMainWindow):
             else:
                 event.ignore()
                 return
+        if self._task is not None:
+            self._task.cancel()
+        # Drop pooled keep-alive connections to the model server (this also
+        # unblocks a worker still waiting on it).
+        close_shared_client()
+        self._pool.waitForDone(3000)
+        self._bg_pool.waitForDone(1000)
         event.accept()
 
 
@@ -1031,6 +1354,8 @@ def main() -> int:
     app = QApplication(sys.argv)
     w = MainWindow()
     w.show()
+    # Compile contract validators off the UI thread before the first validation.
+    start_warmup()
     return app.exec()
 
 
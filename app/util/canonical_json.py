@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-import hashlib
 import json
 from typing import Any, Dict
 
+from app.validation.canonical import PRETTY_LF, json_sha256_hex
+
 
 def canonical_dumps(obj: Any) -> str:
     """
@@ -18,9 +19,8 @@ def canonical_dumps(obj: Any) -> str:
 
 def canonical_sha256_for_payload(payload: Dict[str, Any]) -> str:
     """
-    Canonical SHA256 over payload-without-sha.
+    Canonical SHA256 over payload-without-sha (bytes of canonical_dumps, streamed).
     """
     p = dict(payload)
     p.pop("payload_sha256", None)
-    b = canonical_dumps(p).encode("utf-8")
-    return hashlib.sha256(b).hexdigest()
+    return json_sha256_hex(p, PRETTY_LF)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import copy
 import hashlib
 import json
-from typing import Any, Dict
+from dataclasses import dataclass, field
+from json.encoder import encode_basestring
+from typing import Any, Dict, Iterator, List, Optional
 
 
 def canonical_json(obj: Any) -> str:
@@ -17,6 +20,180 @@ def canonical_json(obj: Any) -> str:
     return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"), indent=None)
 
 
+@dataclass(frozen=True)
+class JsonVariant:
+    """One accepted byte-level JSON serialization (always sort_keys, ensure_ascii=False).
+
+    indent:   None for compact separators (",", ":"), else spaces per level
+    newline:  line terminator used for indentation and the trailing newline
+    trailing: append newline after the document
+    """
+
+    name: str
+    indent: Optional[int]
+    newline: str
+    trailing: bool
+
+
+# Named serializations. COMPACT is canonical_json() (payload_sha256 as written by
+# the planner); the others are accepted by the schema_validation SHA policy.
+COMPACT = JsonVariant("compact", indent=None, newline="\n", trailing=False)
+CANONICAL = JsonVariant("canonical", indent=None, newline="\n", trailing=True)
+PRETTY_LF = JsonVariant("pretty_lf", indent=2, newline="\n", trailing=True)
+PRETTY_CRLF = JsonVariant("pretty_crlf", indent=2, newline="\r\n", trailing=True)
+
+JSON_VARIANTS: Dict[str, JsonVariant] = {
+    v.name: v for v in (CANONICAL, COMPACT, PRETTY_LF, PRETTY_CRLF)
+}
+
+# Strings longer than this are escaped slice by slice (JSON escaping is per code point).
+_STR_SLICE = 16 * 1024
+# Encoded bytes handed to the sink per update() call.
+_CHUNK_BYTES = 64 * 1024
+# Subtrees estimated below this many characters go through the C encoder in one
+# shot (walking small documents node by node in Python is ~3x slower).
+_ONE_SHOT_CHARS = 32 * 1024
+
+
+def _fits(obj: Any, budget: int) -> bool:
+    """Cheap upper-bound-ish size estimate; stops as soon as budget is exhausted."""
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if isinstance(o, str):
+            budget -= len(o) + 2
+        elif isinstance(o, dict):
+            budget -= 2
+            for k, v in o.items():
+                budget -= len(k) + 4 if isinstance(k, str) else 8
+                stack.append(v)
+        elif isinstance(o, (list, tuple)):
+            budget -= 2 + len(o)
+            stack.extend(o)
+        else:
+            budget -= 8
+        if budget < 0:
+            return False
+    return True
+
+
+def _key_text(k: Any) -> str:
+    # Same key coercion as json.dumps.
+    if isinstance(k, str):
+        return k
+    if k is True:
+        return "true"
+    if k is False:
+        return "false"
+    if k is None:
+        return "null"
+    if isinstance(k, (int, float)):
+        return json.dumps(k)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(k).__name__}")
+
+
+def _iter_str(s: str) -> Iterator[str]:
+    if len(s) <= _STR_SLICE:
+        yield encode_basestring(s)
+        return
+    yield '"'
+    for i in range(0, len(s), _STR_SLICE):
+        yield encode_basestring(s[i : i + _STR_SLICE])[1:-1]
+    yield '"'
+
+
+def _one_shot(obj: Any, variant: JsonVariant, level: int = 0) -> str:
+    """json.dumps of obj for `variant` (no trailing newline), indented as if at `level`."""
+    if variant.indent is None:
+        return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    txt = json.dumps(obj, ensure_ascii=False, sort_keys=True, indent=variant.indent)
+    # Raw newlines only occur as indentation (string contents are escaped).
+    pad = variant.newline + " " * (variant.indent * level)
+    return txt.replace("\n", pad) if pad != "\n" else txt
+
+
+def iter_json_text(obj: Any, variant: JsonVariant = COMPACT) -> Iterator[str]:
+    """
+    Stream the text of json.dumps(obj, sort_keys=True, ensure_ascii=False, ...) for
+    `variant` in small pieces; "".join(...) equals the one-shot serialization.
+    """
+    pretty = variant.indent is not None
+    key_sep = ": " if pretty else ":"
+    nl = variant.newline
+
+    def walk(o: Any, level: int) -> Iterator[str]:
+        if isinstance(o, (dict, list, tuple)) and _fits(o, _ONE_SHOT_CHARS):
+            yield _one_shot(o, variant, level)
+        elif isinstance(o, str):
+            yield from _iter_str(o)
+        elif o is None or isinstance(o, (bool, int, float)):
+            yield json.dumps(o)
+        elif isinstance(o, dict):
+            if not o:
+                yield "{}"
+                return
+            inner = nl + " " * (variant.indent * (level + 1)) if pretty else ""
+            yield "{"
+            for i, (k, v) in enumerate(sorted(o.items())):
+                if i:
+                    yield ","
+                yield inner
+                yield from _iter_str(_key_text(k))
+                yield key_sep
+                yield from walk(v, level + 1)
+            yield (nl + " " * (variant.indent * level) if pretty else "") + "}"
+        elif isinstance(o, (list, tuple)):
+            if not o:
+                yield "[]"
+                return
+            inner = nl + " " * (variant.indent * (level + 1)) if pretty else ""
+            yield "["
+            for i, v in enumerate(o):
+                if i:
+                    yield ","
+                yield inner
+                yield from walk(v, level + 1)
+            yield (nl + " " * (variant.indent * level) if pretty else "") + "]"
+        else:
+            raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+    yield from walk(obj, 0)
+    if variant.trailing:
+        yield nl
+
+
+def iter_json_bytes(
+    obj: Any, variant: JsonVariant = COMPACT, chunk_bytes: int = _CHUNK_BYTES
+) -> Iterator[bytes]:
+    """UTF-8 encoding of iter_json_text(obj, variant), coalesced into ~chunk_bytes blocks."""
+    buf: List[str] = []
+    size = 0
+    for piece in iter_json_text(obj, variant):
+        buf.append(piece)
+        size += len(piece)
+        if size >= chunk_bytes:
+            yield "".join(buf).encode("utf-8")
+            buf.clear()
+            size = 0
+    if buf:
+        yield "".join(buf).encode("utf-8")
+
+
+def sha256_json(obj: Any, variant: JsonVariant = COMPACT) -> "hashlib._Hash":
+    """sha256 object fed with the streamed `variant` serialization of obj (bounded memory)."""
+    if _fits(obj, _ONE_SHOT_CHARS):
+        text = _one_shot(obj, variant) + (variant.newline if variant.trailing else "")
+        return hashlib.sha256(text.encode("utf-8"))
+    h = hashlib.sha256()
+    for block in iter_json_bytes(obj, variant):
+        h.update(block)
+    return h
+
+
+def json_sha256_hex(obj: Any, variant: JsonVariant = COMPACT) -> str:
+    return sha256_json(obj, variant).hexdigest()
+
+
 def sha256_hex(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
@@ -25,7 +202,7 @@ def compute_payload_sha256(payload_no_sha: Dict[str, Any]) -> str:
     """Compute payload_sha256 over the payload WITHOUT payload_sha256 field."""
     if "payload_sha256" in payload_no_sha:
         raise ValueError("compute_payload_sha256 expects payload without 'payload_sha256'")
-    return sha256_hex(canonical_json(payload_no_sha))
+    return json_sha256_hex(payload_no_sha, COMPACT)
 
 
 def verify_payload_sha256(payload_with_sha: Dict[str, Any]) -> bool:
@@ -39,3 +216,46 @@ def verify_payload_sha256(payload_with_sha: Dict[str, Any]) -> bool:
     p.pop("payload_sha256", None)
     want = compute_payload_sha256(p)
     return got == want
+
+
+@dataclass(frozen=True)
+class HashedPayload:
+    """Payload (WITHOUT payload_sha256) with its payload_sha256 digest, computed once.
+
+    sha256 is the COMPACT digest (canonical_json(), no trailing newline), i.e.
+    compute_payload_sha256(body). Carry this through validation and persistence
+    instead of re-serializing:
+      - with_sha() gives the final payload (payload_sha256 = sha256)
+      - validate_payload(payload, hashed=...) skips SHA recomputation
+
+    Build it with from_payload(): only those instances are trusted by describes()
+    (a hand-built or replace()d one never is, so validation re-hashes). body is
+    one deep copy taken when hashing; with_sha() returns a new top-level dict
+    that shares nested values with body, so treat that payload as read-only.
+    """
+
+    body: Dict[str, Any]
+    sha256: str
+    _trusted: bool = field(default=False, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_payload(cls, payload_no_sha: Dict[str, Any]) -> "HashedPayload":
+        if "payload_sha256" in payload_no_sha:
+            raise ValueError("HashedPayload expects payload without 'payload_sha256'")
+        body = copy.deepcopy(payload_no_sha)
+        h = cls(body=body, sha256=json_sha256_hex(body, COMPACT))
+        object.__setattr__(h, "_trusted", True)
+        return h
+
+    def with_sha(self) -> Dict[str, Any]:
+        out = dict(self.body)
+        out["payload_sha256"] = self.sha256
+        return out
+
+    def describes(self, payload_with_sha: Dict[str, Any]) -> bool:
+        """True if payload_with_sha is exactly body + this digest (no re-hashing)."""
+        if not self._trusted or payload_with_sha.get("payload_sha256") != self.sha256:
+            return False
+        if len(payload_with_sha) != len(self.body) + 1:
+            return False
+        return all(k in payload_with_sha and payload_with_sha[k] == v for k, v in self.body.items())
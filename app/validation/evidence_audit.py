@@ -0,0 +1,300 @@
+"""
+Evidence log integrity audit (streaming)
+
+Sweeps evidence.jsonl (and any rotated segments passed explicitly) for
+RUN_HANDOFF records and checks each embedded payload against the vendor schema
+and the payload_sha256 policy, exactly as validate_payload does.
+
+- Constant memory: files are split into byte ranges aligned to line starts; each
+  range is read line by line and only lines whose raw bytes carry the
+  RUN_HANDOFF kind marker are decoded at all.
+- Multi-core: ranges are fanned out over a process pool (--workers 1 runs
+  in-process); each worker compiles a contract's validator once.
+- Compact report: counts plus at most --max-failures failure entries
+  (ev_id, file, byte offset, error, issues); the rest are only counted.
+
+Read-only. Never calls GuiStore.read_evidence().
+
+Exit code: 0 clean, 1 invalid/undecodable handoffs found, 2 wiring error.
+
+CLI:
+  python -m app.validation.evidence_audit [--root <store root>] [--path <segment> ...]
+                                          [--workers N] [--chunk-mb 8]
+                                          [--max-errors 1] [--max-failures 100]
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__":
+    # python -m app.validation.evidence_audit: make src/ (swe_bootstrap) importable, then apply it.
+    import sys as _sys
+    from pathlib import Path as _Path
+
+    _SRC = _Path(__file__).resolve().parents[2] / "src"
+    if str(_SRC) not in _sys.path:
+        _sys.path.insert(0, str(_SRC))
+    import swe_bootstrap as _swe_bootstrap
+
+    _swe_bootstrap.apply()
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.validation.schema_validation import SchemaValidationError, validate_many
+
+HANDOFF_KIND = "RUN_HANDOFF"
+# Store lines are json.dumps(..., sort_keys=True) with default separators.
+_KIND_MARKER = f'"kind": "{HANDOFF_KIND}"'.encode("utf-8")
+_BATCH = 256
+
+# (path, start offset, end offset)
+Chunk = Tuple[str, int, int]
+
+
+@dataclass(frozen=True)
+class AuditFailure:
+    ev_id: Optional[str]
+    file: str
+    offset: int
+    error: str
+    issues: List[Dict[str, str]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class AuditReport:
+    files: List[str]
+    bytes: int
+    lines: int
+    handoffs: int
+    valid: int
+    invalid: int
+    undecodable: int
+    failures: List[AuditFailure]
+    failures_dropped: int
+    seconds: float
+
+    @property
+    def ok(self) -> bool:
+        return self.invalid == 0 and self.undecodable == 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d["ok"] = self.ok
+        return d
+
+
+def plan_chunks(path: Path, chunk_bytes: int) -> List[Chunk]:
+    """Split a file into ~chunk_bytes ranges whose boundaries fall on line starts."""
+    size = path.stat().st_size if path.exists() else 0
+    if size == 0:
+        return []
+    step = max(1, int(chunk_bytes))
+    starts = [0]
+    with path.open("rb") as f:
+        pos = step
+        while pos < size:
+            f.seek(pos)
+            f.readline()  # finish the line straddling the cut
+            pos = f.tell()
+            if pos >= size:
+                break
+            starts.append(pos)
+            pos += step
+    ends = starts[1:] + [size]
+    return [(str(path), a, b) for a, b in zip(starts, ends)]
+
+
+def _iter_handoff_lines(
+    path: str, start: int, end: int, stats: Dict[str, int]
+) -> Iterator[Tuple[int, bytes]]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        pos = start
+        while pos < end:
+            raw = f.readline()
+            if not raw:
+                break
+            offset, pos = pos, pos + len(raw)
+            if not raw.strip():
+                continue
+            stats["lines"] += 1
+            if _KIND_MARKER in raw:
+                yield offset, raw
+
+
+def audit_chunk(
+    chunk: Chunk, max_errors: Optional[int] = 1, max_failures: int = 100
+) -> Dict[str, Any]:
+    """Audit one byte range (runs inside a worker process). Returns plain, picklable counts."""
+    path, start, end = chunk
+    stats = {
+        "lines": 0,
+        "handoffs": 0,
+        "valid": 0,
+        "invalid": 0,
+        "undecodable": 0,
+        "failures_dropped": 0,
+    }
+    failures: List[Dict[str, Any]] = []
+
+    def fail(
+        ev_id: Optional[str], offset: int, error: str, issues: Sequence[Dict[str, str]] = ()
+    ) -> None:
+        if len(failures) < max_failures:
+            failures.append(
+                {
+                    "ev_id": ev_id,
+                    "file": path,
+                    "offset": offset,
+                    "error": error,
+                    "issues": list(issues),
+                }
+            )
+        else:
+            stats["failures_dropped"] += 1
+
+    batch: List[Tuple[Optional[str], int, Any]] = []
+
+    def flush() -> None:
+        results = validate_many([p for _, _, p in batch], max_errors=max_errors)
+        for (ev_id, offset, _), r in zip(batch, results):
+            if r.ok:
+                stats["valid"] += 1
+            else:
+                stats["invalid"] += 1
+                fail(ev_id, offset, r.error or "invalid", [i.to_dict() for i in r.issues])
+        batch.clear()
+
+    for offset, raw in _iter_handoff_lines(path, start, end, stats):
+        try:
+            rec = json.loads(raw)
+        except ValueError as e:
+            stats["undecodable"] += 1
+            fail(None, offset, f"undecodable record: {e}")
+            continue
+        if not isinstance(rec, dict) or rec.get("kind") != HANDOFF_KIND:
+            continue  # marker matched text elsewhere in the line
+        stats["handoffs"] += 1
+        ev_id = rec.get("ev_id") if isinstance(rec.get("ev_id"), str) else None
+        try:
+            payload = json.loads(rec.get("body") or "")
+        except (TypeError, ValueError) as e:
+            stats["undecodable"] += 1
+            fail(ev_id, offset, f"undecodable body: {e}")
+            continue
+        batch.append((ev_id, offset, payload))
+        if len(batch) >= _BATCH:
+            flush()
+    if batch:
+        flush()
+
+    return {**stats, "failures": failures}
+
+
+def audit_evidence(
+    paths: Sequence[Path],
+    *,
+    workers: int = 1,
+    chunk_bytes: int = 8 * 1024 * 1024,
+    max_errors: Optional[int] = 1,
+    max_failures: int = 100,
+) -> AuditReport:
+    """Audit RUN_HANDOFF records in the given evidence files (segments in order)."""
+    t0 = time.perf_counter()
+    files = [Path(p) for p in paths]
+    chunks: List[Chunk] = []
+    for p in files:
+        chunks.extend(plan_chunks(p, chunk_bytes))
+
+    def results() -> Iterator[Dict[str, Any]]:
+        if workers <= 1 or len(chunks) <= 1:
+            for c in chunks:
+                yield audit_chunk(c, max_errors, max_failures)
+            return
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            n = len(chunks)
+            yield from pool.map(audit_chunk, chunks, [max_errors] * n, [max_failures] * n)
+
+    totals = {
+        "lines": 0,
+        "handoffs": 0,
+        "valid": 0,
+        "invalid": 0,
+        "undecodable": 0,
+        "failures_dropped": 0,
+    }
+    failures: List[AuditFailure] = []
+    for r in results():
+        for k in totals:
+            totals[k] += r[k]
+        for f in r["failures"]:
+            if len(failures) < max_failures:
+                failures.append(AuditFailure(**f))
+            else:
+                totals["failures_dropped"] += 1
+
+    return AuditReport(
+        files=[str(p) for p in files],
+        bytes=sum(p.stat().st_size for p in files if p.exists()),
+        lines=totals["lines"],
+        handoffs=totals["handoffs"],
+        valid=totals["valid"],
+        invalid=totals["invalid"],
+        undecodable=totals["undecodable"],
+        failures=failures,
+        failures_dropped=totals["failures_dropped"],
+        seconds=round(time.perf_counter() - t0, 3),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.validation.evidence_audit")
+    ap.add_argument("--root", default=None, help="store root (default: repo root)")
+    ap.add_argument(
+        "--path",
+        action="append",
+        default=None,
+        help="evidence segment (repeatable; overrides --root)",
+    )
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--chunk-mb", type=float, default=8.0)
+    ap.add_argument(
+        "--max-errors", type=int, default=1, help="issues collected per handoff (0 = all)"
+    )
+    ap.add_argument(
+        "--max-failures", type=int, default=100, help="failure entries kept in the report"
+    )
+    args = ap.parse_args(argv)
+
+    if args.path:
+        paths = [Path(p) for p in args.path]
+    else:
+        from app.gui.store import GuiStore
+
+        store = GuiStore(base_dir=Path(args.root)) if args.root else GuiStore()
+        paths = [store.evidence_path]
+
+    try:
+        report = audit_evidence(
+            paths,
+            workers=args.workers,
+            chunk_bytes=max(1, int(args.chunk_mb * 1024 * 1024)),
+            max_errors=None if args.max_errors <= 0 else args.max_errors,
+            max_failures=max(0, args.max_failures),
+        )
+    except SchemaValidationError as e:
+        print(json.dumps({"error": str(e)}), file=sys.stderr)
+        return 2
+    print(json.dumps(report.to_dict(), sort_keys=True, ensure_ascii=False))
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
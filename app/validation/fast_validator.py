@@ -0,0 +1,399 @@
+"""
+Generated fast validators (schema subset -> plain Python)
+
+Small, flat vendor schemas (required keys, typed properties, string arrays, const,
+pattern, additionalProperties) are compiled into a Python module whose
+validate(instance) -> bool is nothing but dict/list/isinstance checks:
+
+  <build dir>/<title-slug>_<schema sha16>.py
+
+The module is generated once per schema content and reused by later processes.
+Default location: <repo>/build/fast_validators/ (override: SWE_FAST_VALIDATOR_DIR).
+
+Supported keywords: type, required, properties, additionalProperties (bool or
+schema), items (single schema), const/enum (strings, bools, null), pattern,
+minLength/maxLength, minItems/maxItems. Annotations ($schema, $id, title,
+description, $comment, format) are ignored, as by the reference validator (no
+format checker). A schema using anything else is not generated (None) and the
+caller keeps plain jsonschema.
+
+jsonschema stays the reference: FastValidator only short-circuits the accept path;
+on reject it re-runs jsonschema, which raises the authoritative error.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+FAST_VALIDATOR_DIR_ENV = "SWE_FAST_VALIDATOR_DIR"
+FAST_VALIDATORS_ENV = "SWE_FAST_VALIDATORS"  # "0" disables generation
+
+# Bump when the emitted code changes; part of the module file name via the digest.
+GENERATOR_VERSION = 1
+
+_ANNOTATIONS = frozenset(
+    {"$schema", "$id", "title", "description", "$comment", "format", "examples", "default"}
+)
+_HANDLED = frozenset(
+    {
+        "type",
+        "required",
+        "properties",
+        "additionalProperties",
+        "items",
+        "const",
+        "enum",
+        "pattern",
+        "minLength",
+        "maxLength",
+        "minItems",
+        "maxItems",
+    }
+)
+_OLD_DRAFTS = ("draft-03", "draft-04")
+
+_TYPE_CHECKS: Dict[str, str] = {
+    "string": "isinstance({v}, str)",
+    "array": "isinstance({v}, list)",
+    "object": "isinstance({v}, dict)",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    # draft 6+: a float with zero fractional part is an integer
+    "integer": "((isinstance({v}, int) and not isinstance({v}, bool))"
+    " or (isinstance({v}, float) and {v}.is_integer()))",
+}
+
+_MODULES: Dict[str, Callable[[Any], bool]] = {}
+_MODULES_LOCK = threading.Lock()
+
+_log = logging.getLogger(__name__)
+
+
+class UnsupportedSchema(Exception):
+    pass
+
+
+def _repo_root() -> Path:
+    # fast_validator.py lives at: app/validation/fast_validator.py
+    return Path(__file__).resolve().parents[2]
+
+
+def default_build_dir() -> Path:
+    env = os.environ.get(FAST_VALIDATOR_DIR_ENV, "").strip()
+    if env:
+        return Path(env).resolve()
+    return _repo_root() / "build" / "fast_validators"
+
+
+def fast_validators_enabled() -> bool:
+    return os.environ.get(FAST_VALIDATORS_ENV, "").strip().lower() not in (
+        "0",
+        "off",
+        "false",
+        "no",
+    )
+
+
+def schema_digest(schema: Any) -> str:
+    text = json.dumps(schema, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{GENERATOR_VERSION}\n{text}".encode("utf-8")).hexdigest()
+
+
+def _literal_ok(value: Any) -> bool:
+    # Literals whose Python == agrees with JSON Schema equality.
+    return value is None or isinstance(value, (str, bool))
+
+
+class _Emitter:
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.consts: List[str] = []
+        self._n = 0
+
+    def var(self, prefix: str) -> str:
+        self._n += 1
+        return f"{prefix}{self._n}"
+
+    def emit(self, depth: int, text: str) -> None:
+        self.lines.append("    " * depth + text)
+
+    def block(self, depth: int, headers: List[str], body: Callable[[int], None]) -> None:
+        """
+        Emit nested headers ("if ...:", "for ...:") and body(depth inside them);
+        drop the headers again when body emitted nothing (annotation-only subschema).
+        """
+        mark = len(self.lines)
+        for i, h in enumerate(headers):
+            self.emit(depth + i, h)
+        start = len(self.lines)
+        body(depth + len(headers))
+        if len(self.lines) == start:
+            del self.lines[mark:]
+
+    def schema(self, s: Any, v: str, depth: int) -> None:
+        if s is True or s == {}:
+            return
+        if s is False:
+            self.emit(depth, "return False")
+            return
+        if not isinstance(s, dict):
+            raise UnsupportedSchema(f"schema must be an object or boolean, not {type(s).__name__}")
+        unknown = set(s) - _HANDLED - _ANNOTATIONS
+        if unknown:
+            raise UnsupportedSchema(f"unsupported keywords: {sorted(unknown)}")
+
+        self._type(s, v, depth)
+        self._literals(s, v, depth)
+        self._string(s, v, depth)
+        self._array(s, v, depth)
+        self._object(s, v, depth)
+
+    def _type(self, s: Dict[str, Any], v: str, depth: int) -> None:
+        if "type" not in s:
+            return
+        types = s["type"] if isinstance(s["type"], list) else [s["type"]]
+        if not types or any(t not in _TYPE_CHECKS for t in types):
+            raise UnsupportedSchema(f"unsupported type: {s['type']!r}")
+        cond = " or ".join(_TYPE_CHECKS[t].format(v=v) for t in types)
+        self.emit(depth, f"if not ({cond}):")
+        self.emit(depth + 1, "return False")
+
+    def _literals(self, s: Dict[str, Any], v: str, depth: int) -> None:
+        if "const" in s:
+            c = s["const"]
+            if not _literal_ok(c):
+                raise UnsupportedSchema("const must be a string, boolean or null")
+            cond = (
+                f"isinstance({v}, str) and {v} == {c!r}" if isinstance(c, str) else f"{v} is {c!r}"
+            )
+            self.emit(depth, f"if not ({cond}):")
+            self.emit(depth + 1, "return False")
+        if "enum" in s:
+            vals = s["enum"]
+            if not isinstance(vals, list) or not all(_literal_ok(x) for x in vals):
+                raise UnsupportedSchema("enum must list strings, booleans or null")
+            strs = [x for x in vals if isinstance(x, str)]
+            others = [x for x in vals if not isinstance(x, str)]
+            parts = (
+                [f"(isinstance({v}, str) and {v} in {tuple(sorted(set(strs)))!r})"] if strs else []
+            )
+            parts += [f"{v} is {x!r}" for x in others]
+            self.emit(depth, f"if not ({' or '.join(parts) or 'False'}):")
+            self.emit(depth + 1, "return False")
+
+    def _string(self, s: Dict[str, Any], v: str, depth: int) -> None:
+        checks: List[str] = []
+        if "pattern" in s:
+            if not isinstance(s["pattern"], str):
+                raise UnsupportedSchema("pattern must be a string")
+            name = f"_RE{len(self.consts)}"
+            self.consts.append(f"{name} = re.compile({s['pattern']!r})")
+            checks.append(f"{name}.search({v}) is None")
+        for kw, op in (("minLength", "<"), ("maxLength", ">")):
+            if kw in s:
+                if not isinstance(s[kw], int) or isinstance(s[kw], bool):
+                    raise UnsupportedSchema(f"{kw} must be an integer")
+                checks.append(f"len({v}) {op} {s[kw]}")
+        if checks:
+            self.emit(depth, f"if isinstance({v}, str) and ({' or '.join(checks)}):")
+            self.emit(depth + 1, "return False")
+
+    def _array(self, s: Dict[str, Any], v: str, depth: int) -> None:
+        checks: List[str] = []
+        for kw, op in (("minItems", "<"), ("maxItems", ">")):
+            if kw in s:
+                if not isinstance(s[kw], int) or isinstance(s[kw], bool):
+                    raise UnsupportedSchema(f"{kw} must be an integer")
+                checks.append(f"len({v}) {op} {s[kw]}")
+        if checks:
+            self.emit(depth, f"if isinstance({v}, list) and ({' or '.join(checks)}):")
+            self.emit(depth + 1, "return False")
+        if "items" in s and s["items"] is not True and s["items"] != {}:
+            if isinstance(s["items"], list):
+                raise UnsupportedSchema("tuple-form items")
+            item = self.var("item")
+            self.block(
+                depth,
+                [f"if isinstance({v}, list):", f"for {item} in {v}:"],
+                lambda d: self.schema(s["items"], item, d),
+            )
+
+    def _object(self, s: Dict[str, Any], v: str, depth: int) -> None:
+        keys = ("required", "properties", "additionalProperties")
+        if not any(k in s for k in keys):
+            return
+        props = s.get("properties", {})
+        if not isinstance(props, dict):
+            raise UnsupportedSchema("properties must be an object")
+        req = s.get("required", [])
+        if not isinstance(req, list) or not all(isinstance(k, str) for k in req):
+            raise UnsupportedSchema("required must list strings")
+
+        self.block(
+            depth, [f"if isinstance({v}, dict):"], lambda d: self._object_body(s, props, req, v, d)
+        )
+
+    def _object_body(
+        self, s: Dict[str, Any], props: Dict[str, Any], req: List[str], v: str, d: int
+    ) -> None:
+        if req:
+            name = f"_REQ{len(self.consts)}"
+            self.consts.append(f"{name} = {tuple(req)!r}")
+            self.emit(d, f"for _k in {name}:")
+            self.emit(d + 1, f"if _k not in {v}:")
+            self.emit(d + 2, "return False")
+
+        extra = s.get("additionalProperties", True)
+        if extra is not True and extra != {}:
+            allowed = f"_PROPS{len(self.consts)}"
+            self.consts.append(f"{allowed} = frozenset({tuple(sorted(props))!r})")
+            key, val = self.var("key"), self.var("val")
+            self.block(
+                d,
+                [f"for {key}, {val} in {v}.items():", f"if {key} not in {allowed}:"],
+                lambda dd: self.schema(extra, val, dd),
+            )
+
+        for pname, psub in props.items():
+            if psub is True or psub == {}:
+                continue
+            pv = self.var("p")
+            mark = len(self.lines)
+            self.emit(d, f"{pv} = {v}.get({pname!r}, _MISSING)")
+            self.block(d, [f"if {pv} is not _MISSING:"], lambda dd: self.schema(psub, pv, dd))
+            if len(self.lines) == mark + 1:
+                del self.lines[mark:]
+
+
+def generate_source(schema: Any) -> str:
+    """
+    Python source of a module exposing validate(instance) -> bool for schema.
+    Raises UnsupportedSchema if the schema leaves the supported subset.
+    """
+    if isinstance(schema, dict):
+        declared = str(schema.get("$schema", ""))
+        if any(d in declared for d in _OLD_DRAFTS):
+            raise UnsupportedSchema(f"unsupported dialect: {declared}")
+    em = _Emitter()
+    em.schema(schema, "instance", 1)
+    em.emit(1, "return True")
+
+    title = schema.get("title") if isinstance(schema, dict) else None
+    header = [
+        "# Generated by app.validation.fast_validator -- do not edit.",
+        f"# generator: {GENERATOR_VERSION}",
+        f"# schema: {title!r} sha256={schema_digest(schema)}",
+        "import re",
+        "",
+        "_MISSING = object()",
+        *em.consts,
+        "",
+        "",
+        "def validate(instance):",
+    ]
+    return "\n".join(header + em.lines) + "\n"
+
+
+def _slug(schema: Any) -> str:
+    title = schema.get("title") if isinstance(schema, dict) else None
+    raw = str(title or "schema").lower()
+    return "".join(c if c.isalnum() else "_" for c in raw).strip("_")[:40] or "schema"
+
+
+def _load_module(path: Path, name: str) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot load generated validator: {path}")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def load_fast_validator(
+    schema: Any, build_dir: Optional[Path] = None
+) -> Optional[Callable[[Any], bool]]:
+    """
+    validate(instance) -> bool for schema, generated (or reused) under build_dir.
+    None when the schema is outside the supported subset, generation is disabled,
+    or the generated module fails to build (logged; the caller keeps jsonschema).
+    """
+    if not fast_validators_enabled():
+        return None
+    digest = schema_digest(schema)
+    with _MODULES_LOCK:
+        hit = _MODULES.get(digest)
+    if hit is not None:
+        return hit
+
+    name = f"{_slug(schema)}_{digest[:16]}"
+    try:
+        src = generate_source(schema)
+        fn = _build(src, name, Path(build_dir or default_build_dir()) / f"{name}.py")
+    except UnsupportedSchema:
+        return None
+    except Exception as e:
+        # jsonschema is the reference; a generator bug must not fail validation.
+        _log.warning("fast validator %s not used, falling back to jsonschema: %s", name, e)
+        return None
+
+    with _MODULES_LOCK:
+        _MODULES[digest] = fn
+    return fn
+
+
+def _build(src: str, name: str, path: Path) -> Callable[[Any], bool]:
+    try:
+        if not path.is_file() or path.read_text(encoding="utf-8") != src:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(src, encoding="utf-8")
+            tmp.replace(path)
+        return _load_module(path, f"_swe_fast_validators.{name}").validate
+    except OSError:
+        # Read-only build dir: run the same source in memory.
+        ns: Dict[str, Any] = {}
+        exec(compile(src, f"<fast validator {name}>", "exec"), ns)
+        return ns["validate"]
+
+
+def clear_fast_validators() -> None:
+    with _MODULES_LOCK:
+        _MODULES.clear()
+
+
+class FastValidator:
+    """
+    jsonschema-compatible wrapper: generated check first, reference validator on reject.
+
+    validate()/iter_errors() report exactly what the reference reports; is_valid()
+    only consults the reference when the fast check rejects. Other attributes delegate.
+    """
+
+    def __init__(self, fast: Callable[[Any], bool], reference: Any) -> None:
+        self.fast = fast
+        self.reference = reference
+
+    def validate(self, instance: Any) -> None:
+        if self.fast(instance):
+            return
+        self.reference.validate(instance)
+
+    def is_valid(self, instance: Any) -> bool:
+        return self.fast(instance) or self.reference.is_valid(instance)
+
+    def iter_errors(self, instance: Any) -> Iterator[Any]:
+        if self.fast(instance):
+            return iter(())
+        return self.reference.iter_errors(instance)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.reference, name)
@@ -0,0 +1,258 @@
+"""
+Schema catalog (contract -> schema path)
+
+A compact manifest of the vendor schema tree so contract resolution does not have
+to open and parse every schema file:
+
+  {
+    "schema_root": "<abs path>",
+    "fingerprint": [<json file count>, <newest mtime_ns>],
+    "entries": [
+      {"path": "run_handoff/1.0.schema.json", "sha256": "...",
+       "title": "...", "id": "..."},
+      ...
+    ]
+  }
+
+It is an index over the same rules as the full scan in vendor_schema_loader:
+entries keep sorted-path order, and a contract resolves to the first file whose
+title == contract or whose $id ends with it. Nothing else (file names, layout)
+resolves a contract.
+
+The catalog is rebuilt automatically when the tree fingerprint changes. Hot
+paths use current_tree_fingerprint(), which re-walks a root at most once per
+SWE_SCHEMA_FINGERPRINT_TTL seconds (default 2; 0 = every call), so a tree edit
+is noticed within that window; clear_fingerprint_cache() forces it now.
+Default location: <repo>/build/schema_catalog/ (override: SWE_SCHEMA_CATALOG_DIR).
+
+CLI:
+  python -m app.validation.schema_catalog [--schema-root DIR] [--out-dir DIR]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+CATALOG_DIR_ENV = "SWE_SCHEMA_CATALOG_DIR"
+FINGERPRINT_TTL_ENV = "SWE_SCHEMA_FINGERPRINT_TTL"
+DEFAULT_FINGERPRINT_TTL = 2.0
+
+_CATALOGS: Dict[str, Dict[str, Any]] = {}
+_CATALOGS_LOCK = threading.Lock()
+
+# resolved root -> (monotonic time taken, fingerprint)
+_FINGERPRINTS: Dict[str, Tuple[float, Tuple[int, int]]] = {}
+_FINGERPRINTS_LOCK = threading.Lock()
+
+
+def _repo_root() -> Path:
+    # schema_catalog.py lives at: app/validation/schema_catalog.py
+    return Path(__file__).resolve().parents[2]
+
+
+def default_catalog_dir() -> Path:
+    env = os.environ.get(CATALOG_DIR_ENV, "").strip()
+    if env:
+        return Path(env).resolve()
+    return _repo_root() / "build" / "schema_catalog"
+
+
+def catalog_path(schema_root: Path, catalog_dir: Optional[Path] = None) -> Path:
+    root = str(Path(schema_root).resolve())
+    tag = hashlib.sha256(root.encode("utf-8")).hexdigest()[:16]
+    return Path(catalog_dir or default_catalog_dir()) / f"catalog-{tag}.json"
+
+
+def schema_tree_fingerprint(schema_root: Path) -> Tuple[int, int]:
+    """
+    (number of *.json files, newest mtime_ns over those files and their directories).
+    stat() only; nothing is read or parsed.
+    """
+    count = 0
+    newest = 0
+    for dirpath, dirnames, filenames in os.walk(schema_root):
+        dirnames[:] = [d for d in dirnames if d != ".git"]
+        try:
+            newest = max(newest, os.stat(dirpath).st_mtime_ns)
+        except OSError:
+            pass
+        for fn in filenames:
+            if not fn.endswith(".json"):
+                continue
+            try:
+                st = os.stat(os.path.join(dirpath, fn))
+            except OSError:
+                continue
+            count += 1
+            newest = max(newest, st.st_mtime_ns)
+    return count, newest
+
+
+def fingerprint_ttl() -> float:
+    raw = os.environ.get(FINGERPRINT_TTL_ENV, "").strip()
+    try:
+        return max(0.0, float(raw)) if raw else DEFAULT_FINGERPRINT_TTL
+    except ValueError:
+        return DEFAULT_FINGERPRINT_TTL
+
+
+def current_tree_fingerprint(schema_root: Path) -> Tuple[int, int]:
+    """schema_tree_fingerprint(), reused for fingerprint_ttl() seconds per root."""
+    key = str(schema_root)
+    now = time.monotonic()
+    ttl = fingerprint_ttl()
+    with _FINGERPRINTS_LOCK:
+        hit = _FINGERPRINTS.get(key)
+    if hit is not None and now - hit[0] < ttl:
+        return hit[1]
+    fp = schema_tree_fingerprint(schema_root)
+    with _FINGERPRINTS_LOCK:
+        _FINGERPRINTS[key] = (now, fp)
+    return fp
+
+
+def clear_fingerprint_cache() -> None:
+    with _FINGERPRINTS_LOCK:
+        _FINGERPRINTS.clear()
+
+
+def build_catalog(schema_root: Path) -> Dict[str, Any]:
+    root = Path(schema_root).resolve()
+    fingerprint = schema_tree_fingerprint(root)
+    entries: List[Dict[str, Any]] = []
+    for fp in sorted(root.rglob("*.json")):
+        if ".git" in fp.relative_to(root).parts:
+            continue
+        try:
+            raw = fp.read_bytes()
+            doc = json.loads(raw.decode("utf-8"))
+        except Exception:
+            continue
+        if not isinstance(doc, dict):
+            continue
+        rel = fp.relative_to(root)
+        title = doc.get("title")
+        _id = doc.get("$id")
+        entries.append(
+            {
+                "path": rel.as_posix(),
+                "sha256": hashlib.sha256(raw).hexdigest(),
+                "title": title if isinstance(title, str) else None,
+                "id": _id.strip() if isinstance(_id, str) and _id.strip() else None,
+            }
+        )
+    return {"schema_root": str(root), "fingerprint": list(fingerprint), "entries": entries}
+
+
+def write_catalog(catalog: Dict[str, Any], path: Path) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+    tmp.write_text(
+        json.dumps(catalog, ensure_ascii=False, sort_keys=True, indent=2) + "\n", encoding="utf-8"
+    )
+    tmp.replace(path)
+
+
+def _read_catalog(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        obj = json.loads(Path(path).read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def load_catalog(schema_root: Path, catalog_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Return a catalog that matches the current tree fingerprint: in-process copy,
+    else the on-disk manifest, else a fresh build (written back best-effort).
+    """
+    root = Path(schema_root).resolve()
+    fp = list(current_tree_fingerprint(root))
+    key = str(root)
+
+    with _CATALOGS_LOCK:
+        cat = _CATALOGS.get(key)
+    if cat is not None and cat.get("fingerprint") == fp:
+        return cat
+
+    path = catalog_path(root, catalog_dir)
+    cat = _read_catalog(path)
+    if cat is None or cat.get("schema_root") != key or cat.get("fingerprint") != fp:
+        cat = build_catalog(root)
+        with _FINGERPRINTS_LOCK:
+            _FINGERPRINTS[key] = (time.monotonic(), tuple(cat["fingerprint"]))
+        try:
+            write_catalog(cat, path)
+        except OSError:
+            pass  # read-only checkout: keep the in-memory catalog
+
+    with _CATALOGS_LOCK:
+        _CATALOGS[key] = cat
+    return cat
+
+
+def clear_catalog_cache() -> None:
+    with _CATALOGS_LOCK:
+        _CATALOGS.clear()
+    clear_fingerprint_cache()
+
+
+def lookup_schema_path(
+    contract: str, schema_root: Path, catalog_dir: Optional[Path] = None
+) -> Optional[Path]:
+    """
+    Resolve a contract id via the catalog. None on miss (caller may fall back to scanning).
+    """
+    contract_norm = str(contract).strip()
+    root = Path(schema_root).resolve()
+    entries = load_catalog(root, catalog_dir).get("entries") or []
+
+    for e in entries:
+        if e.get("title") == contract_norm:
+            return (root / e["path"]).resolve()
+        _id = e.get("id")
+        if isinstance(_id, str) and _id.endswith(contract_norm):
+            return (root / e["path"]).resolve()
+
+    return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.validation.schema_catalog")
+    ap.add_argument(
+        "--schema-root", default=None, help="default: swe_schemas.resolve_schema_root()"
+    )
+    ap.add_argument(
+        "--out-dir", default=None, help=f"default: build/schema_catalog (or ${CATALOG_DIR_ENV})"
+    )
+    args = ap.parse_args(argv)
+
+    if args.schema_root:
+        root = Path(args.schema_root).resolve()
+    else:
+        import swe_schemas
+
+        root = Path(swe_schemas.resolve_schema_root()).resolve()
+    if not root.exists():
+        raise SystemExit(f"schema_root does not exist: {root}")
+
+    out_dir = Path(args.out_dir) if args.out_dir else None
+    cat = build_catalog(root)
+    path = catalog_path(root, out_dir)
+    write_catalog(cat, path)
+    print(
+        json.dumps({"catalog": str(path), "entries": len(cat["entries"]), "schema_root": str(root)})
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
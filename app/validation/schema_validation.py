@@ -1,15 +1,86 @@
 from __future__ import annotations
 
-import hashlib
-import json
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Literal, Optional, Sequence, Tuple, Union
 
 import swe_schemas
 
+from app.core import telemetry
+from app.validation.canonical import (
+    CANONICAL,
+    COMPACT,
+    PRETTY_CRLF,
+    PRETTY_LF,
+    HashedPayload,
+    json_sha256_hex,
+    sha256_json,
+)
+from app.validation.validation_cache import (
+    ValidationCache,
+    Verdict,
+    active_validation_cache,
+    schema_scope,
+)
+
+
+@dataclass(frozen=True)
+class SchemaIssue:
+    """
+    One structured validation failure.
+
+    path:        JSON pointer into the payload ("" = the payload itself)
+    keyword:     failing schema keyword ("type", "required", ...) or "payload_sha256"
+                 for the SHA policy
+    schema_path: JSON pointer into the schema ("" when not schema-driven)
+    """
+
+    message: str
+    path: str = ""
+    keyword: str = ""
+    schema_path: str = ""
+
+    @classmethod
+    def from_jsonschema(cls, err: Any) -> "SchemaIssue":
+        return cls(
+            message=str(getattr(err, "message", err)),
+            path=_pointer(getattr(err, "absolute_path", ())),
+            keyword=str(getattr(err, "validator", "") or ""),
+            schema_path=_pointer(getattr(err, "absolute_schema_path", ())),
+        )
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "SchemaIssue":
+        return cls(
+            **{k: str(d.get(k) or "") for k in ("message", "path", "keyword", "schema_path")}
+        )
+
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            "message": self.message,
+            "path": self.path,
+            "keyword": self.keyword,
+            "schema_path": self.schema_path,
+        }
+
+
+def _pointer(parts: Any) -> str:
+    return "".join("/" + str(p).replace("~", "~0").replace("/", "~1") for p in parts)
+
 
 class SchemaValidationError(Exception):
-    pass
+    """
+    str(e) is the human message; e.issues holds the structured failures (one in
+    fail-fast mode, up to max_errors in collect mode; empty for wiring errors).
+    """
+
+    def __init__(self, message: str = "", issues: Sequence[SchemaIssue] = ()) -> None:
+        super().__init__(message)
+        self.issues: Tuple[SchemaIssue, ...] = tuple(issues)
+
+
+def _is_jsonschema_error(e: BaseException) -> bool:
+    return hasattr(e, "absolute_path") and hasattr(e, "validator")
 
 
 def resolve_schema_root(schema_root: Optional[str] = None) -> str:
@@ -32,24 +103,6 @@ def resolve_schema_root(schema_root: Optional[str] = None) -> str:
     return str(root)
 
 
-def _canonical_json_bytes(obj: Any, trailing_newline: bool = True) -> bytes:
-    txt = json.dumps(obj, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
-    if trailing_newline:
-        txt += "\n"
-    return txt.encode("utf-8")
-
-
-def _pretty_json_bytes(obj: Any, crlf: bool = False) -> bytes:
-    txt = json.dumps(obj, indent=2, sort_keys=True, ensure_ascii=False) + "\n"
-    if crlf:
-        txt = txt.replace("\n", "\r\n")
-    return txt.encode("utf-8")
-
-
-def _sha256_hex(b: bytes) -> str:
-    return hashlib.sha256(b).hexdigest()
-
-
 def _envelope_for_hash(payload: Dict[str, Any]) -> Dict[str, Any]:
     """
     SHA policy covers the entire top-level payload envelope, excluding the
@@ -61,8 +114,7 @@ def _envelope_for_hash(payload: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def canonical_sha256_for_payload(payload: Dict[str, Any]) -> str:
-    env = _envelope_for_hash(payload)
-    return _sha256_hex(_canonical_json_bytes(env, trailing_newline=True))
+    return json_sha256_hex(_envelope_for_hash(payload), CANONICAL)
 
 
 def compute_payload_sha256(payload: Dict[str, Any]) -> str:
@@ -73,63 +125,306 @@ def compute_payload_sha256(payload: Dict[str, Any]) -> str:
     return canonical_sha256_for_payload(payload)
 
 
-def _legacy_sha_variants(payload: Dict[str, Any]) -> List[str]:
-    env = _envelope_for_hash(payload)
-    variants: List[str] = []
+# Accepted serializations, in evaluation order. The compact pair shares one
+# streamed pass; the pretty (legacy-window) forms are only built on a miss.
+SHA_VARIANTS: Tuple[str, ...] = (CANONICAL.name, COMPACT.name, PRETTY_LF.name, PRETTY_CRLF.name)
+
+SHA_TELEMETRY = "sha_variants"
+
 
-    # A: canonical (sorted keys, compact, with trailing newline)
-    variants.append(_sha256_hex(_canonical_json_bytes(env, trailing_newline=True)))
+def _iter_sha_variants(payload: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    env = _envelope_for_hash(payload)
 
-    # B: canonical without trailing newline
-    variants.append(_sha256_hex(_canonical_json_bytes(env, trailing_newline=False)))
+    # A/B: canonical (sorted keys, compact) with and without trailing newline,
+    # from one streamed pass: the canonical digest is compact + "\n".
+    h = sha256_json(env, COMPACT)
+    compact = h.hexdigest()
+    h.update(CANONICAL.newline.encode("utf-8"))
+    yield CANONICAL.name, h.hexdigest()
+    yield COMPACT.name, compact
 
-    # C: pretty + LF
-    variants.append(_sha256_hex(_pretty_json_bytes(env, crlf=False)))
+    # C/D: pretty + LF / CRLF (legacy window)
+    yield PRETTY_LF.name, json_sha256_hex(env, PRETTY_LF)
+    yield PRETTY_CRLF.name, json_sha256_hex(env, PRETTY_CRLF)
 
-    # D: pretty + CRLF
-    variants.append(_sha256_hex(_pretty_json_bytes(env, crlf=True)))
 
+def _legacy_sha_variants(payload: Dict[str, Any]) -> List[str]:
     # de-dupe in order
-    seen = set()
     out: List[str] = []
-    for v in variants:
-        if v not in seen:
+    for _, v in _iter_sha_variants(payload):
+        if v not in out:
             out.append(v)
-            seen.add(v)
     return out
 
 
-def payload_sha_is_accepted(payload: Dict[str, Any], declared_sha256: str) -> bool:
+def matching_sha_variant(payload: Dict[str, Any], declared_sha256: str) -> Optional[str]:
+    """
+    Name of the first SHA_VARIANTS serialization whose digest equals declared_sha256
+    (None if none does). Stops hashing at the first match.
+    """
     d = (declared_sha256 or "").strip().lower()
     if not d:
+        return None
+    for name, v in _iter_sha_variants(payload):
+        if v == d:
+            return name
+    return None
+
+
+def payload_sha_is_accepted(payload: Dict[str, Any], declared_sha256: str) -> bool:
+    if not (declared_sha256 or "").strip():
         return False
-    return d in _legacy_sha_variants(payload)
+    name = matching_sha_variant(payload, declared_sha256)
+    # Which variant matched tells us when the legacy window can close.
+    telemetry.counters(SHA_TELEMETRY).incr(name or "mismatch")
+    return name is not None
+
+
+def _sha_error(message: str) -> SchemaValidationError:
+    return SchemaValidationError(
+        message, [SchemaIssue(message, path="/payload_sha256", keyword="payload_sha256")]
+    )
+
+
+def _enforce_sha_policy(payload: Dict[str, Any], hashed: Optional[HashedPayload] = None) -> None:
+    declared = payload.get("payload_sha256", "")
+    if not isinstance(declared, str) or not declared.strip():
+        raise _sha_error("payload_sha256 missing")
+
+    # Digest carried from HashedPayload (the COMPACT variant, computed once when the
+    # payload was built): no re-serialization, but still counted like a variant match.
+    if hashed is not None and hashed.describes(payload):
+        telemetry.counters(SHA_TELEMETRY).incr(COMPACT.name)
+        return
+
+    if not payload_sha_is_accepted(payload, declared):
+        raise _sha_error("payload_sha256 mismatch (not canonical and not within legacy window)")
+
+
+def _not_an_object() -> SchemaValidationError:
+    msg = "payload must be an object"
+    return SchemaValidationError(msg, [SchemaIssue(msg, keyword="type")])
 
 
-def validate_payload(payload: Dict[str, Any]) -> None:
+def _check_max_errors(max_errors: Optional[int]) -> None:
+    if max_errors is not None and (not isinstance(max_errors, int) or max_errors < 1):
+        raise ValueError("max_errors must be a positive int (or None for no limit)")
+
+
+_Memo = Tuple[ValidationCache, str]
+
+
+def _memo_for(
+    schema_root: str,
+    max_errors: Optional[int] = 1,
+    cache: Union[ValidationCache, Literal[False], None] = None,
+) -> Optional[_Memo]:
+    """
+    (verdict cache, schema scope) when a cache is in use: the given one, none for
+    cache=False, else the opt-in process-wide cache.
+    """
+    if cache is False:
+        return None
+    if cache is None:
+        cache = active_validation_cache()
+    if cache is None:
+        return None
+    # Collect-mode verdicts carry more issues than fail-fast ones: separate keys.
+    return (cache, f"{schema_scope(schema_root)}|max_errors={max_errors}")
+
+
+def validate_payload(
+    payload: Dict[str, Any],
+    *,
+    hashed: Optional[HashedPayload] = None,
+    max_errors: Optional[int] = 1,
+) -> None:
     """
     Validate vendor schema payload and enforce (canonical + legacy-window) SHA policy.
     Raises SchemaValidationError on any validation failure.
+
+    hashed: optional HashedPayload the payload was built from; when it describes the
+    payload exactly, its digest is trusted instead of re-hashing the SHA variants.
+
+    max_errors: 1 (default) is fail-fast: stop at the first failure (hot paths).
+    N > 1 (None = no limit) collects up to N schema/SHA issues in one pass (audits);
+    they are on the raised error's .issues.
     """
+    _check_max_errors(max_errors)
     if not isinstance(payload, dict):
-        raise SchemaValidationError("payload must be an object")
+        raise _not_an_object()
 
     # Enforce resolver default (and existence) up-front.
-    _ = resolve_schema_root(None)
+    root = resolve_schema_root(None)
+
+    _validate_with(payload, {}, hashed, _memo_for(root, max_errors), max_errors)
+
+
+def _validate_with(
+    payload: Any,
+    validators: Dict[Any, Any],
+    hashed: Optional[HashedPayload],
+    memo: Optional[_Memo] = None,
+    max_errors: Optional[int] = 1,
+) -> None:
+    """
+    Validate one payload, compiling (once) and reusing validators per contract.
+    With memo, an earlier schema/SHA verdict for the same key is returned as-is.
+    """
+    if not isinstance(payload, dict):
+        raise _not_an_object()
+
+    key = None
+    if memo is not None:
+        cache, scope = memo
+        key = cache.key_for(payload, scope, hashed)
+        seen = cache.get(key)
+        if seen is not None:
+            if seen.ok:
+                return
+            issues = [SchemaIssue.from_dict(d) for d in seen.issues]
+            raise SchemaValidationError(seen.error or "payload invalid", issues)
 
     try:
-        from app.validation.vendor_schema_loader import validate_against_vendor_schema
+        from app.validation.vendor_schema_loader import (
+            collect_schema_errors,
+            compile_vendor_validator,
+        )
     except Exception as e:
         raise SchemaValidationError(f"validator wiring error: {e}") from e
 
+    contract = payload.get("contract")
     try:
-        validate_against_vendor_schema(payload)
+        v = validators.get(contract)
+        if v is None:
+            v = compile_vendor_validator(contract)
+            validators[contract] = v
     except Exception as e:
+        # Wiring failure, not a verdict on the payload: never memoized.
         raise SchemaValidationError(str(e)) from e
 
-    declared = payload.get("payload_sha256", "")
-    if not isinstance(declared, str) or not declared.strip():
-        raise SchemaValidationError("payload_sha256 missing")
+    try:
+        if max_errors == 1:
+            _fail_fast(v, payload, hashed)
+        else:
+            _collect(v, payload, hashed, max_errors, collect_schema_errors)
+    except SchemaValidationError as e:
+        if key is not None:
+            issues = tuple(i.to_dict() for i in e.issues)
+            memo[0].put(key, Verdict(ok=False, error=str(e), issues=issues))
+        raise
+    if key is not None:
+        memo[0].put(key, Verdict(ok=True))
 
-    if not payload_sha_is_accepted(payload, declared):
-        raise SchemaValidationError("payload_sha256 mismatch (not canonical and not within legacy window)")
\ No newline at end of file
+
+def _fail_fast(v: Any, payload: Dict[str, Any], hashed: Optional[HashedPayload]) -> None:
+    try:
+        v.validate(payload)
+    except Exception as e:
+        issues = [SchemaIssue.from_jsonschema(e)] if _is_jsonschema_error(e) else []
+        raise SchemaValidationError(str(e), issues) from e
+    _enforce_sha_policy(payload, hashed)
+
+
+def _collect(
+    v: Any,
+    payload: Dict[str, Any],
+    hashed: Optional[HashedPayload],
+    max_errors: Optional[int],
+    collect_schema_errors: Any,
+) -> None:
+    try:
+        issues = [
+            SchemaIssue.from_jsonschema(e) for e in collect_schema_errors(v, payload, max_errors)
+        ]
+    except Exception as e:
+        raise SchemaValidationError(str(e)) from e
+
+    if max_errors is None or len(issues) < max_errors:
+        try:
+            _enforce_sha_policy(payload, hashed)
+        except SchemaValidationError as e:
+            issues.extend(e.issues)
+
+    if issues:
+        more = f" (+{len(issues) - 1} more)" if len(issues) > 1 else ""
+        raise SchemaValidationError(issues[0].message + more, issues)
+
+
+def _aligned_hashed(
+    payloads: Sequence[Any],
+    hashed: Optional[Sequence[Optional[HashedPayload]]],
+) -> List[Optional[HashedPayload]]:
+    carried = list(hashed) if hashed is not None else [None] * len(payloads)
+    if len(carried) != len(payloads):
+        raise SchemaValidationError("hashed must be aligned with payloads")
+    return carried
+
+
+def validate_payloads(
+    payloads: Sequence[Dict[str, Any]],
+    *,
+    hashed: Optional[Sequence[Optional[HashedPayload]]] = None,
+) -> None:
+    """
+    Strict bulk form of validate_payload (same rules, same errors).
+
+    The schema root is resolved once and each contract's validator is compiled
+    once, then reused for every payload of that contract. Raises on the first
+    failing payload. hashed (optional) is aligned with payloads, as in validate_payload.
+    """
+    for payload in payloads:
+        if not isinstance(payload, dict):
+            raise _not_an_object()
+
+    memo = _memo_for(resolve_schema_root(None))
+
+    validators: Dict[Any, Any] = {}
+    for payload, h in zip(payloads, _aligned_hashed(payloads, hashed)):
+        _validate_with(payload, validators, h, memo)
+
+
+@dataclass(frozen=True)
+class PayloadValidation:
+    index: int
+    ok: bool
+    contract: Optional[str]
+    error: Optional[str] = None
+    issues: Tuple[SchemaIssue, ...] = ()
+
+
+def validate_many(
+    payloads: Sequence[Any],
+    *,
+    hashed: Optional[Sequence[Optional[HashedPayload]]] = None,
+    max_errors: Optional[int] = 1,
+    cache: Union[ValidationCache, Literal[False], None] = None,
+) -> List[PayloadValidation]:
+    """
+    Non-raising bulk validation: one PayloadValidation per payload, in order.
+
+    Same rules as validate_payload; the schema root is resolved once and each
+    contract's validator is compiled once. A missing schema root is not a
+    per-payload failure and still raises SchemaValidationError. max_errors as in
+    validate_payload (per payload). cache: verdict cache to use instead of the
+    process-wide one (False = none).
+    """
+    _check_max_errors(max_errors)
+    memo = _memo_for(resolve_schema_root(None), max_errors, cache)
+
+    validators: Dict[Any, Any] = {}
+    out: List[PayloadValidation] = []
+    for i, (payload, h) in enumerate(zip(payloads, _aligned_hashed(payloads, hashed))):
+        contract = payload.get("contract") if isinstance(payload, dict) else None
+        contract = contract if isinstance(contract, str) else None
+        try:
+            _validate_with(payload, validators, h, memo, max_errors)
+        except SchemaValidationError as e:
+            out.append(
+                PayloadValidation(
+                    index=i, ok=False, contract=contract, error=str(e), issues=e.issues
+                )
+            )
+        else:
+            out.append(PayloadValidation(index=i, ok=True, contract=contract))
+    return out
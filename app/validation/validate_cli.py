@@ -0,0 +1,237 @@
+"""
+Bulk handoff validation CLI
+
+Validates archived RUN_HANDOFF payloads with the same rules as validate_payload
+(vendor schema + SHA policy) and reports one JSON line per payload:
+
+  {"source": "<file or ev_id>", "ok": true|false, "contract": "...", "error": "..."|null,
+   "issues": [{"message": ..., "path": ..., "keyword": ..., "schema_path": ...}, ...]}
+
+By default each payload stops at its first failure; --max-errors N collects up to
+N issues per payload in the same pass (0 = all).
+
+Sources:
+- --dir <dir>     every *.json handoff file in a directory (e.g. a runner inbox;
+                  the export manifest is skipped)
+- --store         every RUN_HANDOFF record in the evidence store (--root to override)
+
+Work is split into chunks fanned out over a process pool (results stream back
+in source order as chunks finish); each worker compiles a contract's validator
+once and reuses it for its whole share (validate_many). --workers 1 validates
+in-process. --cache memory|disk turns on the verdict cache (validation_cache)
+for this run only; the disk tier is shared by all workers and later runs.
+
+Exit code: 0 all valid, 1 any invalid, 2 usage / wiring error.
+
+CLI:
+  python -m app.validation.validate_cli (--dir <dir> | --store [--root <store root>])
+                                        [--workers N] [--chunk-size 64]
+                                        [--cache off|memory|disk] [--cache-dir DIR]
+                                        [--max-errors N]
+"""
+
+from __future__ import annotations
+
+if __name__ == "__main__":
+    # python -m app.validation.validate_cli: make src/ (swe_bootstrap) importable, then apply it.
+    import sys as _sys
+    from pathlib import Path as _Path
+
+    _SRC = _Path(__file__).resolve().parents[2] / "src"
+    if str(_SRC) not in _sys.path:
+        _sys.path.insert(0, str(_SRC))
+    import swe_bootstrap as _swe_bootstrap
+
+    _swe_bootstrap.apply()
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.validation.schema_validation import SchemaValidationError, validate_many
+from app.validation.validation_cache import ValidationCache, default_cache_dir
+
+# (source label, decoded payload or None, load error or None)
+_Item = Tuple[str, Any, Optional[str]]
+# --cache / --cache-dir as passed to workers: (mode, disk dir); None = process default
+_CacheSpec = Optional[Tuple[str, Optional[str]]]
+
+# Verdict cache per spec, built once per (worker) process.
+_CACHES: Dict[Tuple[str, Optional[str]], Any] = {}
+
+
+def _cache_for(spec: _CacheSpec) -> Any:
+    """validate_many(cache=...) for spec: None (process default), False (off) or a ValidationCache."""
+    if spec is None:
+        return None
+    if spec not in _CACHES:
+        mode, disk = spec
+        if mode == "off":
+            _CACHES[spec] = False
+        elif mode == "memory":
+            _CACHES[spec] = ValidationCache()
+        else:
+            _CACHES[spec] = ValidationCache(disk_dir=Path(disk) if disk else default_cache_dir())
+    return _CACHES[spec]
+
+
+def _result_line(
+    source: str,
+    ok: bool,
+    contract: Optional[str],
+    error: Optional[str],
+    issues: Iterable[Dict[str, str]] = (),
+) -> Dict[str, Any]:
+    return {
+        "source": source,
+        "ok": ok,
+        "contract": contract,
+        "error": error,
+        "issues": list(issues),
+    }
+
+
+def _validate_items(
+    items: List[_Item], max_errors: Optional[int] = 1, cache: _CacheSpec = None
+) -> List[Dict[str, Any]]:
+    """Validate one chunk (runs inside a worker process)."""
+    loaded = [(src, obj) for src, obj, err in items if err is None]
+    results = iter(
+        validate_many([obj for _, obj in loaded], max_errors=max_errors, cache=_cache_for(cache))
+    )
+
+    out: List[Dict[str, Any]] = []
+    for src, _obj, err in items:
+        if err is not None:
+            out.append(_result_line(src, False, None, err))
+            continue
+        r = next(results)
+        out.append(_result_line(src, r.ok, r.contract, r.error, (i.to_dict() for i in r.issues)))
+    return out
+
+
+def _load_file(path: str) -> _Item:
+    try:
+        return (path, json.loads(Path(path).read_text(encoding="utf-8")), None)
+    except (OSError, ValueError) as e:
+        return (path, None, f"unreadable JSON: {e}")
+
+
+def _validate_files(
+    paths: List[str], max_errors: Optional[int] = 1, cache: _CacheSpec = None
+) -> List[Dict[str, Any]]:
+    # Files are read in the worker, so only paths cross the process boundary.
+    return _validate_items([_load_file(p) for p in paths], max_errors, cache)
+
+
+def iter_dir_handoffs(directory: Path) -> List[str]:
+    from app.gui.handoff_export import MANIFEST_NAME
+
+    return [str(p) for p in sorted(directory.glob("*.json")) if p.name != MANIFEST_NAME]
+
+
+def iter_store_handoffs(root: Optional[Path] = None) -> Iterator[_Item]:
+    from app.gui.store import GuiStore
+
+    store = GuiStore(base_dir=root) if root else GuiStore()
+    for rec in store.iter_evidence():
+        if rec.kind != "RUN_HANDOFF":
+            continue
+        try:
+            yield (rec.ev_id, json.loads(rec.body), None)
+        except ValueError as e:
+            yield (rec.ev_id, None, f"unreadable JSON: {e}")
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    buf: List[Any] = []
+    for it in items:
+        buf.append(it)
+        if len(buf) >= size:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+
+def run(
+    fn: Any,
+    chunks: Iterable[List[Any]],
+    *,
+    workers: int,
+) -> Iterator[Dict[str, Any]]:
+    """Yield result lines in source order, fanning chunks out when workers > 1."""
+    if workers <= 1:
+        for c in chunks:
+            yield from fn(c)
+        return
+
+    # imap hands results back in order as soon as each chunk is done (Executor.map
+    # would submit every chunk, i.e. read the whole source, first). Each task is
+    # already a --chunk-size batch, hence chunksize=1.
+    with multiprocessing.Pool(workers) as pool:
+        for res in pool.imap(fn, chunks, chunksize=1):
+            yield from res
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.validation.validate_cli")
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--dir", default=None, help="directory of handoff *.json files")
+    src.add_argument(
+        "--store", action="store_true", help="validate RUN_HANDOFF records in the evidence store"
+    )
+    ap.add_argument("--root", default=None, help="store root (default: repo root)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--chunk-size", type=int, default=64)
+    ap.add_argument(
+        "--cache", choices=("off", "memory", "disk"), default=None, help="verdict cache mode"
+    )
+    ap.add_argument("--cache-dir", default=None, help="disk verdict cache directory")
+    ap.add_argument(
+        "--max-errors", type=int, default=1, help="issues to collect per payload (0 = all)"
+    )
+    args = ap.parse_args(argv)
+
+    # Passed to every worker call; nothing process-wide is changed.
+    cache: _CacheSpec = None
+    if args.cache or args.cache_dir:
+        cache = (
+            args.cache or "disk",
+            str(Path(args.cache_dir).resolve()) if args.cache_dir else None,
+        )
+
+    size = max(1, args.chunk_size)
+    max_errors = None if args.max_errors <= 0 else args.max_errors
+    if args.dir:
+        d = Path(args.dir)
+        if not d.is_dir():
+            print(json.dumps({"error": f"not a directory: {d}"}), file=sys.stderr)
+            return 2
+        fn, chunks = partial(_validate_files, max_errors=max_errors, cache=cache), _chunks(
+            iter_dir_handoffs(d), size
+        )
+    else:
+        root = Path(args.root) if args.root else None
+        fn, chunks = partial(_validate_items, max_errors=max_errors, cache=cache), _chunks(
+            iter_store_handoffs(root), size
+        )
+
+    failed = 0
+    try:
+        for line in run(fn, chunks, workers=args.workers):
+            failed += 0 if line["ok"] else 1
+            print(json.dumps(line, sort_keys=True, ensure_ascii=False))
+    except SchemaValidationError as e:
+        print(json.dumps({"error": str(e)}), file=sys.stderr)
+        return 2
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
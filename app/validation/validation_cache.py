@@ -0,0 +1,214 @@
+"""
+Validation verdict cache (opt-in)
+
+Memoizes validate_payload verdicts so a handoff that was already checked (at
+persist time, by parity tests, by a runner) is not re-run through jsonschema.
+
+Key: (contract, schema catalog fingerprint, compact payload sha256, declared
+payload_sha256). The fingerprint covers the schema root and its tree
+(schema_catalog.current_tree_fingerprint, re-walked at most once per
+fingerprint TTL), so a schema edit invalidates old verdicts within that window
+(at once after clear_validator_cache()). Computing the key never walks the tree
+on a warm process. The compact sha comes from the HashedPayload when one is
+carried.
+
+Tiers:
+- in-memory LRU (per process)
+- optional on-disk tier, one small JSON file per key, shared across processes
+  (default <repo>/build/validation_cache/, override SWE_VALIDATION_CACHE_DIR)
+
+Only schema / SHA-policy verdicts are cached; wiring errors (missing schema
+root, unresolvable contract) are never memoized.
+
+Enable with SWE_VALIDATION_CACHE=memory|disk, or configure_validation_cache().
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from app.validation.canonical import COMPACT, HashedPayload, json_sha256_hex
+from app.validation.schema_catalog import current_tree_fingerprint
+
+VALIDATION_CACHE_ENV = "SWE_VALIDATION_CACHE"
+VALIDATION_CACHE_DIR_ENV = "SWE_VALIDATION_CACHE_DIR"
+
+
+@dataclass(frozen=True)
+class Verdict:
+    ok: bool
+    error: Optional[str] = None
+    # SchemaIssue.to_dict() of each recorded issue
+    issues: Tuple[Dict[str, str], ...] = ()
+
+
+def _repo_root() -> Path:
+    # validation_cache.py lives at: app/validation/validation_cache.py
+    return Path(__file__).resolve().parents[2]
+
+
+def default_cache_dir() -> Path:
+    env = os.environ.get(VALIDATION_CACHE_DIR_ENV, "").strip()
+    if env:
+        return Path(env).resolve()
+    return _repo_root() / "build" / "validation_cache"
+
+
+def schema_scope(schema_root: str) -> str:
+    """Fingerprint tag of the schema tree verdicts are valid for."""
+    count, newest = current_tree_fingerprint(Path(schema_root))
+    return f"{schema_root}|{count}|{newest}"
+
+
+def payload_digest(payload: Dict[str, Any], hashed: Optional[HashedPayload] = None) -> str:
+    """COMPACT sha256 of the payload envelope (without payload_sha256)."""
+    if hashed is not None and hashed.describes(payload):
+        return hashed.sha256
+    env = dict(payload)
+    env.pop("payload_sha256", None)
+    return json_sha256_hex(env, COMPACT)
+
+
+class ValidationCache:
+    def __init__(self, maxsize: int = 4096, disk_dir: Optional[Path] = None) -> None:
+        self.maxsize = max(1, int(maxsize))
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        self._data: OrderedDict[str, Verdict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(contract: Any, scope: str, digest: str, declared_sha256: Any) -> str:
+        parts = [str(contract), scope, digest, str(declared_sha256)]
+        return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+    def key_for(
+        self, payload: Dict[str, Any], scope: str, hashed: Optional[HashedPayload] = None
+    ) -> str:
+        return self.key(
+            payload.get("contract"),
+            scope,
+            payload_digest(payload, hashed),
+            payload.get("payload_sha256"),
+        )
+
+    def _disk_path(self, key: str) -> Path:
+        assert self.disk_dir is not None
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Verdict]:
+        with self._lock:
+            v = self._data.get(key)
+            if v is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return v
+
+        v = self._disk_get(key) if self.disk_dir is not None else None
+        with self._lock:
+            if v is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, v)
+        return v
+
+    def put(self, key: str, verdict: Verdict) -> None:
+        with self._lock:
+            self._remember(key, verdict)
+        if self.disk_dir is not None:
+            self._disk_put(key, verdict)
+
+    def _remember(self, key: str, verdict: Verdict) -> None:
+        self._data[key] = verdict
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[Verdict]:
+        try:
+            obj = json.loads(self._disk_path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(obj, dict) or not isinstance(obj.get("ok"), bool):
+            return None
+        err = obj.get("error")
+        issues = obj.get("issues")
+        return Verdict(
+            ok=obj["ok"],
+            error=err if isinstance(err, str) else None,
+            issues=(
+                tuple(i for i in issues if isinstance(i, dict)) if isinstance(issues, list) else ()
+            ),
+        )
+
+    def _disk_put(self, key: str, verdict: Verdict) -> None:
+        p = self._disk_path(key)
+        try:
+            p.parent.mkdir(parents=True, exist_ok=True)
+            tmp = p.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            doc = {"ok": verdict.ok, "error": verdict.error, "issues": list(verdict.issues)}
+            tmp.write_text(json.dumps(doc, sort_keys=True), encoding="utf-8")
+            tmp.replace(p)
+        except OSError:
+            # Disk tier is best-effort; the in-memory verdict stands.
+            pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+_ACTIVE: Optional[ValidationCache] = None
+_CONFIGURED = False
+_ACTIVE_LOCK = threading.Lock()
+
+
+def configure_validation_cache(
+    enabled: bool = True,
+    *,
+    maxsize: int = 4096,
+    disk_dir: Optional[Path] = None,
+) -> Optional[ValidationCache]:
+    """Install (or, with enabled=False, remove) the process-wide verdict cache."""
+    global _ACTIVE, _CONFIGURED
+    with _ACTIVE_LOCK:
+        _ACTIVE = ValidationCache(maxsize=maxsize, disk_dir=disk_dir) if enabled else None
+        _CONFIGURED = True
+        return _ACTIVE
+
+
+def active_validation_cache() -> Optional[ValidationCache]:
+    """The configured cache, else one built from SWE_VALIDATION_CACHE on first use (None = off)."""
+    global _ACTIVE, _CONFIGURED
+    with _ACTIVE_LOCK:
+        if not _CONFIGURED:
+            mode = os.environ.get(VALIDATION_CACHE_ENV, "").strip().lower()
+            if mode in ("1", "memory", "on", "true"):
+                _ACTIVE = ValidationCache()
+            elif mode == "disk":
+                _ACTIVE = ValidationCache(disk_dir=default_cache_dir())
+            _CONFIGURED = True
+        return _ACTIVE
+
+
+def reset_validation_cache() -> None:
+    """Forget any configuration; the next use re-reads SWE_VALIDATION_CACHE."""
+    global _ACTIVE, _CONFIGURED
+    with _ACTIVE_LOCK:
+        _ACTIVE = None
+        _CONFIGURED = False
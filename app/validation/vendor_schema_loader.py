@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+import itertools
 import json
+import threading
 
 import jsonschema
 from referencing import Registry, Resource
 
+from app.validation.fast_validator import FastValidator, load_fast_validator
+from app.validation.schema_catalog import (
+    clear_fingerprint_cache,
+    current_tree_fingerprint,
+    lookup_schema_path,
+)
+
 # -------------------------------------------------------------------
 # Phase5 / Step5IM:
 # Replace deprecated jsonschema.RefResolver usage with referencing.Registry.
@@ -74,6 +83,7 @@ def _resolve_schema_path(contract: str, schema_root: Path) -> Path:
     Resolve schema file path for a contract id like 'run_handoff/1.0'.
 
     Preferred: ask swe_schemas for a contract->path resolver if present.
+    Then: the prebuilt schema catalog (rebuilt when the tree fingerprint changes).
     Fallback: search for a JSON file whose contents declare the same title/id.
     """
     # 1) Prefer explicit resolver if present (keeps behavior aligned with vendor package)
@@ -85,8 +95,16 @@ def _resolve_schema_path(contract: str, schema_root: Path) -> Path:
         p = Path(swe_schemas.resolve_contract_schema_path(contract)).resolve()
         return p
 
-    # 2) Fallback: scan for a schema with title == contract OR $id ending with contract
+    # 2) Catalog (no per-file parsing on the hot path)
     contract_norm = str(contract).strip()
+    try:
+        hit = lookup_schema_path(contract_norm, schema_root)
+    except Exception:
+        hit = None
+    if hit is not None and hit.exists():
+        return hit
+
+    # 3) Fallback: scan for a schema with title == contract OR $id ending with contract
     for fp in sorted(schema_root.rglob("*.json")):
         try:
             doc = _safe_read_json(fp)
@@ -108,20 +126,65 @@ def _resolve_schema_path(contract: str, schema_root: Path) -> Path:
 
     raise FileNotFoundError(f"could not resolve schema for contract '{contract_norm}' under {schema_root}")
 
-def validate_against_vendor_schema(payload: Dict[str, Any], schema_root: Optional[Path] = None) -> None:
+# -------------------------------------------------------------------
+# Compiled-validator cache.
+# Key: (contract, resolved schema root). Entries are invalidated by a cheap
+# fingerprint of the schema tree (json file count + newest mtime), so edits to
+# the vendor tree are picked up without re-parsing anything on the hot path.
+# The fingerprint itself is re-walked at most once per SWE_SCHEMA_FINGERPRINT_TTL
+# (schema_catalog.current_tree_fingerprint); clear_validator_cache() drops both.
+# Contract ids that resolve to the same schema file (title, $id suffix) share
+# one compiled validator: a second cache is keyed by (schema path, schema root).
+# -------------------------------------------------------------------
+
+_VALIDATOR_CACHE: Dict[Tuple[str, str], Tuple[Tuple[int, int], Any]] = {}
+_VALIDATORS_BY_PATH: Dict[Tuple[str, str], Tuple[Tuple[int, int], Any]] = {}
+_VALIDATOR_CACHE_LOCK = threading.Lock()
+
+
+def clear_validator_cache() -> None:
+    with _VALIDATOR_CACHE_LOCK:
+        _VALIDATOR_CACHE.clear()
+        _VALIDATORS_BY_PATH.clear()
+    clear_fingerprint_cache()
+
+
+def compile_vendor_validator(contract: str, schema_root: Optional[Path] = None) -> Any:
     """
-    Validate payload against vendor schema corresponding to payload['contract'].
+    Resolve, check and compile the vendor schema validator for a contract id.
 
-    NOTE:
-    - Uses referencing.Registry (no jsonschema.RefResolver).
-    - Ensures all refs resolve from vendor schema tree.
+    The returned validator can be reused for any number of payloads of the
+    same contract. Compiled validators are cached per (contract, schema root),
+    shared by every contract id that resolves to the same schema file, and
+    recompiled only when the schema tree fingerprint changes (checked at most
+    once per fingerprint TTL; clear_validator_cache() forces a fresh look).
     """
     schema_root_p = _resolve_schema_root(schema_root)
-    contract = payload.get("contract")
     if not isinstance(contract, str) or not contract.strip():
         raise ValueError("payload.contract must be a non-empty string")
 
-    schema_path = _resolve_schema_path(contract.strip(), schema_root_p)
+    key = (contract.strip(), str(schema_root_p))
+    fp = current_tree_fingerprint(schema_root_p)
+    with _VALIDATOR_CACHE_LOCK:
+        hit = _VALIDATOR_CACHE.get(key)
+    if hit is not None and hit[0] == fp:
+        return hit[1]
+
+    schema_path = _resolve_schema_path(key[0], schema_root_p)
+    path_key = (str(schema_path), key[1])
+    with _VALIDATOR_CACHE_LOCK:
+        shared = _VALIDATORS_BY_PATH.get(path_key)
+    if shared is not None and shared[0] == fp:
+        v = shared[1]
+    else:
+        v = _compile_vendor_validator(schema_path, schema_root_p)
+    with _VALIDATOR_CACHE_LOCK:
+        _VALIDATORS_BY_PATH[path_key] = (fp, v)
+        _VALIDATOR_CACHE[key] = (fp, v)
+    return v
+
+
+def _compile_vendor_validator(schema_path: Path, schema_root_p: Path) -> Any:
     schema = _safe_read_json(schema_path)
 
     # Build registry rooted in vendor schema tree.
@@ -144,7 +207,58 @@ def validate_against_vendor_schema(payload: Dict[str, Any], schema_root: Optiona
     v_cls.check_schema(schema)
 
     # IMPORTANT: pass registry=... (no resolver kwarg)
-    v = v_cls(schema, registry=registry)
+    reference = v_cls(schema, registry=registry)
+
+    # Flat schemas get a generated pure-Python check for the accept path;
+    # jsonschema stays the reference (and the source of error messages).
+    fast = load_fast_validator(schema)
+    return FastValidator(fast, reference) if fast is not None else reference
+
+
+def collect_schema_errors(validator: Any, payload: Any, limit: Optional[int] = None) -> List[Any]:
+    """
+    Up to `limit` (None = all) jsonschema errors for payload, in iteration order.
+    Stops iterating once the budget is reached.
+    """
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be >= 1 (or None for all)")
+    return list(itertools.islice(validator.iter_errors(payload), limit))
+
+
+class VendorSchemaErrors(Exception):
+    """Collect-mode failure of validate_against_vendor_schema: .errors holds every error found."""
+
+    def __init__(self, errors: List[Any]) -> None:
+        self.errors = list(errors)
+        first = self.errors[0].message if self.errors else "invalid"
+        more = f" (+{len(self.errors) - 1} more)" if len(self.errors) > 1 else ""
+        super().__init__(first + more)
+
+
+def validate_against_vendor_schema(
+    payload: Dict[str, Any],
+    schema_root: Optional[Path] = None,
+    *,
+    max_errors: Optional[int] = 1,
+) -> None:
+    """
+    Validate payload against vendor schema corresponding to payload['contract'].
+
+    max_errors=1 (default) is fail-fast: raises the first jsonschema.ValidationError.
+    Larger values (None = no limit) collect that many errors via iter_errors in a
+    single pass and raise VendorSchemaErrors.
+
+    NOTE:
+    - Uses referencing.Registry (no jsonschema.RefResolver).
+    - Ensures all refs resolve from vendor schema tree.
+    """
+    v = compile_vendor_validator(payload.get("contract"), schema_root)
+
+    if max_errors == 1:
+        # Validate payload (raises jsonschema.ValidationError on failure)
+        v.validate(payload)
+        return
 
-    # Validate payload (raises jsonschema.ValidationError on failure)
-    v.validate(payload)
+    errors = collect_schema_errors(v, payload, max_errors)
+    if errors:
+        raise VendorSchemaErrors(errors)
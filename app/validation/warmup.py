@@ -0,0 +1,143 @@
+"""
+Validator warm-up (background)
+
+The first validation in a session otherwise pays, on the caller's thread, for
+importing jsonschema/referencing, walking the vendor schema tree, building the
+schema catalog and compiling (and code-generating) the contract validators.
+
+start_warmup() does all of that once, on a daemon thread, so GUI entry points can
+call it right after showing the window. Validators land in the regular caches
+(schema_catalog, vendor_schema_loader, fast_validator); nothing here changes
+validation results. Failures are recorded, never raised.
+
+This module itself imports nothing heavy; importing it is cheap.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+THREAD_NAME = "swe-validator-warmup"
+
+
+@dataclass(frozen=True)
+class WarmupResult:
+    schema_root: Optional[str]
+    compiled: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+_THREAD: Optional[threading.Thread] = None
+_RESULT: Optional[WarmupResult] = None
+_LOCK = threading.Lock()
+
+
+def _id_suffix(schema_id: str) -> Optional[str]:
+    """Contract-style tail of a $id ('<name>/<ver>' or the last segment); always a literal suffix."""
+    parts = schema_id.rstrip("/").split("/")
+    if not parts[-1]:
+        return None
+    if len(parts) >= 2 and parts[-1][:1].isdigit() and parts[-2]:
+        return f"{parts[-2]}/{parts[-1]}"
+    return parts[-1]
+
+
+def _catalog_contracts(catalog: Dict) -> List[str]:
+    """
+    Contract ids to warm, in the order lookup_schema_path matches them: each
+    entry's title, then its $id suffix. The validator cache is keyed by the
+    payload's contract string, so these are the keys a real validate_payload()
+    call will look up; ids of the same schema file share one compiled
+    validator, so each file is compiled once.
+    """
+    out: List[str] = []
+    for e in catalog.get("entries", []):
+        if not isinstance(e, dict):
+            continue
+        _id = e.get("id")
+        for c in (e.get("title"), _id_suffix(_id) if isinstance(_id, str) else None):
+            if isinstance(c, str) and c.strip() and c.strip() not in out:
+                out.append(c.strip())
+    return out
+
+
+def warm_validators(schema_root: Optional[Path] = None) -> WarmupResult:
+    """Compile every vendor contract validator now (synchronously)."""
+    t0 = time.perf_counter()
+    try:
+        from app.validation.schema_catalog import load_catalog
+        from app.validation.schema_validation import resolve_schema_root
+        from app.validation.vendor_schema_loader import compile_vendor_validator
+
+        root = Path(resolve_schema_root(str(schema_root) if schema_root is not None else None))
+        contracts = _catalog_contracts(load_catalog(root))
+    except Exception as e:
+        return WarmupResult(
+            schema_root=None, failed={"*": str(e)}, seconds=time.perf_counter() - t0
+        )
+
+    compiled: List[str] = []
+    failed: Dict[str, str] = {}
+    for contract in contracts:
+        try:
+            compile_vendor_validator(contract, root)
+            compiled.append(contract)
+        except Exception as e:
+            failed[contract] = str(e)
+    return WarmupResult(
+        schema_root=str(root),
+        compiled=compiled,
+        failed=failed,
+        seconds=time.perf_counter() - t0,
+    )
+
+
+def _run(schema_root: Optional[Path]) -> None:
+    global _RESULT
+    res = warm_validators(schema_root)
+    with _LOCK:
+        _RESULT = res
+
+
+def start_warmup(schema_root: Optional[Path] = None) -> threading.Thread:
+    """
+    Start the warm-up thread (once per process; later calls return the same thread).
+    """
+    global _THREAD
+    with _LOCK:
+        if _THREAD is None:
+            _THREAD = threading.Thread(
+                target=_run, args=(schema_root,), name=THREAD_NAME, daemon=True
+            )
+            _THREAD.start()
+        return _THREAD
+
+
+def wait_for_warmup(timeout: Optional[float] = None) -> Optional[WarmupResult]:
+    """Join a started warm-up (None if never started or still running at timeout)."""
+    with _LOCK:
+        t = _THREAD
+    if t is None:
+        return None
+    t.join(timeout)
+    return warmup_result()
+
+
+def warmup_result() -> Optional[WarmupResult]:
+    with _LOCK:
+        return _RESULT
+
+
+def reset_warmup() -> None:
+    """Forget a finished warm-up so start_warmup() runs again (tests)."""
+    global _THREAD, _RESULT
+    with _LOCK:
+        if _THREAD is not None and _THREAD.is_alive():
+            raise RuntimeError("warm-up still running")
+        _THREAD = None
+        _RESULT = None
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import os
 import sys
 from pathlib import Path
 
+import pytest
+
 REPO = Path(__file__).resolve().parents[1]
 SRC = REPO / "src"
 VENDOR = REPO / "vendor" / "swe-schemas"
@@ -15,3 +18,64 @@ def _ins(p: Path) -> None:
 # Priority: vendor first, then src
 _ins(VENDOR)
 _ins(SRC)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _telemetry_to_tmp(tmp_path_factory: pytest.TempPathFactory):
+    # Keep counters, schema catalogs and generated validators written during the
+    # suite out of the repo's data/telemetry and build/.
+    from app.core import telemetry
+    from app.validation.fast_validator import FAST_VALIDATOR_DIR_ENV
+    from app.validation.schema_catalog import CATALOG_DIR_ENV
+
+    dirs = {
+        telemetry.TELEMETRY_DIR_ENV: "telemetry",
+        CATALOG_DIR_ENV: "schema_catalog",
+        FAST_VALIDATOR_DIR_ENV: "fast_validators",
+    }
+    prev = {env: os.environ.get(env) for env in dirs}
+    for env, name in dirs.items():
+        os.environ[env] = str(tmp_path_factory.mktemp(name))
+    yield
+    telemetry.flush_all()
+    for env, value in prev.items():
+        if value is None:
+            os.environ.pop(env, None)
+        else:
+            os.environ[env] = value
+
+
+@pytest.fixture(autouse=True)
+def _fresh_circuit_breakers():
+    # Breakers are per host and process-wide; don't let one test's failures open another's.
+    from app.engine.retry import reset_circuit_breakers
+
+    reset_circuit_breakers()
+    yield
+    reset_circuit_breakers()
+
+
+@pytest.fixture
+def mock_ollama(monkeypatch: pytest.MonkeyPatch):
+    """
+    install(handler, *, async_=False): answer the engine's Ollama requests (sync,
+    or async with async_=True) with httpx.MockTransport(handler). OLLAMA_HOST and
+    OLLAMA_MODEL are unset and the shared transport is reset after the test.
+    """
+    import httpx
+
+    from app.engine import transport
+
+    monkeypatch.delenv("OLLAMA_HOST", raising=False)
+    monkeypatch.delenv("OLLAMA_MODEL", raising=False)
+    mocks = {}
+
+    def install(handler, *, async_: bool = False) -> httpx.MockTransport:
+        mock = mocks["async_transport" if async_ else "transport"] = httpx.MockTransport(handler)
+        transport.configure_transport(**mocks)
+        return mock
+
+    try:
+        yield install
+    finally:
+        transport.configure_transport()
@@ -0,0 +1,194 @@
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Callable, Dict, List
+
+import httpx
+import pytest
+
+from app.core.types.messages import ChatMessage, Role
+from app.engine import transport
+from app.engine.engine import AsyncEngine, EngineConfig
+from app.engine.orchestrator import ConversationOrchestrator
+from app.engine.providers.ollama import OllamaConfig, OllamaError, OllamaProvider
+
+HOST = "http://ollama.test"
+LATENCY = 0.2
+
+
+async def _chunks(text: str) -> AsyncIterator[bytes]:
+    for word in text.split(" "):
+        await asyncio.sleep(0.01)
+        yield (json.dumps({"message": {"content": word + " "}, "done": False}) + "\n").encode()
+    yield (json.dumps({"message": {"content": ""}, "done": True}) + "\n").encode()
+
+
+@pytest.fixture
+def server(mock_ollama: Callable[..., object]) -> Dict[str, int]:
+    """Mock Ollama: echoes the last user message after LATENCY seconds (model "slow": 10 s)."""
+    stats = {"active": 0, "peak": 0, "calls": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/tags":
+            return httpx.Response(200, json={"models": []})
+        body = json.loads(request.content)
+        if body["model"] == "missing":
+            return httpx.Response(404, text="model not found")
+        stats["calls"] += 1
+        stats["active"] += 1
+        stats["peak"] = max(stats["peak"], stats["active"])
+        try:
+            await asyncio.sleep(10 if body["model"] == "slow" else LATENCY)
+        finally:
+            stats["active"] -= 1
+        echo = f"re: {body['messages'][-1]['content']}"
+        if body["stream"]:
+            return httpx.Response(200, content=_chunks(echo))
+        return httpx.Response(200, json={"message": {"content": echo}})
+
+    mock_ollama(handler, async_=True)
+    return stats
+
+
+def _cfg(model: str = "m") -> EngineConfig:
+    return EngineConfig(ollama_host=HOST, ollama_model=model)
+
+
+def test_async_send_and_stream(server: Dict[str, int]) -> None:
+    async def go() -> None:
+        eng = AsyncEngine(_cfg())
+        assert await eng.health() == (True, "OK")
+        assert await eng.send_user("one") == "re: one"
+        got: List[str] = []
+        assert await eng.send_user("two three", on_token=got.append) == "re: two three"
+        assert got == ["re: ", "two ", "three "]
+        assert [m["content"] for m in eng._messages[1:]] == [
+            "one",
+            "re: one",
+            "two three",
+            "re: two three",
+        ]
+        assert await eng.send_user("   ") == ""
+        await transport.aclose_shared_async_client()
+
+    asyncio.run(go())
+
+
+def test_deadline_raises_and_rolls_back(server: Dict[str, int]) -> None:
+    async def go() -> None:
+        eng = AsyncEngine(_cfg("slow"))
+        for on_token in (None, print):
+            t0 = time.perf_counter()
+            with pytest.raises(TimeoutError):
+                await eng.send_user("hi", deadline=0.05, on_token=on_token)
+            assert time.perf_counter() - t0 < 1.0
+            assert len(eng._messages) == 1
+
+    asyncio.run(go())
+
+
+def test_cancellation_aborts_request(server: Dict[str, int]) -> None:
+    async def go() -> None:
+        eng = AsyncEngine(_cfg("slow"))
+        task = asyncio.create_task(eng.send_user("hi"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert server["active"] == 0 and len(eng._messages) == 1
+
+    asyncio.run(go())
+
+
+def test_http_errors_are_wrapped(server: Dict[str, int]) -> None:
+    async def go() -> None:
+        eng = AsyncEngine(_cfg("missing"))
+        with pytest.raises(RuntimeError, match="Ollama request failed"):
+            await eng.send_user("hi")
+        assert len(eng._messages) == 1
+
+    asyncio.run(go())
+
+
+def test_orchestrator_runs_conversations_concurrently(server: Dict[str, int]) -> None:
+    async def go() -> None:
+        async with ConversationOrchestrator(_cfg(), max_in_flight=3) as orch:
+            t0 = time.perf_counter()
+            for conv in ("a", "b", "c"):
+                orch.submit(conv, f"{conv}1")
+            orch.submit("a", "a2")
+            results = await orch.drain()
+            elapsed = time.perf_counter() - t0
+
+        assert [r.reply for r in results] == ["re: a1", "re: b1", "re: c1", "re: a2"]
+        # a, b, c overlap; a's second turn waits for its first
+        assert server["peak"] == 3
+        assert 2 * LATENCY <= elapsed < 3 * LATENCY
+        assert [m["content"] for m in orch.engine("a")._messages[1:]] == [
+            "a1",
+            "re: a1",
+            "a2",
+            "re: a2",
+        ]
+
+    asyncio.run(go())
+
+
+def test_orchestrator_limits_deadlines_and_cancel(server: Dict[str, int]) -> None:
+    async def go() -> None:
+        slow = ConversationOrchestrator(_cfg("slow"), max_in_flight=1)
+        slow.submit("x", "late", deadline=0.05)
+        running = slow.submit("y", "stop")
+        slow.submit("y", "queued")
+        await asyncio.sleep(0)
+        assert slow.in_flight() == 3
+        assert slow.cancel("y") == 2 and slow.cancel("nobody") == 0
+        late, stop, queued = await slow.drain()
+
+        assert late.timed_out and not late.ok and "deadline" in (late.error or "")
+        assert stop.cancelled and queued.cancelled
+        assert server["peak"] <= 1 and server["active"] == 0
+        assert running.cancelled()
+
+    asyncio.run(go())
+
+
+def test_orchestrator_cancel_propagates_to_awaiting_caller(server: Dict[str, int]) -> None:
+    async def go() -> None:
+        orch = ConversationOrchestrator(_cfg("slow"))
+        task = orch.submit("a", "hi")
+        await asyncio.sleep(0.05)
+        assert orch.cancel() == 1
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        (result,) = await orch.drain()
+        assert (
+            result.cancelled
+            and result.error == "cancelled"
+            and (result.conversation, result.text) == ("a", "hi")
+        )
+        assert server["active"] == 0 and len(orch.engine("a")._messages) == 1
+
+    asyncio.run(go())
+
+
+def test_provider_async_chat(server: Dict[str, int]) -> None:
+    msgs = [ChatMessage(id="m1", role=Role.user, content="ping pong")]
+
+    async def go() -> None:
+        provider = OllamaProvider(OllamaConfig(host=HOST, model="m"))
+        text, meta = await provider.achat(msgs)
+        assert text == "re: ping pong" and meta["model"] == "m"
+
+        got = [d async for d in provider.achat_stream(msgs)]
+        assert "".join(got).strip() == text
+        assert (await provider.achat(msgs, on_token=lambda d: None))[1]["raw"]["done"] is True
+
+        with pytest.raises(TimeoutError):
+            await OllamaProvider(OllamaConfig(host=HOST, model="slow")).achat(msgs, deadline=0.05)
+        with pytest.raises(OllamaError, match="model not found"):
+            await OllamaProvider(OllamaConfig(host=HOST, model="missing")).achat(
+                msgs, on_token=print
+            )
+
+    asyncio.run(go())
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import tracemalloc
+from typing import Any
+
+import pytest
+
+from app.util.canonical_json import canonical_dumps, canonical_sha256_for_payload
+from app.validation import canonical
+from app.validation import schema_validation as sv
+from app.validation.canonical import (
+    CANONICAL,
+    COMPACT,
+    JSON_VARIANTS,
+    PRETTY_CRLF,
+    PRETTY_LF,
+    canonical_json,
+    compute_payload_sha256,
+    iter_json_bytes,
+    iter_json_text,
+    json_sha256_hex,
+)
+
+SAMPLES: list[Any] = [
+    {},
+    [],
+    {"a": [], "b": {}, "c": [{}], "d": [[]]},
+    {
+        "zeta": 1,
+        "alpha": [1, 2.5, -0.0, 1e300, True, False, None],
+        "mid": {"y": "z", "x": "é中\U0001f600"},
+    },
+    {"esc": 'quote " back \\ nl \n tab \t ctl \x01  ', "k\n": "v"},
+    {"nested": [[1, [2, [3, {"deep": ["x"] * 3}]]]]},
+    {10: "sorted numerically", 2: "before 10", 1: None},
+    ["top", "level", {"list": True}],
+    "bare string",
+    42,
+    None,
+    {"commands": ["echo " + "x" * 50_000] * 3, "notes": "ü" * 70_001},
+]
+
+
+def _reference(obj: Any, variant_name: str) -> bytes:
+    if variant_name in ("compact", "canonical"):
+        txt = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    else:
+        txt = json.dumps(obj, ensure_ascii=False, sort_keys=True, indent=2)
+    if variant_name != "compact":
+        txt += "\n"
+    if variant_name == "pretty_crlf":
+        txt = txt.replace("\n", "\r\n")
+    return txt.encode("utf-8")
+
+
+@pytest.fixture(params=["one_shot_small", "stream_everything"])
+def one_shot_budget(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> None:
+    if request.param == "stream_everything":
+        monkeypatch.setattr(canonical, "_ONE_SHOT_CHARS", -1)
+
+
+@pytest.mark.parametrize("variant", sorted(JSON_VARIANTS))
+@pytest.mark.parametrize("obj", SAMPLES, ids=range(len(SAMPLES)))
+def test_stream_matches_json_dumps(obj: Any, variant: str, one_shot_budget: None) -> None:
+    v = JSON_VARIANTS[variant]
+    want = _reference(obj, variant)
+
+    assert "".join(iter_json_text(obj, v)).encode("utf-8") == want
+    assert b"".join(iter_json_bytes(obj, v, chunk_bytes=7)) == want
+    assert json_sha256_hex(obj, v) == hashlib.sha256(want).hexdigest()
+
+
+def test_unserializable_raises_type_error() -> None:
+    with pytest.raises(TypeError):
+        json_sha256_hex({"x": object()})
+    with pytest.raises(TypeError):
+        json_sha256_hex({(1, 2): "tuple key"})
+
+
+@pytest.mark.parametrize("obj", [s for s in SAMPLES if isinstance(s, dict)], ids=str)
+def test_three_code_paths_agree(obj: dict) -> None:
+    body = dict(obj)
+    sha = hashlib.sha256
+
+    # app.validation.canonical (planner / HashedPayload): compact, no newline
+    assert compute_payload_sha256(body) == sha(canonical_json(body).encode("utf-8")).hexdigest()
+    assert compute_payload_sha256(body) == json_sha256_hex(body, COMPACT)
+
+    # app.util.canonical_json: pretty + LF
+    assert (
+        canonical_sha256_for_payload(body) == sha(canonical_dumps(body).encode("utf-8")).hexdigest()
+    )
+    assert canonical_sha256_for_payload(body) == json_sha256_hex(body, PRETTY_LF)
+
+    # schema_validation: canonical (compact + LF) and the legacy window
+    assert sv.compute_payload_sha256(body) == json_sha256_hex(body, CANONICAL)
+    for name in sv.SHA_VARIANTS:
+        assert (
+            sv.matching_sha_variant(body, json_sha256_hex(body, JSON_VARIANTS[name]))
+            in sv.SHA_VARIANTS
+        )
+    assert sv._legacy_sha_variants(body)[-1] == json_sha256_hex(body, PRETTY_CRLF)
+    assert sv.payload_sha_is_accepted(body, compute_payload_sha256(body))
+
+
+def test_large_handoff_hashes_in_bounded_memory() -> None:
+    notes = "né" * (4 * 1024 * 1024)  # ~8 MiB of text, ~12 MiB as UTF-8
+    body = {"commands": ["echo hi"] * 100, "notes": notes}
+
+    tracemalloc.start()
+    try:
+        digest = json_sha256_hex(body, COMPACT)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < 1024 * 1024
+    assert digest == hashlib.sha256(canonical_json(body).encode("utf-8")).hexdigest()
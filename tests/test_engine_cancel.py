@@ -0,0 +1,84 @@
+import asyncio
+import json
+import threading
+import time
+from typing import Callable, Dict, List
+
+import httpx
+import pytest
+
+from app.engine.cancel import CallCancelled, CancelScope, health, send_user
+from app.engine.engine import Engine, EngineConfig
+
+HOST = "http://ollama.test"
+
+
+@pytest.fixture
+def server(mock_ollama: Callable[..., object]) -> Dict[str, object]:
+    """Mock Ollama that never answers while state["hang"] is set (model loading, no token yet)."""
+    state: Dict[str, object] = {"hang": True, "started": threading.Event(), "aborted": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if state["hang"]:
+            state["started"].set()
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                state["aborted"] += 1
+                raise
+        if request.url.path == "/api/tags":
+            return httpx.Response(200, json={"models": []})
+        text = json.loads(request.content)["messages"][-1]["content"]
+        lines = [{"message": {"content": f"re: {text}"}, "done": False}, {"done": True}]
+        return httpx.Response(200, content="".join(json.dumps(x) + "\n" for x in lines).encode())
+
+    mock_ollama(handler, async_=True)
+    return state
+
+
+def _stop_when_started(state: Dict[str, object], scope: CancelScope) -> threading.Thread:
+    def stop() -> None:
+        assert state["started"].wait(5)
+        scope.cancel()
+
+    t = threading.Thread(target=stop)
+    t.start()
+    return t
+
+
+def test_cancel_aborts_request_before_first_token(server: Dict[str, object]) -> None:
+    engine = Engine(EngineConfig(ollama_host=HOST, ollama_model="m"))
+    scope = CancelScope()
+    tokens: List[str] = []
+    stopper = _stop_when_started(server, scope)
+    t0 = time.perf_counter()
+    with pytest.raises(CallCancelled):
+        send_user(engine, "hi", scope, on_token=tokens.append)
+    stopper.join()
+
+    assert time.perf_counter() - t0 < 5
+    assert server["aborted"] == 1 and tokens == []
+    assert len(engine._messages) == 1  # history unchanged
+    with pytest.raises(CallCancelled):  # a cancelled scope refuses later calls
+        send_user(engine, "again", scope)
+
+
+def test_health_can_be_stopped(server: Dict[str, object]) -> None:
+    engine = Engine(EngineConfig(ollama_host=HOST, ollama_model="m"))
+    scope = CancelScope()
+    stopper = _stop_when_started(server, scope)
+    with pytest.raises(CallCancelled):
+        health(engine, scope)
+    stopper.join()
+    assert server["aborted"] == 1
+
+
+def test_uncancelled_calls_stream_and_record_the_turn(server: Dict[str, object]) -> None:
+    server["hang"] = False
+    engine = Engine(EngineConfig(ollama_host=HOST, ollama_model="m"))
+    scope = CancelScope()
+    tokens: List[str] = []
+    assert health(engine, scope) == (True, "OK")
+    assert send_user(engine, "hi", scope, on_token=tokens.append) == "re: hi"
+    assert tokens == ["re: hi"]
+    assert [m["content"] for m in engine._messages[1:]] == ["hi", "re: hi"]
@@ -0,0 +1,120 @@
+import json
+from typing import Callable, List
+
+import httpx
+import pytest
+
+from app.engine.engine import Engine, EngineConfig
+from app.engine.history import (
+    SUMMARY_HEADER,
+    HistoryBudget,
+    approx_tokens,
+    compact_history,
+    history_tokens,
+    strip_file_contents,
+)
+
+HOST = "http://ollama.test"
+BIG = "x = 1\n" * 700  # ~4 KB file body
+
+
+def _reply(i: int) -> str:
+    return json.dumps(
+        {
+            "final_message": f"wrote module {i}",
+            "actions": [{"type": "file_write", "path": f"pkg/m{i}.py", "content": BIG}],
+        }
+    )
+
+
+@pytest.fixture
+def prompts(mock_ollama: Callable[..., object]) -> List[list]:
+    sent: List[list] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        msgs = json.loads(request.content)["messages"]
+        sent.append(msgs)
+        return httpx.Response(200, json={"message": {"content": _reply(len(sent))}})
+
+    mock_ollama(handler)
+    return sent
+
+
+def test_approx_tokens() -> None:
+    assert approx_tokens("") == 0
+    assert approx_tokens("abcd") == 1
+    assert approx_tokens("a" * 4001) == 1001
+
+
+def test_strip_file_contents_json_and_fences() -> None:
+    stripped = json.loads(strip_file_contents(_reply(3)))
+    (action,) = stripped["actions"]
+    assert action["path"] == "pkg/m3.py"
+    assert action["content"] == f"<701 lines / {len(BIG)} chars omitted>"
+    assert stripped["final_message"] == "wrote module 3"
+
+    md = f"Here:\n```python\n# File: a.py\n{BIG}```\nand\n```python\n# File: b.py\nprint(1)\n```"
+    out = strip_file_contents(md)
+    assert "# File: a.py" in out and "chars omitted>" in out and BIG not in out
+    assert "print(1)" in out
+
+    small = json.dumps({"actions": [{"type": "file_write", "path": "s.py", "content": "pass\n"}]})
+    assert strip_file_contents(small) == small
+    assert strip_file_contents("plain text") == "plain text"
+
+
+def test_prompt_size_stays_flat(prompts: List[list]) -> None:
+    budget = HistoryBudget(max_tokens=2000, summary_tokens=300)
+    engine = Engine(EngineConfig(ollama_host=HOST, history=budget))
+    unbounded = Engine(
+        EngineConfig(ollama_host=HOST, history=HistoryBudget(max_tokens=0, strip_file_writes=False))
+    )
+
+    for i in range(40):
+        engine.send_user(f"please write module {i} with care " + "detail " * 40)
+    sizes = [history_tokens(m) for m in prompts]
+    prompts.clear()
+    for i in range(10):
+        unbounded.send_user(f"please write module {i}")
+    grown = [history_tokens(m) for m in prompts]
+
+    assert max(sizes) <= budget.max_tokens
+    # once the budget is reached, each turn costs about the same
+    plateau = sizes[len(sizes) // 2 :]
+    assert max(plateau) - min(plateau) < 300
+    assert grown[-1] > 9 * 1000  # every old file body resent
+
+    last = engine._messages
+    assert last[0]["content"] == engine.config.system_prompt
+    assert last[1]["role"] == "system" and last[1]["content"].startswith(SUMMARY_HEADER)
+    assert "(wrote pkg/m" in last[1]["content"]
+    assert approx_tokens(last[1]["content"]) <= budget.summary_tokens
+    assert all(BIG not in m["content"] for m in last[:-1])
+
+
+def test_compaction_keeps_system_and_newest_turn() -> None:
+    system = {"role": "system", "content": "S"}
+    huge = {"role": "user", "content": "q" * 40_000}
+    msgs = [
+        system,
+        {"role": "user", "content": "old"},
+        {"role": "assistant", "content": "ok"},
+        huge,
+    ]
+
+    out = compact_history(msgs, HistoryBudget(max_tokens=1000))
+
+    assert out[0] == system and out[-1] == huge
+    assert out[1]["content"] == SUMMARY_HEADER + "\n- user: old\n- engineer: ok"
+    assert compact_history(out, HistoryBudget(max_tokens=1000)) == out
+
+
+def test_unbounded_budget_still_strips_old_files() -> None:
+    msgs = [
+        {"role": "system", "content": "S"},
+        {"role": "user", "content": "a"},
+        {"role": "assistant", "content": _reply(1)},
+        {"role": "user", "content": "b"},
+    ]
+    out = compact_history(msgs, HistoryBudget(max_tokens=0))
+    assert len(out) == 4 and BIG not in out[2]["content"]
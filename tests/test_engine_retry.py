@@ -0,0 +1,212 @@
+import asyncio
+import json
+from typing import Callable, List
+
+import httpx
+import pytest
+
+from app.core import telemetry
+from app.core.types.messages import ChatMessage, Role
+from app.engine import transport
+from app.engine.engine import AsyncEngine, Engine, EngineConfig
+from app.engine.providers.ollama import OllamaConfig, OllamaError, OllamaProvider
+from app.engine.retry import (
+    RETRY_TELEMETRY,
+    NO_RETRY,
+    CircuitOpenError,
+    RetryCall,
+    RetryPolicy,
+    circuit_breaker,
+)
+
+HOST = "http://ollama.test"
+FAST = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.002)
+
+
+class Server:
+    """Scripted /api/chat outcomes: 'connect', an int status, or 'ok' (the default once exhausted)."""
+
+    def __init__(self) -> None:
+        self.script: List[object] = []
+        self.chat_calls = 0
+        self.tags_ok = True
+        self.tags_calls = 0
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/tags":
+            self.tags_calls += 1
+            if not self.tags_ok:
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200, json={"models": []})
+        self.chat_calls += 1
+        step = self.script.pop(0) if self.script else "ok"
+        if step == "connect":
+            raise httpx.ConnectError("refused", request=request)
+        if isinstance(step, int):
+            return httpx.Response(step, text="model failed to load")
+        if json.loads(request.content).get("stream"):
+            lines = [
+                {"message": {"content": "he"}},
+                {"message": {"content": "llo"}},
+                {"done": True},
+            ]
+            return httpx.Response(
+                200, content="".join(json.dumps(x) + "\n" for x in lines).encode()
+            )
+        return httpx.Response(200, json={"message": {"content": "hello"}})
+
+    async def ahandle(self, request: httpx.Request) -> httpx.Response:
+        return self.handle(request)
+
+
+@pytest.fixture
+def server(mock_ollama: Callable[..., object]) -> Server:
+    srv = Server()
+    mock_ollama(srv.handle)
+    mock_ollama(srv.ahandle, async_=True)
+    telemetry.counters(RETRY_TELEMETRY).discard()
+    return srv
+
+
+def _counts() -> dict:
+    return telemetry.counters(RETRY_TELEMETRY).pending()
+
+
+def _engine(retry: RetryPolicy = FAST) -> Engine:
+    return Engine(EngineConfig(ollama_host=HOST, retry=retry))
+
+
+def test_backoff_is_capped_full_jitter() -> None:
+    policy = RetryPolicy(base_delay=0.5, max_delay=3.0)
+    assert [policy.backoff(n, rng=lambda: 1.0) for n in (1, 2, 3, 4, 5)] == [
+        0.5,
+        1.0,
+        2.0,
+        3.0,
+        3.0,
+    ]
+    assert policy.backoff(3, rng=lambda: 0.0) == 0.0
+
+
+def test_connect_errors_and_5xx_are_retried(server: Server) -> None:
+    server.script = ["connect", 503]
+
+    assert _engine().send_user("hi") == "hello"
+
+    assert server.chat_calls == 3
+    counts = _counts()
+    assert counts["retry.connect"] == 1 and counts["retry.http_5xx"] == 1
+    assert counts["recovered"] == 1 and "retry_wait_ms" in counts
+
+
+def test_client_errors_are_not_retried(server: Server) -> None:
+    server.script = [400]
+    with pytest.raises(RuntimeError, match="400"):
+        _engine().send_user("hi")
+    assert server.chat_calls == 1 and _counts() == {}
+
+
+def test_gives_up_after_max_attempts(server: Server) -> None:
+    server.script = [500, 500, 500, 500]
+    with pytest.raises(RuntimeError, match="500"):
+        _engine().send_user("hi")
+    assert server.chat_calls == 3
+    assert _counts()["gave_up.http_5xx"] == 1 and _counts()["retry.http_5xx"] == 2
+
+
+def test_deadline_stops_retrying(server: Server) -> None:
+    server.script = ["connect"] * 10
+    slow = RetryPolicy(max_attempts=10, base_delay=5.0, max_delay=5.0)
+    call = RetryCall(slow, deadline=0.5)
+    call.begin()
+    # a 0..5s backoff only goes ahead if it fits in what is left of the deadline
+    delay = call.failed(httpx.ConnectError("refused"))
+    assert delay is None or delay < 0.5
+    assert call.timeout(120.0) <= 0.5
+
+    with pytest.raises(RuntimeError):
+        Engine(EngineConfig(ollama_host=HOST, retry=slow)).send_user("hi", deadline=0.01)
+    assert server.chat_calls <= 2
+
+
+def test_streamed_reply_retries_only_before_first_fragment(server: Server) -> None:
+    server.script = [503]
+    got: List[str] = []
+    assert _engine().send_user("hi", on_token=got.append) == "hello"
+    assert got == ["he", "llo"] and server.chat_calls == 2
+
+
+def test_circuit_opens_fails_fast_and_recovers_after_probe(server: Server) -> None:
+    engine = _engine(NO_RETRY)
+    breaker = circuit_breaker(HOST)
+    server.script = ["connect"] * 3
+    for _ in range(3):
+        with pytest.raises(RuntimeError, match="not reachable|refused"):
+            engine.send_user("hi")
+    assert breaker.state == "open"
+
+    with pytest.raises(RuntimeError) as info:
+        engine.send_user("hi")
+    assert isinstance(info.value.__cause__, CircuitOpenError)
+    assert server.chat_calls == 3 and server.tags_calls == 0
+
+    breaker.reset_after = 0.0
+    server.tags_ok = False
+    with pytest.raises(RuntimeError, match="still unavailable"):
+        engine.send_user("hi")
+    assert server.tags_calls == 1 and server.chat_calls == 3
+
+    server.tags_ok = True
+    assert engine.send_user("hi") == "hello"
+    assert breaker.state == "closed"
+    counts = _counts()
+    assert counts["circuit.opened"] == 1 and counts["circuit.rejected"] == 1
+    assert counts["circuit.probe_failed"] == 1 and counts["circuit.closed"] == 1
+
+
+def test_half_open_failure_reopens_immediately(server: Server) -> None:
+    breaker = circuit_breaker(HOST)
+    for _ in range(3):
+        breaker.record_failure()
+    breaker.reset_after = 0.0
+    server.script = ["connect"]
+    with pytest.raises(RuntimeError):
+        _engine(NO_RETRY).send_user("hi")
+    assert breaker.state == "open" and _counts()["circuit.opened"] == 2
+
+
+def test_provider_reports_attempts_and_wraps_circuit_errors(server: Server) -> None:
+    p = OllamaProvider(OllamaConfig(host=HOST, retry=FAST))
+    msgs = [ChatMessage(id="m1", role=Role.user, content="hi")]
+
+    server.script = [502]
+    text, meta = p.chat(msgs)
+    assert text == "hello" and meta["attempts"] == 2 and meta["retry_wait"] >= 0
+
+    server.script = [503]
+    got: List[str] = []
+    text, meta = p.chat(msgs, on_token=got.append)
+    assert text == "hello" and meta["attempts"] == 2
+
+    server.script = ["connect"] * 3
+    with pytest.raises(OllamaError, match="not reachable"):
+        p.chat(msgs)
+    with pytest.raises(OllamaError, match="unavailable"):
+        p.chat(msgs)
+
+
+def test_async_engine_and_provider_retry(server: Server) -> None:
+    p = OllamaProvider(OllamaConfig(host=HOST, retry=FAST))
+    msgs = [ChatMessage(id="m1", role=Role.user, content="hi")]
+
+    async def run() -> tuple:
+        server.script = ["connect"]
+        reply = await AsyncEngine(EngineConfig(ollama_host=HOST, retry=FAST)).send_user("hi")
+        server.script = [503]
+        streamed = await p.achat(msgs, on_token=lambda _d: None)
+        await transport.aclose_shared_async_client()
+        return reply, streamed
+
+    reply, (text, meta) = asyncio.run(run())
+    assert reply == "hello" and text == "hello" and meta["attempts"] == 2
+    assert server.chat_calls == 4
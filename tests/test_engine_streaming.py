@@ -0,0 +1,130 @@
+import json
+from typing import Callable, Iterator, List
+
+import httpx
+import pytest
+
+from app.core.types.messages import ChatMessage, Role
+from app.engine.engine import Engine, EngineConfig
+from app.engine.providers.ollama import OllamaConfig, OllamaError, OllamaProvider
+
+HOST = "http://ollama.test"
+FRAGMENTS = ['{"final_', 'message": ', '"done", ', '"actions": []}']
+
+
+def _ndjson(events: List[str], fragments: List[str], error: str = "") -> Iterator[bytes]:
+    for f in fragments:
+        events.append(f"sent:{f}")
+        yield (
+            json.dumps({"message": {"role": "assistant", "content": f}, "done": False}) + "\n"
+        ).encode()
+    if error:
+        yield (json.dumps({"error": error}) + "\n").encode()
+        return
+    yield b"\n"
+    yield (
+        json.dumps({"message": {"role": "assistant", "content": ""}, "done": True, "eval_count": 4})
+        + "\n"
+    ).encode()
+
+
+@pytest.fixture
+def events(mock_ollama: Callable[..., object]) -> List[str]:
+    log: List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        log.append(f"stream={body['stream']}")
+        if body["model"] == "broken":
+            return httpx.Response(200, content=_ndjson(log, FRAGMENTS[:1], error="out of memory"))
+        if body["model"] == "missing":
+            return httpx.Response(404, text="model not found")
+        if not body["stream"]:
+            return httpx.Response(200, json={"message": {"content": "".join(FRAGMENTS)}})
+        return httpx.Response(200, content=_ndjson(log, FRAGMENTS))
+
+    mock_ollama(handler)
+    return log
+
+
+def _msg(text: str) -> List[ChatMessage]:
+    return [ChatMessage(id="m1", role=Role.user, content=text)]
+
+
+def test_engine_streams_fragments_as_they_arrive(events: List[str]) -> None:
+    engine = Engine(EngineConfig(ollama_host=HOST, ollama_model="m"))
+
+    reply = engine.send_user("go", on_token=lambda d: events.append(f"got:{d}"))
+
+    assert reply == "".join(FRAGMENTS)
+    assert events[0] == "stream=True"
+    # each fragment reaches the callback before the next one is produced
+    assert events[1:] == [e for f in FRAGMENTS for e in (f"sent:{f}", f"got:{f}")]
+    assert engine._messages[-1] == {"role": "assistant", "content": reply}
+
+
+def test_engine_generator_and_blocking_modes_agree(events: List[str]) -> None:
+    streamed = Engine(EngineConfig(ollama_host=HOST, ollama_model="m"))
+    blocking = Engine(EngineConfig(ollama_host=HOST, ollama_model="m"))
+
+    assert list(streamed.stream_user("go")) == FRAGMENTS
+    assert blocking.send_user("go") == "".join(FRAGMENTS)
+    assert streamed._messages == blocking._messages
+    assert list(streamed.stream_user("  ")) == []
+
+
+def test_engine_stream_errors(events: List[str]) -> None:
+    with pytest.raises(RuntimeError, match="out of memory"):
+        Engine(EngineConfig(ollama_host=HOST, ollama_model="broken")).send_user(
+            "go", on_token=lambda d: None
+        )
+    with pytest.raises(RuntimeError, match="Ollama request failed"):
+        list(Engine(EngineConfig(ollama_host=HOST, ollama_model="missing")).stream_user("go"))
+
+
+def test_engine_stream_error_mid_way_rolls_back(events: List[str]) -> None:
+    engine = Engine(EngineConfig(ollama_host=HOST, ollama_model="broken"))
+    got: List[str] = []
+
+    with pytest.raises(RuntimeError, match="out of memory"):
+        for delta in engine.stream_user("go"):
+            got.append(delta)
+
+    assert got == FRAGMENTS[:1]
+    assert len(engine._messages) == 1  # the unanswered turn is gone
+
+
+def test_provider_chat_stream_and_callback(events: List[str]) -> None:
+    provider = OllamaProvider(OllamaConfig(host=HOST, model="m"))
+    got: List[str] = []
+
+    assert list(provider.chat_stream(_msg("go"))) == FRAGMENTS
+    text, meta = provider.chat(_msg("go"), on_token=got.append)
+
+    assert got == FRAGMENTS and text == "".join(FRAGMENTS)
+    assert meta["raw"]["done"] is True and meta["raw"]["eval_count"] == 4
+    assert provider.chat(_msg("go"))[0] == text
+
+
+def test_provider_stream_errors(events: List[str]) -> None:
+    with pytest.raises(OllamaError, match="out of memory"):
+        list(OllamaProvider(OllamaConfig(host=HOST, model="broken")).chat_stream(_msg("go")))
+    with pytest.raises(OllamaError, match="model not found"):
+        OllamaProvider(OllamaConfig(host=HOST, model="missing")).chat(_msg("go"), on_token=print)
+
+
+def test_callback_abort_closes_stream_and_rolls_back(events: List[str]) -> None:
+    engine = Engine(EngineConfig(ollama_host=HOST, ollama_model="m"))
+
+    class Stop(Exception):
+        pass
+
+    def on_token(delta: str) -> None:
+        raise Stop()
+
+    with pytest.raises(Stop):
+        engine.send_user("go", on_token=on_token)
+
+    # only the first fragment was produced, and the unanswered turn is gone
+    assert [e for e in events if e.startswith("sent:")] == [f"sent:{FRAGMENTS[0]}"]
+    assert len(engine._messages) == 1
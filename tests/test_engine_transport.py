@@ -0,0 +1,92 @@
+import json
+from typing import Iterator, List
+
+import httpx
+import pytest
+
+from app.core.types.messages import ChatMessage, Role
+from app.engine import transport
+from app.engine.engine import Engine, EngineConfig
+from app.engine.providers.ollama import OllamaConfig, OllamaError, OllamaProvider
+
+HOST = "http://ollama.test"
+
+
+@pytest.fixture
+def seen(monkeypatch: pytest.MonkeyPatch) -> Iterator[List[httpx.Request]]:
+    monkeypatch.delenv("OLLAMA_HOST", raising=False)
+    monkeypatch.delenv("OLLAMA_MODEL", raising=False)
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/api/tags":
+            return httpx.Response(200, json={"models": []})
+        body = json.loads(request.content)
+        if body["model"] == "missing":
+            return httpx.Response(404, text="model not found")
+        return httpx.Response(200, json={"message": {"role": "assistant", "content": " hi "}})
+
+    transport.configure_transport(transport=httpx.MockTransport(handler))
+    try:
+        yield requests
+    finally:
+        transport.configure_transport()
+
+
+def test_engine_and_provider_share_one_client(seen: List[httpx.Request]) -> None:
+    engine = Engine(EngineConfig(ollama_host=HOST, ollama_model="m"))
+    provider = OllamaProvider(OllamaConfig(host=HOST, model="m"))
+    client = transport.shared_client()
+
+    assert engine.health() == (True, "OK")
+    assert engine.send_user("hello") == "hi"
+    assert provider.health() == (True, "OK")
+    assert provider.chat([ChatMessage(id="m1", role=Role.user, content="x")])[0] == "hi"
+
+    assert transport.shared_client() is client and not client.is_closed
+    assert [r.url.path for r in seen] == ["/api/tags", "/api/chat", "/api/tags", "/api/chat"]
+
+
+def test_per_request_timeout_is_applied(seen: List[httpx.Request]) -> None:
+    Engine(EngineConfig(ollama_host=HOST, timeout_seconds=7.5)).health()
+    OllamaProvider(OllamaConfig(host=HOST, timeout_sec=2.0)).health()
+
+    assert seen[0].extensions["timeout"]["read"] == 7.5
+    assert seen[1].extensions["timeout"] == {"connect": 2.0, "read": 2.0, "write": 2.0, "pool": 2.0}
+
+
+def test_errors_still_map(seen: List[httpx.Request]) -> None:
+    with pytest.raises(RuntimeError, match="Ollama request failed"):
+        Engine(EngineConfig(ollama_host=HOST, ollama_model="missing")).send_user("x")
+    with pytest.raises(OllamaError, match="model not found"):
+        OllamaProvider(OllamaConfig(host=HOST, model="missing")).chat(
+            [ChatMessage(id="m1", role=Role.user, content="x")]
+        )
+
+
+def test_close_and_reopen(seen: List[httpx.Request]) -> None:
+    first = transport.shared_client()
+    transport.close_shared_client()
+    transport.close_shared_client()
+
+    assert first.is_closed
+    second = transport.shared_client()
+    assert second is not first
+    assert Engine(EngineConfig(ollama_host=HOST)).health()[0]
+
+
+def test_explicit_client_bypasses_pool(seen: List[httpx.Request]) -> None:
+    own = httpx.Client(transport=httpx.MockTransport(lambda r: httpx.Response(503, text="busy")))
+    ok, msg = Engine(EngineConfig(ollama_host=HOST), client=own).health()
+    assert (ok, msg) == (False, "503 busy") and seen == []
+
+
+def test_limits_come_from_config() -> None:
+    cfg = transport.TransportConfig(
+        max_connections=3, max_keepalive_connections=2, keepalive_expiry=9.0
+    )
+    assert cfg.limits() == httpx.Limits(
+        max_connections=3, max_keepalive_connections=2, keepalive_expiry=9.0
+    )
+    assert cfg.timeout(1.0).connect == 1.0 and cfg.timeout().read == 120.0
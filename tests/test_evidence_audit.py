@@ -0,0 +1,99 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.gui.planner import make_run_plans, persist_plan_batch
+from app.gui.store import EvidenceRecord, GuiStore
+from app.validation import evidence_audit as ea
+
+
+def _seed(tmp_path: Path) -> GuiStore:
+    s = GuiStore(base_dir=tmp_path)
+    tasks = [(f"T{i:04d}", f'task {i} mentions "kind": "RUN_HANDOFF"', "") for i in range(1, 7)]
+    res = persist_plan_batch(s, make_run_plans(tasks), reviewer="r", runner_label="R")
+
+    tampered = dict(json.loads(res.handoffs[0].body), notes="edited")
+    s.append_evidence_many(
+        [
+            EvidenceRecord(
+                "E9001",
+                "RUN_HANDOFF",
+                "2026-01-01T00:00:00+00:00",
+                "tampered",
+                json.dumps(tampered),
+            ),
+            EvidenceRecord(
+                "E9002", "RUN_HANDOFF", "2026-01-01T00:00:00+00:00", "garbage", "{not json"
+            ),
+        ]
+    )
+    with s.evidence_path.open("a", encoding="utf-8") as f:
+        f.write('\n{broken line "kind": "RUN_HANDOFF"\n')
+    return s
+
+
+def test_plan_chunks_cover_file_on_line_boundaries(tmp_path: Path) -> None:
+    s = _seed(tmp_path)
+    data = s.evidence_path.read_bytes()
+
+    chunks = ea.plan_chunks(s.evidence_path, 300)
+
+    assert len(chunks) > 3
+    assert chunks[0][1] == 0 and chunks[-1][2] == len(data)
+    for (_, _, end), (_, start, _) in zip(chunks, chunks[1:]):
+        assert end == start and data[start - 1 : start] == b"\n"
+
+
+def test_audit_reports_counts_and_failures(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    s = _seed(tmp_path)
+    monkeypatch.setattr(GuiStore, "read_evidence", lambda self: pytest.fail("full-history load"))
+
+    rep = ea.audit_evidence([s.evidence_path], workers=1, chunk_bytes=500, max_errors=None)
+
+    assert (rep.handoffs, rep.valid, rep.invalid, rep.undecodable) == (8, 6, 1, 2)
+    assert rep.lines == 6 * 3 + 3 and not rep.ok
+    by_ev = {f.ev_id: f for f in rep.failures}
+    assert set(by_ev) == {"E9001", "E9002", None}
+    assert by_ev["E9001"].issues[0]["keyword"] == "payload_sha256"
+    assert by_ev["E9002"].error.startswith("undecodable body")
+    assert s.evidence_path.read_bytes()[by_ev["E9001"].offset :].startswith(b'{"body"')
+
+
+def test_parallel_audit_matches_serial(tmp_path: Path) -> None:
+    s = _seed(tmp_path)
+    serial = ea.audit_evidence([s.evidence_path], workers=1, chunk_bytes=400)
+    pooled = ea.audit_evidence([s.evidence_path], workers=2, chunk_bytes=400)
+
+    strip = lambda r: {k: v for k, v in r.to_dict().items() if k != "seconds"}  # noqa: E731
+    assert strip(pooled) == strip(serial)
+
+
+def test_failure_list_is_capped(tmp_path: Path) -> None:
+    s = _seed(tmp_path)
+
+    rep = ea.audit_evidence([s.evidence_path], chunk_bytes=200, max_failures=1)
+
+    assert len(rep.failures) == 1 and rep.failures_dropped == 2
+
+
+def test_cli_segments_and_exit_code(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    clean = GuiStore(base_dir=tmp_path / "clean")
+    persist_plan_batch(clean, make_run_plans([("T1", "a", "")]), reviewer="r", runner_label="R")
+
+    assert ea.main(["--root", str(tmp_path / "clean"), "--workers", "1"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["ok"] and report["handoffs"] == 1
+
+    dirty = _seed(tmp_path / "dirty")
+    args = [
+        "--path",
+        str(clean.evidence_path),
+        "--path",
+        str(dirty.evidence_path),
+        "--workers",
+        "1",
+    ]
+    assert ea.main(args) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report["handoffs"] == 9 and len(report["files"]) == 2
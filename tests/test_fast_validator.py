@@ -0,0 +1,197 @@
+import copy
+import json
+import random
+from pathlib import Path
+from typing import Any
+
+import jsonschema
+import pytest
+
+from app.validation import fast_validator as fv
+
+REPO = Path(__file__).resolve().parents[1]
+HANDOFF_SCHEMA = json.loads(
+    (REPO / "contracts" / "run_handoff.schema.json").read_text(encoding="utf-8")
+)
+
+SYNTHETIC = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "type": "object",
+    "required": ["kind", "n"],
+    "properties": {
+        "kind": {"enum": ["a", "b", None, True]},
+        "n": {"type": "integer"},
+        "ratio": {"type": ["number", "null"]},
+        "tags": {
+            "type": "array",
+            "minItems": 1,
+            "maxItems": 3,
+            "items": {"type": "string", "minLength": 2},
+        },
+        "name": {"type": "string", "maxLength": 4, "pattern": "^[a-z]"},
+        "flag": {"const": False},
+        "any": {},
+    },
+    "additionalProperties": {"type": "string"},
+}
+
+# Subschemas that only carry annotations constrain nothing.
+ANNOTATED = {
+    "type": "object",
+    "required": ["kind"],
+    "properties": {
+        "kind": {"description": "free text"},
+        "tags": {"type": "array", "items": {"description": "any item", "$comment": "unchecked"}},
+        "n": {"title": "N", "examples": [1]},
+    },
+    "additionalProperties": {"description": "anything else"},
+}
+HANDOFF_FREE_NOTES = dict(
+    HANDOFF_SCHEMA,
+    properties=dict(HANDOFF_SCHEMA["properties"], notes={"description": "free text"}),
+)
+
+VALUES: list = [
+    "x",
+    "",
+    "ab",
+    "abcde",
+    "Zed",
+    "run_handoff/1.0",
+    0,
+    1,
+    2.0,
+    2.5,
+    True,
+    False,
+    None,
+    [],
+    ["ab"],
+    ["a", 1],
+    ["ab", "cd", "ef", "gh"],
+    {},
+    {"k": "v"},
+    "a" * 64,
+    "0f" * 32,
+    "0F" * 32,
+    "0f" * 32 + "\n",
+]
+
+
+def _valid_handoff() -> dict:
+    return {
+        "contract": "run_handoff/1.0",
+        "created_utc": "2026-01-01T00:00:00+00:00",
+        "plan_ev_id": "E0001",
+        "approval_ev_id": "E0002",
+        "runner_label": "R",
+        "required_gates": ["g"],
+        "commands": ["c"],
+        "statements": ["s"],
+        "notes": "",
+        "payload_sha256": "ab" * 32,
+    }
+
+
+def _mutations(base: dict, rng: random.Random, n: int) -> list:
+    keys = sorted(set(base) | {"extra", "kind", "n", "ratio", "tags", "name", "flag"})
+    out: list = [base, [], "str", None, 3]
+    for k in base:
+        d = dict(base)
+        del d[k]
+        out.append(d)
+    for _ in range(n):
+        d = copy.deepcopy(base)
+        for _ in range(rng.randint(1, 3)):
+            k = rng.choice(keys)
+            if rng.random() < 0.15:
+                d.pop(k, None)
+            else:
+                d[k] = copy.deepcopy(rng.choice(VALUES))
+        out.append(d)
+    return out
+
+
+@pytest.mark.parametrize(
+    "schema, base",
+    [
+        (HANDOFF_SCHEMA, _valid_handoff()),
+        (SYNTHETIC, {"kind": "a", "n": 1}),
+        (ANNOTATED, {"kind": "a", "tags": ["x"]}),
+        (HANDOFF_FREE_NOTES, _valid_handoff()),
+    ],
+    ids=["run_handoff", "synthetic", "annotation_only", "run_handoff_free_notes"],
+)
+def test_generated_validator_agrees_with_jsonschema(
+    schema: dict, base: dict, tmp_path: Path
+) -> None:
+    fast = fv.load_fast_validator(schema, build_dir=tmp_path)
+    assert fast is not None
+    reference = jsonschema.validators.validator_for(schema)(schema)
+
+    cases = _mutations(base, random.Random(1234), 3000)
+    outcomes = {True: 0, False: 0}
+    for inst in cases:
+        want = reference.is_valid(inst)
+        assert fast(inst) is want, inst
+        outcomes[want] += 1
+    assert outcomes[True] > 20 and outcomes[False] > 20
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        {"type": "object", "properties": {"x": {"$ref": "#/$defs/y"}}},
+        {"allOf": [{"type": "string"}]},
+        {"$schema": "http://json-schema.org/draft-04/schema#", "type": "integer"},
+        {"items": [{"type": "string"}]},
+        {"const": 1},
+        {"type": "date"},
+    ],
+)
+def test_schemas_outside_the_subset_are_not_generated(schema: dict, tmp_path: Path) -> None:
+    with pytest.raises(fv.UnsupportedSchema):
+        fv.generate_source(schema)
+    assert fv.load_fast_validator(schema, build_dir=tmp_path) is None
+
+
+def test_generation_failure_falls_back_to_jsonschema(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    monkeypatch.setattr(fv, "generate_source", lambda schema: "def validate(instance):\nif True:\n")
+    schema = {"type": "object", "title": "broken"}
+    with caplog.at_level("WARNING", logger=fv.__name__):
+        assert fv.load_fast_validator(schema, build_dir=tmp_path) is None
+    assert "falling back to jsonschema" in caplog.text
+
+
+def test_module_is_written_once_and_reused(tmp_path: Path) -> None:
+    fv.clear_fast_validators()
+    fv.load_fast_validator(HANDOFF_SCHEMA, build_dir=tmp_path)
+    (module,) = tmp_path.glob("run_handoff_contract_*.py")
+    before = module.stat().st_mtime_ns
+    assert module.read_text(encoding="utf-8") == fv.generate_source(HANDOFF_SCHEMA)
+
+    fv.clear_fast_validators()
+    assert fv.load_fast_validator(HANDOFF_SCHEMA, build_dir=tmp_path)(_valid_handoff()) is True
+    assert module.stat().st_mtime_ns == before
+
+
+def test_disabled_by_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv(fv.FAST_VALIDATORS_ENV, "0")
+    assert fv.load_fast_validator(HANDOFF_SCHEMA, build_dir=tmp_path) is None
+
+
+def test_wrapper_raises_reference_error(tmp_path: Path) -> None:
+    reference = jsonschema.Draft202012Validator(HANDOFF_SCHEMA)
+    v = fv.FastValidator(fv.load_fast_validator(HANDOFF_SCHEMA, build_dir=tmp_path), reference)
+    bad: Any = dict(_valid_handoff(), commands=["ok", 7])
+
+    v.validate(_valid_handoff())
+    assert v.is_valid(_valid_handoff()) and not v.is_valid(bad)
+    with pytest.raises(jsonschema.ValidationError) as got:
+        v.validate(bad)
+    with pytest.raises(jsonschema.ValidationError) as want:
+        reference.validate(bad)
+    assert got.value.message == want.value.message
+    assert v.schema is reference.schema
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+from app.gui.store import EvidenceRecord, GuiStore, ParsedBodyCache, utc_now_iso
+
+
+def _rec(ev_id: str, body: str) -> EvidenceRecord:
+    return EvidenceRecord(
+        ev_id=ev_id, kind="NOTE", created_utc=utc_now_iso(), summary="s", body=body
+    )
+
+
+def test_parsed_body_is_cached_by_ev_id(tmp_path: Path) -> None:
+    s = GuiStore(base_dir=tmp_path)
+    s.append_evidence(_rec("E0001", '{"a": 1}'))
+
+    first = s.parsed_body(s.read_evidence()[0])
+    second = s.parsed_body(s.read_evidence()[0])
+
+    assert first == {"a": 1}
+    assert second is first
+    assert s.parsed_bodies.hits == 1
+    assert s.parsed_bodies.misses == 1
+
+
+def test_parsed_body_best_effort_for_non_objects() -> None:
+    c = ParsedBodyCache()
+    assert c.get(_rec("E0001", "plain note")) == {}
+    assert c.get(_rec("E0002", "[1, 2]")) == {}
+    assert c.get(_rec("E0003", "")) == {}
+
+
+def test_parsed_body_cache_detects_reused_ev_id() -> None:
+    c = ParsedBodyCache()
+    assert c.get(_rec("E0001", '{"a": 1}')) == {"a": 1}
+    assert c.get(_rec("E0001", '{"a": 2}')) == {"a": 2}
+
+
+def test_parsed_body_cache_is_bounded_lru() -> None:
+    c = ParsedBodyCache(maxsize=2)
+    r1, r2, r3 = _rec("E0001", "{}"), _rec("E0002", "{}"), _rec("E0003", "{}")
+    c.get(r1)
+    c.get(r2)
+    c.get(r1)  # r1 most recent
+    c.get(r3)  # evicts r2
+
+    assert len(c) == 2
+    c.get(r1)
+    assert c.hits == 2
+    c.get(r2)
+    assert c.misses == 4
@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+
+from app.gui.handoff_export import MANIFEST_NAME, export_handoffs
+from app.gui.planner import make_run_plans, persist_plan_batch
+from app.gui.store import GuiStore
+from app.validation.canonical import canonical_json, verify_payload_sha256
+
+
+def _seed(s: GuiStore, n: int, start: int = 1) -> None:
+    tasks = [(f"T{i:04d}", f"task {i}", "") for i in range(start, start + n)]
+    persist_plan_batch(s, make_run_plans(tasks), reviewer="r", runner_label="INBOX")
+
+
+def test_export_writes_canonical_files_and_manifest(tmp_path: Path) -> None:
+    s = GuiStore(base_dir=tmp_path / "store")
+    _seed(s, 3)
+    inbox = tmp_path / "inbox"
+
+    res = export_handoffs(s, inbox, workers=2)
+
+    assert res.exported == ["E0003", "E0006", "E0009"]
+    assert res.last_ev_id == "E0009"
+    for ev_id in res.exported:
+        raw = (inbox / f"{ev_id}.json").read_text(encoding="utf-8")
+        obj = json.loads(raw)
+        assert raw == canonical_json(obj) + "\n"
+        assert verify_payload_sha256(obj) is True
+
+    manifest = json.loads((inbox / MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert manifest["last_ev_id"] == "E0009"
+    assert [e["ev_id"] for e in manifest["entries"]] == res.exported
+
+
+def test_export_resumes_from_manifest_watermark(tmp_path: Path) -> None:
+    s = GuiStore(base_dir=tmp_path / "store")
+    _seed(s, 2)
+    inbox = tmp_path / "inbox"
+    export_handoffs(s, inbox)
+
+    assert export_handoffs(s, inbox).exported == []
+
+    _seed(s, 1, start=3)
+    res = export_handoffs(s, inbox)
+    assert res.exported == ["E0009"]
+
+    manifest = json.loads((inbox / MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert [e["ev_id"] for e in manifest["entries"]] == ["E0003", "E0006", "E0009"]
+
+
+def test_export_since_overrides_watermark(tmp_path: Path) -> None:
+    s = GuiStore(base_dir=tmp_path / "store")
+    _seed(s, 3)
+
+    res = export_handoffs(s, tmp_path / "inbox", since_ev_id="E0004")
+
+    assert res.exported == ["E0006", "E0009"]
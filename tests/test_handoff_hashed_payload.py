@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+
+from app.core import telemetry
+from app.validation.canonical import HashedPayload, compute_payload_sha256, verify_payload_sha256
+from app.validation.schema_validation import (
+    SHA_TELEMETRY,
+    SchemaValidationError,
+    _enforce_sha_policy,
+    payload_sha_is_accepted,
+)
+
+
+def _body() -> dict:
+    return {
+        "contract": "run_handoff/1.0",
+        "created_utc": "2026-01-01T00:00:00+00:00",
+        "plan_ev_id": "E0001",
+        "approval_ev_id": "E0002",
+        "runner_label": "R",
+        "required_gates": ["g"],
+        "commands": ["c1", "c2"],
+        "statements": ["s"],
+        "notes": "n",
+    }
+
+
+def test_hashed_payload_digest_matches_canonical() -> None:
+    h = HashedPayload.from_payload(_body())
+    assert h.sha256 == compute_payload_sha256(_body())
+
+    payload = h.with_sha()
+    assert payload["payload_sha256"] == h.sha256
+    assert verify_payload_sha256(payload) is True
+    assert payload_sha_is_accepted(payload, h.sha256)
+
+
+def test_hashed_payload_rejects_sha_in_input() -> None:
+    with pytest.raises(ValueError):
+        HashedPayload.from_payload(dict(_body(), payload_sha256="0" * 64))
+
+
+def test_hashed_payload_describes_only_exact_payload() -> None:
+    h = HashedPayload.from_payload(_body())
+    assert h.describes(h.with_sha())
+
+    assert not h.describes(dict(h.with_sha(), runner_label="MUTATED"))
+    assert not h.describes(dict(h.with_sha(), payload_sha256="0" * 64))
+    assert not h.describes(dict(h.with_sha(), extra="x"))
+
+
+def test_sha_policy_falls_back_when_hashed_does_not_describe_payload() -> None:
+    h = HashedPayload.from_payload(_body())
+    tampered = dict(h.with_sha(), runner_label="MUTATED")
+
+    with pytest.raises(SchemaValidationError):
+        _enforce_sha_policy(tampered, h)
+
+    _enforce_sha_policy(h.with_sha(), h)
+
+
+def test_hashed_payload_is_isolated_from_caller_dicts() -> None:
+    src = _body()
+    h = HashedPayload.from_payload(src)
+
+    src["payload_sha256"] = h.sha256
+    src["commands"].append("c3")
+    payload = h.with_sha()
+    payload["statements"] = ["replaced later"]
+
+    assert h.body == _body() and h.sha256 == compute_payload_sha256(_body())
+    assert h.describes(h.with_sha())
+    assert not h.describes(src) and not h.describes(payload)
+
+
+def test_only_hashed_payloads_from_from_payload_are_trusted() -> None:
+    forged = HashedPayload(body=_body(), sha256="0" * 64)
+    payload = forged.with_sha()
+    assert not forged.describes(payload)
+    with pytest.raises(SchemaValidationError, match="mismatch"):
+        _enforce_sha_policy(payload, forged)
+
+    h = HashedPayload.from_payload(_body())
+    swapped = dataclasses.replace(h, body=dict(_body(), runner_label="OTHER"))
+    assert h.describes(h.with_sha()) and not swapped.describes(swapped.with_sha())
+
+
+def test_carried_digest_is_counted_as_compact_variant() -> None:
+    h = HashedPayload.from_payload(_body())
+    counters = telemetry.counters(SHA_TELEMETRY)
+    counters.discard()
+    _enforce_sha_policy(h.with_sha(), h)
+    assert counters.pending().get("compact") == 1
@@ -0,0 +1,144 @@
+import json
+from pathlib import Path
+from typing import Callable, List
+
+import httpx
+import pytest
+
+from app.core import telemetry
+from app.core.types.messages import ChatMessage, Role
+from app.engine import inference_telemetry as it
+from app.engine.engine import Engine, EngineConfig
+from app.engine.providers.ollama import OllamaConfig, OllamaProvider
+
+HOST = "http://ollama.test"
+METRICS = {
+    "total_duration": 3_000_000_000,
+    "load_duration": 1_000_000_000,
+    "prompt_eval_count": 400,
+    "prompt_eval_duration": 500_000_000,
+    "eval_count": 150,
+    "eval_duration": 1_500_000_000,
+    "done_reason": "stop",
+}
+
+
+@pytest.fixture
+def log(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mock_ollama: Callable[..., object]
+) -> Path:
+    monkeypatch.delenv(it.INFERENCE_TELEMETRY_ENV, raising=False)
+    monkeypatch.setenv(telemetry.TELEMETRY_DIR_ENV, str(tmp_path))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if body["stream"]:
+            lines = [
+                {"message": {"content": "hi"}, "done": False},
+                {"done": True, "model": body["model"], **METRICS},
+            ]
+            return httpx.Response(
+                200, content="".join(json.dumps(x) + "\n" for x in lines).encode()
+            )
+        return httpx.Response(
+            200, json={"message": {"content": "hi"}, "model": body["model"], **METRICS}
+        )
+
+    mock_ollama(handler)
+    return tmp_path / "inference.jsonl"
+
+
+def _records(path: Path) -> List[dict]:
+    return list(telemetry.read_jsonl(path))
+
+
+def test_engine_records_each_request(log: Path) -> None:
+    engine = Engine(EngineConfig(ollama_host=HOST, ollama_model="m"))
+    engine.send_user("a")
+    engine.send_user("b", on_token=lambda _d: None)
+
+    plain, streamed = _records(log)
+    assert plain["source"] == "engine" and plain["model"] == "m" and plain["host"] == HOST
+    assert plain["stream"] is False and streamed["stream"] is True
+    for rec in (plain, streamed):
+        assert rec["total_s"] == 3.0 and rec["load_s"] == 1.0
+        assert rec["prompt_eval_count"] == 400 and rec["prompt_eval_s"] == 0.5
+        assert rec["eval_count"] == 150 and rec["eval_s"] == 1.5
+        assert rec["attempts"] == 1 and rec["wall_s"] >= 0 and rec["done_reason"] == "stop"
+
+
+def test_provider_records_and_missing_fields_are_null(log: Path) -> None:
+    p = OllamaProvider(OllamaConfig(host=HOST, model="p"))
+    p.chat([ChatMessage(id="m1", role=Role.user, content="x")])
+    (rec,) = _records(log)
+    assert rec["source"] == "provider" and rec["eval_count"] == 150
+
+    partial = it.inference_record(
+        {"eval_count": True}, model="m", host=HOST, source="t", stream=False, wall_seconds=0.1
+    )
+    assert partial["eval_count"] is None and partial["total_s"] is None
+
+
+def test_recording_can_be_turned_off(log: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(it.INFERENCE_TELEMETRY_ENV, "0")
+    Engine(EngineConfig(ollama_host=HOST)).send_user("a")
+    assert not log.exists()
+
+
+def test_percentile() -> None:
+    assert it.percentile([], 50) is None
+    assert it.percentile([5.0], 99) == 5.0
+    assert it.percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert it.percentile(list(map(float, range(101))), 90) == 90.0
+
+
+def _rec(model: str, load: float, eval_count: int = 100, eval_s: float = 2.0) -> dict:
+    return {
+        "ts": "2026-01-01T00:00:00+00:00",
+        "model": model,
+        "wall_s": load + 1.0 + eval_s,
+        "total_s": load + 1.0 + eval_s,
+        "load_s": load,
+        "prompt_eval_count": 500,
+        "prompt_eval_s": 1.0,
+        "eval_count": eval_count,
+        "eval_s": eval_s,
+    }
+
+
+def test_summarize_per_model() -> None:
+    records = [
+        _rec("big", 8.0),
+        _rec("big", 0.0),
+        _rec("big", 0.0, eval_count=200),
+        _rec("tiny", 0.0),
+    ]
+    big, tiny = it.summarize(records)
+
+    assert (big.model, big.requests, big.cold_loads) == ("big", 3, 1)
+    assert big.gen_tokens_per_s.p50 == 50.0 and big.gen_tokens_per_s.n == 3
+    assert big.prompt_tokens_per_s.p50 == 500.0 and big.prompt_eval_s.p90 == 1.0
+    assert big.load_s.p99 == pytest.approx(7.84)
+    assert big.share == {"load": 0.471, "prompt_eval": 0.176, "eval": 0.353, "other": 0.0}
+    assert tiny.requests == 1
+
+    assert [s.model for s in it.summarize(records, model="tiny")] == ["tiny"]
+    assert it.summarize(records, since="2027") == []
+
+
+def test_cli_table_and_json(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    path = tmp_path / "inference.jsonl"
+    path.write_text(
+        "\n".join(json.dumps(_rec("big", 0.0)) for _ in range(3)) + "\nnot json\n", encoding="utf-8"
+    )
+
+    assert it.main(["--path", str(path)]) == 0
+    table = capsys.readouterr().out
+    assert "gen tok/s" in table and "big" in table and "50.0/50.0/50.0" in table
+
+    assert it.main(["--path", str(path), "--json"]) == 0
+    (summary,) = json.loads(capsys.readouterr().out)
+    assert summary["requests"] == 3 and summary["gen_tokens_per_s"]["p50"] == 50.0
+
+    it.main(["--path", str(tmp_path / "missing.jsonl")])
+    assert capsys.readouterr().out.strip() == "no inference records"
@@ -0,0 +1,124 @@
+import asyncio
+import json
+from typing import Callable, Dict
+
+import httpx
+import pytest
+
+from app.core.config import AppConfig
+from app.engine.actions import accept_engineer_payload
+from app.engine.engine import Engine, EngineConfig
+from app.engine.fanout import fan_out
+
+HOST = "http://ollama.test"
+VALID = json.dumps(
+    {
+        "final_message": "done",
+        "actions": [{"type": "file_write", "path": "a.py", "content": "x = 1\n"}],
+    }
+)
+
+
+@pytest.fixture
+def models(mock_ollama: Callable[..., object]) -> Dict[str, dict]:
+    """model name -> {"delay": seconds, "reply": text}; records "started"/"finished"."""
+    table: Dict[str, dict] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        spec = table[json.loads(request.content)["model"]]
+        spec["started"] = True
+        await asyncio.sleep(spec["delay"])
+        spec["finished"] = True
+        return httpx.Response(200, json={"message": {"content": spec["reply"]}})
+
+    mock_ollama(handler, async_=True)
+    return table
+
+
+def _engine() -> Engine:
+    return Engine(EngineConfig(ollama_host=HOST, ollama_model="big"))
+
+
+def test_fast_invalid_model_loses_to_slower_valid_one(models: Dict[str, dict]) -> None:
+    models["tiny"] = {"delay": 0.01, "reply": "Sure! Here is the file: ```a.py```"}
+    models["small"] = {"delay": 0.05, "reply": VALID}
+    models["big"] = {"delay": 5.0, "reply": VALID}
+    engine = _engine()
+
+    result = fan_out(engine, "write a.py", ["big", "tiny", "small"])
+
+    assert result.ok and result.model == "small" and result.reply == VALID
+    assert result.seconds < 2.0
+    big, tiny, small = result.attempts
+    assert tiny.model == "tiny" and not tiny.ok and tiny.error == "reply rejected"
+    assert small.ok and small.seconds == result.seconds
+    assert big.cancelled and models["big"]["started"] and "finished" not in models["big"]
+    assert engine._messages[1:] == [
+        {"role": "user", "content": "write a.py"},
+        {"role": "assistant", "content": VALID},
+    ]
+
+
+def test_history_is_forked_per_model(models: Dict[str, dict]) -> None:
+    models["big"] = {"delay": 0.0, "reply": VALID}
+    engine = _engine()
+    engine.record_turn("earlier", "answer")
+
+    fork = engine.fork_async("other")
+
+    assert fork.config.ollama_model == "other" and engine.config.ollama_model == "big"
+    assert fork._messages == engine._messages and fork._messages is not engine._messages
+
+
+def test_no_valid_reply_leaves_history_unchanged(models: Dict[str, dict]) -> None:
+    models["big"] = {"delay": 0.01, "reply": '{"actions": [{"type": "shell", "cmd": "rm -rf /"}]}'}
+    models["tiny"] = {"delay": 0.01, "reply": "not json"}
+    engine = _engine()
+    before = list(engine._messages)
+
+    result = fan_out(engine, "hi", ["big", "tiny", "big", " "])
+
+    assert not result.ok and result.model is None
+    assert [a.model for a in result.attempts] == ["big", "tiny"]
+    assert all(a.error == "reply rejected" for a in result.attempts)
+    assert engine._messages == before
+
+
+def test_deadline_cancels_every_model(models: Dict[str, dict]) -> None:
+    models["big"] = {"delay": 5.0, "reply": VALID}
+    models["small"] = {"delay": 5.0, "reply": VALID}
+
+    result = fan_out(_engine(), "hi", ["big", "small"], deadline=0.05)
+
+    assert not result.ok and result.seconds < 2.0
+    assert all(a.cancelled and "deadline" in (a.error or "") for a in result.attempts)
+
+
+def test_poll_exception_stops_the_race(models: Dict[str, dict]) -> None:
+    models["big"] = {"delay": 5.0, "reply": VALID}
+
+    def stop() -> None:
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        fan_out(_engine(), "hi", ["big"], poll=stop)
+    assert "finished" not in models["big"]
+
+
+def test_accept_engineer_payload_whitelist() -> None:
+    assert accept_engineer_payload(VALID) is not None
+    assert accept_engineer_payload('{"actions": []}') is not None
+    assert accept_engineer_payload("plain text") is None
+    assert accept_engineer_payload('{"actions": [{"type": "exec"}]}') is None
+    assert (
+        accept_engineer_payload('{"actions": [{"type": "file_write", "path": "", "content": "x"}]}')
+        is None
+    )
+    assert accept_engineer_payload('{"actions": [{"type": "file_write", "path": "a.py"}]}') is None
+
+
+def test_app_config_fanout_models_round_trip() -> None:
+    assert AppConfig.from_dict({}).fanout_models == ()
+    assert AppConfig.from_dict({"fanout_models": "a, b,,a"}).fanout_models == ("a", "b")
+    cfg = AppConfig(fanout_models=("qwen2.5-coder:1.5b", "llama3.2:3b"))
+    assert AppConfig.from_dict(cfg.to_dict()) == cfg
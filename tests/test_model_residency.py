@@ -0,0 +1,96 @@
+import json
+from typing import Callable, List
+
+import httpx
+import pytest
+
+from app.core.config import AppConfig
+from app.core.types.messages import ChatMessage, Role
+from app.engine.engine import Engine, EngineConfig
+from app.engine.providers.ollama import OllamaConfig, OllamaProvider
+from app.engine.residency import keep_alive_value, preload_model
+
+HOST = "http://ollama.test"
+
+
+@pytest.fixture
+def bodies(mock_ollama: Callable[..., object]) -> List[dict]:
+    seen: List[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/ps":
+            return httpx.Response(200, json={"models": [{"name": "resident:latest"}]})
+        body = json.loads(request.content)
+        seen.append({"path": request.url.path, **body})
+        if request.url.path == "/api/generate":
+            unloading = body.get("keep_alive") == 0
+            return httpx.Response(
+                200,
+                json={
+                    "model": body["model"],
+                    "done": True,
+                    "done_reason": "unload" if unloading else "load",
+                    "load_duration": 0 if unloading else 2_500_000_000,
+                },
+            )
+        return httpx.Response(200, json={"message": {"content": "ok"}})
+
+    mock_ollama(handler)
+    return seen
+
+
+def test_keep_alive_value() -> None:
+    assert keep_alive_value("") is None and keep_alive_value(None) is None
+    assert keep_alive_value(" -1 ") == -1 and keep_alive_value("600") == 600
+    assert keep_alive_value("30m") == "30m" and keep_alive_value(0) == 0
+
+
+def test_engine_preload_unload_and_keep_alive(bodies: List[dict]) -> None:
+    engine = Engine(EngineConfig(ollama_host=HOST, ollama_model="m", keep_alive="-1"))
+
+    loaded = engine.preload()
+    engine.send_user("hi")
+    unloaded = engine.unload()
+
+    assert (
+        loaded.ok and loaded.model == "m" and loaded.load_seconds == 2.5 and loaded.detail == "load"
+    )
+    assert unloaded.ok and unloaded.detail == "unload"
+    gen, chat, evict = bodies
+    assert gen == {"path": "/api/generate", "model": "m", "keep_alive": -1}
+    assert chat["path"] == "/api/chat" and chat["keep_alive"] == -1
+    assert evict == {"path": "/api/generate", "model": "m", "keep_alive": 0}
+
+
+def test_server_default_keep_alive_is_not_sent(bodies: List[dict]) -> None:
+    Engine(EngineConfig(ollama_host=HOST, keep_alive="")).send_user("hi")
+    assert "keep_alive" not in bodies[0]
+    assert Engine(EngineConfig(ollama_host=HOST)).config.keep_alive == "30m"
+
+
+def test_is_resident(bodies: List[dict]) -> None:
+    assert Engine(EngineConfig(ollama_host=HOST, ollama_model="resident")).is_resident()
+    assert not Engine(EngineConfig(ollama_host=HOST, ollama_model="other")).is_resident()
+
+
+def test_provider_residency(bodies: List[dict]) -> None:
+    p = OllamaProvider(OllamaConfig(host=HOST, model="m", keep_alive="2h"))
+    assert p.preload().ok
+    p.chat([ChatMessage(id="1", role=Role.user, content="x")])
+    assert p.unload().ok
+    assert [b.get("keep_alive") for b in bodies] == ["2h", "2h", 0]
+
+
+def test_unreachable_server_reports_failure() -> None:
+    def down(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused", request=request)
+
+    client = httpx.Client(transport=httpx.MockTransport(down))
+    res = preload_model(HOST, "m", client=client)
+    assert not res.ok and "refused" in res.detail
+
+
+def test_app_config_keep_alive_round_trip() -> None:
+    assert AppConfig.from_dict({}).ollama_keep_alive == "30m"
+    cfg = AppConfig(ollama_keep_alive="")
+    assert AppConfig.from_dict(cfg.to_dict()) == cfg
@@ -0,0 +1,76 @@
+import json
+from pathlib import Path
+
+from app.gui.planner import make_run_plans, persist_plan_batch
+from app.gui.store import GuiStore
+from app.validation.schema_validation import validate_payload
+
+
+def _tasks(n: int) -> list[tuple[str, str, str]]:
+    return [(f"T{i:04d}", f"task {i}", f"n{i}") for i in range(1, n + 1)]
+
+
+def test_plan_batch_plans_only(tmp_path: Path) -> None:
+    s = GuiStore(base_dir=tmp_path)
+
+    res = persist_plan_batch(s, make_run_plans(_tasks(3)))
+
+    ev = s.read_evidence()
+    assert [e.ev_id for e in ev] == ["E0001", "E0002", "E0003"]
+    assert all(e.kind == "RUN_PLAN" for e in ev)
+    assert [r.ev_id for r in res.plans] == ["E0001", "E0002", "E0003"]
+    assert res.approvals == [] and res.handoffs == []
+
+
+def test_plan_batch_full_pipeline_interleaves_records(tmp_path: Path) -> None:
+    s = GuiStore(base_dir=tmp_path)
+
+    res = persist_plan_batch(
+        s,
+        make_run_plans(_tasks(2)),
+        reviewer="Michael A. Trosen",
+        decision="APPROVED",
+        runner_label="BATCH_RUNNER",
+        handoff_notes="batch",
+    )
+
+    ev = s.read_evidence()
+    assert [e.kind for e in ev] == [
+        "RUN_PLAN",
+        "RUN_PLAN_APPROVAL",
+        "RUN_HANDOFF",
+        "RUN_PLAN",
+        "RUN_PLAN_APPROVAL",
+        "RUN_HANDOFF",
+    ]
+    assert [e.ev_id for e in ev] == [f"E{i:04d}" for i in range(1, 7)]
+
+    for plan_rec, appr_rec, ho_rec in zip(res.plans, res.approvals, res.handoffs):
+        assert json.loads(appr_rec.body)["plan_ev_id"] == plan_rec.ev_id
+        ho = json.loads(ho_rec.body)
+        assert ho["plan_ev_id"] == plan_rec.ev_id
+        assert ho["approval_ev_id"] == appr_rec.ev_id
+        assert ho["runner_label"] == "BATCH_RUNNER"
+        validate_payload(ho)
+
+
+def test_plan_batch_rejected_emits_no_handoffs(tmp_path: Path) -> None:
+    s = GuiStore(base_dir=tmp_path)
+
+    res = persist_plan_batch(
+        s, make_run_plans(_tasks(2)), reviewer="r", decision="REJECTED", runner_label="X"
+    )
+
+    assert len(res.approvals) == 2
+    assert res.handoffs == []
+    assert len(s.read_evidence()) == 4
+
+
+def test_plan_batch_continues_existing_id_sequence(tmp_path: Path) -> None:
+    s = GuiStore(base_dir=tmp_path)
+    persist_plan_batch(s, make_run_plans(_tasks(1)))
+
+    res = persist_plan_batch(s, make_run_plans(_tasks(1)), reviewer="r")
+
+    assert [r.ev_id for r in res.plans] == ["E0002"]
+    assert [r.ev_id for r in res.approvals] == ["E0003"]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.gui import planner
+
+IMPORT_BUDGET_SECONDS = 2.0
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+def _run(capsys, *argv: str) -> object:
+    rc = planner.main(list(argv))
+    out = capsys.readouterr().out
+    assert rc == 0, out
+    return json.loads(out)
+
+
+def test_planner_cli_never_imports_qt_and_stays_within_budget() -> None:
+    code = r"""
+import sys, time
+t0 = time.perf_counter()
+import app.gui.planner  # noqa: F401
+dt = time.perf_counter() - t0
+heavy = sorted(m for m in ("PySide6", "shiboken6", "httpx", "app.gui.main") if m in sys.modules)
+print(f"{dt:.4f} {','.join(heavy)}")
+"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(_repo_root())] + [p for p in sys.path if p])
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=str(_repo_root()),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    assert len(out) == 1, f"heavy modules imported: {out[1:]}"
+    assert float(out[0]) < IMPORT_BUDGET_SECONDS
+
+
+def test_planner_cli_plan_approve_handoff_list(tmp_path: Path, capsys) -> None:
+    root = str(tmp_path)
+    plan = _run(capsys, "--root", root, "create-plan", "--task-id", "T0001", "--title", "do thing")
+    assert plan["kind"] == "RUN_PLAN"
+    assert plan["body"]["task_id"] == "T0001"
+
+    appr = _run(capsys, "--root", root, "approve", "--plan", plan["ev_id"], "--reviewer", "r")
+    assert appr["body"]["decision"] == "APPROVED"
+
+    ho = _run(capsys, "--root", root, "handoff", "--plan", plan["ev_id"], "--runner", "CLI")
+    assert ho["kind"] == "RUN_HANDOFF"
+    assert ho["body"]["approval_ev_id"] == appr["ev_id"]
+
+    listed = _run(capsys, "--root", root, "list", "--kind", "RUN_HANDOFF")
+    assert [r["ev_id"] for r in listed] == [ho["ev_id"]]
+
+
+def test_planner_cli_json_input_batch_and_clone(tmp_path: Path, capsys, monkeypatch) -> None:
+    root = str(tmp_path)
+    tasks = [{"task_id": "T0001", "task_title": "a"}, {"task_id": "T0002", "task_title": "b"}]
+    monkeypatch.setattr(sys, "stdin", io.StringIO(json.dumps(tasks)))
+    plans = _run(capsys, "--root", root, "create-plan", "--json", "-")
+    assert [p["ev_id"] for p in plans] == ["E0001", "E0002"]
+
+    req = tmp_path / "clone.json"
+    req.write_text(json.dumps({"plan_ev_id": "E0001", "notes": "v2"}), encoding="utf-8")
+    res = _run(capsys, "--root", root, "clone", "--json", str(req))
+    assert res["plan"]["body"]["supersedes_plan_ev_id"] == "E0001"
+    assert res["superseded"]["kind"] == "RUN_PLAN_SUPERSEDED"
+
+
+def test_planner_cli_errors_are_json_on_stderr(tmp_path: Path, capsys) -> None:
+    rc = planner.main(["--root", str(tmp_path), "handoff", "--plan", "E0042"])
+    assert rc == 2
+    assert "evidence not found" in json.loads(capsys.readouterr().err)["error"]
+
+
+@pytest.mark.parametrize(
+    "tasks", [[{}], [{"task_id": "T0001", "task_title": "a"}, {"task_id": "T0002"}], ["T0001"]]
+)
+def test_planner_cli_batch_rejects_incomplete_items(
+    tmp_path: Path, capsys, monkeypatch, tasks
+) -> None:
+    monkeypatch.setattr(sys, "stdin", io.StringIO(json.dumps(tasks)))
+    rc = planner.main(["--root", str(tmp_path), "create-plan", "--json", "-"])
+    assert rc == 2
+    assert "requires task_id and task_title" in json.loads(capsys.readouterr().err)["error"]
+    assert _run(capsys, "--root", str(tmp_path), "list") == []
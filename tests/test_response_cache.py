@@ -0,0 +1,129 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Callable, Iterator, List
+
+import httpx
+import pytest
+
+from app.core.types.messages import ChatMessage, Role
+from app.engine import response_cache as rc
+from app.engine.providers.ollama import OllamaConfig, OllamaProvider
+
+HOST = "http://ollama.test"
+
+
+@pytest.fixture
+def calls(tmp_path: Path, mock_ollama: Callable[..., object]) -> Iterator[List[dict]]:
+    seen: List[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        seen.append(body)
+        text = f"reply {len(seen)}"
+        if body["stream"]:
+            lines = [{"message": {"content": text}, "done": False}, {"done": True, "eval_count": 2}]
+            return httpx.Response(
+                200, content="".join(json.dumps(x) + "\n" for x in lines).encode()
+            )
+        return httpx.Response(200, json={"message": {"content": text}, "eval_count": 2})
+
+    mock_ollama(handler)
+    mock_ollama(handler, async_=True)
+    rc.configure_response_cache(root=tmp_path / "rcache")
+    try:
+        yield seen
+    finally:
+        rc.reset_response_cache()
+
+
+def _msgs(text: str, mid: str = "m1") -> List[ChatMessage]:
+    return [ChatMessage(id=mid, role=Role.user, content=text)]
+
+
+def test_deterministic_requests_replay_from_disk(calls: List[dict], tmp_path: Path) -> None:
+    p = OllamaProvider(OllamaConfig(host=HOST, model="m"))
+
+    first = p.chat(_msgs("hello"), seed=7)
+    # different id / trailing whitespace / CRLF normalize to the same key
+    again = p.chat(_msgs("hello \r\n", mid="other"), seed=7)
+
+    assert first[0] == again[0] == "reply 1"
+    assert first[1]["cached"] is False and again[1]["cached"] is True
+    assert again[1]["raw"]["eval_count"] == 2
+    assert len(calls) == 1
+    assert list((tmp_path / "rcache").glob("*/*.json"))
+
+
+def test_key_covers_model_options_and_messages(calls: List[dict]) -> None:
+    p = OllamaProvider(OllamaConfig(host=HOST, model="m"))
+    p.chat(_msgs("hello"), seed=7)
+    p.chat(_msgs("hello"), seed=8)
+    p.chat(_msgs("hello"), seed=7, top_p=0.5)
+    p.chat(_msgs("bye"), seed=7)
+    OllamaProvider(OllamaConfig(host=HOST, model="other")).chat(_msgs("hello"), seed=7)
+    assert len(calls) == 5
+
+
+def test_nondeterministic_and_bypass_go_to_model(calls: List[dict]) -> None:
+    p = OllamaProvider(OllamaConfig(host=HOST, model="m"))
+    p.chat(_msgs("hi"))
+    p.chat(_msgs("hi"))
+    assert len(calls) == 2
+
+    p.chat(_msgs("hi"), temperature=0.0)
+    p.chat(_msgs("hi"), temperature=0.0)
+    assert len(calls) == 3
+    text, meta = p.chat(_msgs("hi"), temperature=0.0, use_cache=False)
+    assert len(calls) == 4 and meta["cached"] is False and text == "reply 4"
+
+
+def test_streaming_and_async_share_entries(calls: List[dict]) -> None:
+    p = OllamaProvider(OllamaConfig(host=HOST, model="m"))
+    got: List[str] = []
+
+    streamed = p.chat(_msgs("s"), seed=1, on_token=got.append)
+    replay = p.chat(_msgs("s"), seed=1, on_token=got.append)
+    async_replay = asyncio.run(p.achat(_msgs("s"), seed=1))
+
+    assert streamed[0] == replay[0] == async_replay[0] == "reply 1"
+    assert got == ["reply 1", "reply 1"]
+    assert replay[1]["cached"] and async_replay[1]["cached"] and len(calls) == 1
+
+
+def test_disabled_cache_is_not_consulted(calls: List[dict]) -> None:
+    rc.configure_response_cache(enabled=False)
+    p = OllamaProvider(OllamaConfig(host=HOST, model="m"))
+    p.chat(_msgs("x"), seed=1)
+    p.chat(_msgs("x"), seed=1)
+    assert len(calls) == 2
+
+
+def test_size_bounded_lru_eviction(tmp_path: Path) -> None:
+    cache = rc.ResponseCache(tmp_path / "c", max_bytes=700)
+    entry = rc.CachedResponse(text="x" * 200, raw={})
+    for i, key in enumerate(["a1", "b2", "c3"]):
+        cache.put(key * 32, entry)
+        os.utime(cache._path(key * 32), (1000 + i, 1000 + i))
+        cache._index[key * 32] = (cache._index[key * 32][0], 1000 + i)
+    assert cache.get("a1" * 32) is not None  # refresh the oldest
+
+    cache.put("d4" * 32, entry)
+
+    assert cache.get("b2" * 32) is None  # least recently used went first
+    assert cache.get("a1" * 32) is not None and cache.get("d4" * 32) is not None
+    assert cache.total_bytes <= 700
+    # a fresh instance rebuilds its index from disk
+    assert len(rc.ResponseCache(tmp_path / "c", max_bytes=700)) == len(cache) == 3
+
+
+def test_env_enables_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(rc.RESPONSE_CACHE_ENV, "1")
+    monkeypatch.setenv(rc.RESPONSE_CACHE_DIR_ENV, str(tmp_path / "envcache"))
+    rc.reset_response_cache()
+    try:
+        cache = rc.active_response_cache()
+        assert cache is not None and cache.root == tmp_path / "envcache"
+    finally:
+        rc.reset_response_cache()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from app.validation import schema_catalog as sc
+
+_DRAFT = "https://json-schema.org/draft/2020-12/schema"
+
+
+def _write(p: Path, doc: dict) -> Path:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(json.dumps(doc), encoding="utf-8")
+    return p
+
+
+@pytest.fixture()
+def tree(tmp_path: Path) -> Path:
+    sc.clear_catalog_cache()
+    root = tmp_path / "schemas"
+    _write(
+        root / "run_handoff" / "1.0.schema.json",
+        {"$schema": _DRAFT, "title": "RUN_HANDOFF Contract"},
+    )
+    _write(root / "runplan-1.0.schema.json", {"$schema": _DRAFT, "title": "runplan/1.0"})
+    _write(
+        root / "misc" / "approval.json",
+        {"$schema": _DRAFT, "$id": "https://x/runplan_approval/1.0"},
+    )
+    yield root
+    sc.clear_catalog_cache()
+
+
+def test_catalog_maps_titles_and_ids(tree: Path, tmp_path: Path) -> None:
+    out = tmp_path / "catalog"
+    assert (
+        sc.lookup_schema_path("runplan/1.0", tree, out)
+        == (tree / "runplan-1.0.schema.json").resolve()
+    )
+    assert (
+        sc.lookup_schema_path("runplan_approval/1.0", tree, out)
+        == (tree / "misc" / "approval.json").resolve()
+    )
+    assert (
+        sc.lookup_schema_path("RUN_HANDOFF Contract", tree, out)
+        == (tree / "run_handoff" / "1.0.schema.json").resolve()
+    )
+    # The file layout alone never resolves a contract (the full scan does not either).
+    assert sc.lookup_schema_path("run_handoff/1.0", tree, out) is None
+    assert sc.lookup_schema_path("nope/9.9", tree, out) is None
+
+    cat = json.loads(sc.catalog_path(tree, out).read_text(encoding="utf-8"))
+    assert cat["schema_root"] == str(tree.resolve())
+    assert all(len(e["sha256"]) == 64 for e in cat["entries"])
+
+
+def test_catalog_is_served_without_reparsing(tree: Path, tmp_path: Path, monkeypatch) -> None:
+    out = tmp_path / "catalog"
+    sc.load_catalog(tree, out)
+
+    def _boom(_root):
+        raise AssertionError("catalog rebuilt although tree is unchanged")
+
+    monkeypatch.setattr(sc, "build_catalog", _boom)
+    assert sc.lookup_schema_path("runplan/1.0", tree, out) is not None
+
+    sc.clear_catalog_cache()  # fresh process: on-disk manifest is reused
+    assert sc.lookup_schema_path("runplan/1.0", tree, out) is not None
+
+
+def test_catalog_rebuilds_when_tree_changes(tree: Path, tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv(sc.FINGERPRINT_TTL_ENV, "0")
+    out = tmp_path / "catalog"
+    assert sc.lookup_schema_path("added/2.0", tree, out) is None
+
+    p = _write(tree / "added" / "2.0.schema.json", {"$schema": _DRAFT, "title": "added/2.0"})
+    st = p.stat()
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000_000))
+
+    assert sc.lookup_schema_path("added/2.0", tree, out) == p.resolve()
+
+
+def test_fingerprint_is_reused_within_ttl(tree: Path, monkeypatch) -> None:
+    monkeypatch.setenv(sc.FINGERPRINT_TTL_ENV, "60")
+    first = sc.current_tree_fingerprint(tree)
+    walk = sc.schema_tree_fingerprint
+
+    def _boom(_root):
+        raise AssertionError("tree walked again within the TTL")
+
+    monkeypatch.setattr(sc, "schema_tree_fingerprint", _boom)
+    assert sc.current_tree_fingerprint(tree) == first
+
+    monkeypatch.setattr(sc, "schema_tree_fingerprint", walk)
+    _write(tree / "added" / "2.0.schema.json", {"$schema": _DRAFT})
+    assert sc.current_tree_fingerprint(tree) == first  # edit not seen yet
+    sc.clear_fingerprint_cache()
+    assert sc.current_tree_fingerprint(tree)[0] == first[0] + 1
+
+
+@pytest.mark.parametrize(
+    "contract",
+    [
+        "runplan/1.0",
+        "runplan_approval/1.0",
+        "RUN_HANDOFF Contract",
+        "run_handoff/1.0",
+        "1.0",
+        "nope/9.9",
+    ],
+)
+def test_catalog_agrees_with_full_scan(
+    tree: Path, tmp_path: Path, monkeypatch, contract: str
+) -> None:
+    from app.validation import vendor_schema_loader as vsl
+
+    hit = sc.lookup_schema_path(contract, tree, tmp_path / "catalog")
+    monkeypatch.setattr(vsl, "lookup_schema_path", lambda *_a, **_k: None)
+    try:
+        scanned = vsl._resolve_schema_path(contract, tree.resolve())
+    except FileNotFoundError:
+        scanned = None
+    assert hit == scanned
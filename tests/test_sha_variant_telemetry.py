@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.core import telemetry
+from app.validation import schema_validation as sv
+
+
+def _body() -> dict:
+    return {"alpha": 1, "beta": {"x": True, "y": "z"}}
+
+
+@pytest.fixture()
+def tel_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv(telemetry.TELEMETRY_DIR_ENV, str(tmp_path))
+    telemetry.counters(sv.SHA_TELEMETRY).discard()
+    return tmp_path
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def test_matching_variant_names() -> None:
+    body = _body()
+    compact = json.dumps(body, separators=(",", ":"), sort_keys=True)
+    pretty = json.dumps(body, indent=2, sort_keys=True) + "\n"
+
+    assert sv.matching_sha_variant(body, _sha(compact + "\n")) == "canonical"
+    assert sv.matching_sha_variant(body, _sha(compact)) == "compact"
+    assert sv.matching_sha_variant(body, _sha(pretty)) == "pretty_lf"
+    assert sv.matching_sha_variant(body, _sha(pretty.replace("\n", "\r\n"))) == "pretty_crlf"
+    assert sv.matching_sha_variant(body, "00" * 32) is None
+    assert sv._legacy_sha_variants(body) == [
+        _sha(compact + "\n"),
+        _sha(compact),
+        _sha(pretty),
+        _sha(pretty.replace("\n", "\r\n")),
+    ]
+
+
+def test_canonical_match_skips_legacy_serialization(
+    monkeypatch: pytest.MonkeyPatch, tel_dir: Path
+) -> None:
+    def _boom(*a, **k):
+        raise AssertionError("pretty variants built for a canonical digest")
+
+    sha = sv.compute_payload_sha256(_body())
+    monkeypatch.setattr(sv, "json_sha256_hex", _boom)
+    assert sv.payload_sha_is_accepted(_body(), sha)
+
+
+def test_variant_counters_are_persisted(tel_dir: Path) -> None:
+    body = _body()
+    pretty = json.dumps(body, indent=2, sort_keys=True) + "\n"
+
+    assert sv.payload_sha_is_accepted(body, sv.compute_payload_sha256(body))
+    assert sv.payload_sha_is_accepted(body, sv.compute_payload_sha256(body))
+    assert sv.payload_sha_is_accepted(body, _sha(pretty))
+    assert not sv.payload_sha_is_accepted(body, "00" * 32)
+    telemetry.counters(sv.SHA_TELEMETRY).flush()
+    assert sv.payload_sha_is_accepted(body, _sha(pretty))
+    telemetry.counters(sv.SHA_TELEMETRY).flush()
+
+    assert telemetry.load_counters(sv.SHA_TELEMETRY) == {
+        "canonical": 2,
+        "pretty_lf": 2,
+        "mismatch": 1,
+    }
+    doc = json.loads((tel_dir / f"{sv.SHA_TELEMETRY}.json").read_text(encoding="utf-8"))
+    assert doc["name"] == sv.SHA_TELEMETRY
+
+
+def test_concurrent_process_flushes_keep_every_increment(tel_dir: Path) -> None:
+    code = (
+        "from app.core import telemetry\n"
+        "c = telemetry.Counters('shared', flush_every=1)\n"
+        "for _ in range(40):\n"
+        "    c.incr('hits')\n"
+    )
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join([str(Path(__file__).resolve().parents[1])] + sys.path),
+    )
+    env[telemetry.TELEMETRY_DIR_ENV] = str(tel_dir)
+    procs = [subprocess.Popen([sys.executable, "-c", code], env=env) for _ in range(4)]
+    assert [p.wait(timeout=60) for p in procs] == [0, 0, 0, 0]
+
+    assert telemetry.load_counters("shared", tel_dir) == {"hits": 160}
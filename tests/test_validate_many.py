@@ -0,0 +1,76 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.gui.handoff_export import export_handoffs
+from app.gui.planner import make_run_plans, persist_plan_batch
+from app.gui.store import GuiStore
+from app.validation import validate_cli
+from app.validation.schema_validation import validate_many, validate_payloads
+
+
+def _handoffs(s: GuiStore, n: int) -> list:
+    tasks = [(f"T{i:04d}", f"task {i}", "") for i in range(1, n + 1)]
+    res = persist_plan_batch(s, make_run_plans(tasks), reviewer="r", runner_label="INBOX")
+    return [json.loads(r.body) for r in res.handoffs]
+
+
+def test_validate_many_reports_per_payload(tmp_path: Path) -> None:
+    good = _handoffs(GuiStore(base_dir=tmp_path), 2)
+    tampered = dict(good[1], notes="changed after hashing")
+
+    res = validate_many([good[0], tampered, "nope"])
+
+    assert [r.index for r in res] == [0, 1, 2]
+    assert [r.ok for r in res] == [True, False, False]
+    assert res[0].contract == good[0]["contract"] and res[0].error is None
+    assert "payload_sha256" in (res[1].error or "")
+    assert res[2].error == "payload must be an object"
+    validate_payloads(good)
+
+
+def test_cli_dir_reports_jsonl(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    s = GuiStore(base_dir=tmp_path / "store")
+    _handoffs(s, 3)
+    inbox = tmp_path / "inbox"
+    export_handoffs(s, inbox)
+    (inbox / "E9999.json").write_text("{not json", encoding="utf-8")
+
+    rc = validate_cli.main(["--dir", str(inbox), "--workers", "1", "--chunk-size", "2"])
+
+    lines = [json.loads(x) for x in capsys.readouterr().out.splitlines()]
+    assert rc == 1
+    assert [Path(x["source"]).name for x in lines] == [
+        "E0003.json",
+        "E0006.json",
+        "E0009.json",
+        "E9999.json",
+    ]
+    assert [x["ok"] for x in lines] == [True, True, True, False]
+    assert lines[-1]["error"].startswith("unreadable JSON")
+
+
+def test_cli_store_process_pool_matches_in_process(
+    tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    s = GuiStore(base_dir=tmp_path)
+    _handoffs(s, 4)
+
+    assert validate_cli.main(["--store", "--root", str(tmp_path), "--workers", "1"]) == 0
+    serial = capsys.readouterr().out
+    assert (
+        validate_cli.main(
+            ["--store", "--root", str(tmp_path), "--workers", "2", "--chunk-size", "1"]
+        )
+        == 0
+    )
+    pooled = capsys.readouterr().out
+
+    assert pooled == serial
+    assert [json.loads(x)["source"] for x in serial.splitlines()] == [
+        "E0003",
+        "E0006",
+        "E0009",
+        "E0012",
+    ]
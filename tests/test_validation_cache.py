@@ -0,0 +1,167 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from app.gui.planner import make_run_plans, persist_plan_batch
+from app.gui.store import GuiStore
+from app.validation import schema_validation as sv
+from app.validation import validate_cli
+from app.validation import vendor_schema_loader as vsl
+from app.validation.canonical import HashedPayload
+from app.validation.validation_cache import (
+    VALIDATION_CACHE_DIR_ENV,
+    VALIDATION_CACHE_ENV,
+    ValidationCache,
+    Verdict,
+    active_validation_cache,
+    configure_validation_cache,
+    reset_validation_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch: pytest.MonkeyPatch):
+    for name in (VALIDATION_CACHE_ENV, VALIDATION_CACHE_DIR_ENV):
+        monkeypatch.delenv(name, raising=False)
+    reset_validation_cache()
+    yield
+    reset_validation_cache()
+
+
+@pytest.fixture()
+def compiles(monkeypatch: pytest.MonkeyPatch) -> list:
+    seen: list = []
+    real = vsl.compile_vendor_validator
+
+    def _counting(contract, schema_root=None):
+        seen.append(contract)
+        return real(contract, schema_root)
+
+    monkeypatch.setattr(vsl, "compile_vendor_validator", _counting)
+    return seen
+
+
+def _handoff(tmp_path: Path) -> dict:
+    plans = make_run_plans([("T1", "t", "")])
+    res = persist_plan_batch(GuiStore(base_dir=tmp_path), plans, reviewer="r", runner_label="R")
+    return json.loads(res.handoffs[0].body)
+
+
+def test_cache_is_off_by_default(tmp_path: Path, compiles: list) -> None:
+    payload = _handoff(tmp_path)
+    compiles.clear()
+
+    assert active_validation_cache() is None
+    sv.validate_payload(payload)
+    sv.validate_payload(payload)
+    assert len(compiles) == 2
+
+
+def test_memory_tier_returns_earlier_verdicts(tmp_path: Path, compiles: list) -> None:
+    payload = _handoff(tmp_path)
+    tampered = dict(payload, notes="edited after hashing")
+    cache = configure_validation_cache(maxsize=8)
+    compiles.clear()
+
+    sv.validate_payload(payload)
+    sv.validate_payload(dict(payload))
+    with pytest.raises(sv.SchemaValidationError, match="payload_sha256") as first:
+        sv.validate_payload(tampered)
+    with pytest.raises(sv.SchemaValidationError) as again:
+        sv.validate_payload(tampered)
+
+    assert str(again.value) == str(first.value)
+    assert len(compiles) == 2
+    assert (cache.hits, cache.misses, len(cache)) == (2, 2, 2)
+    assert sv.validate_many([payload, tampered])[1].error == str(first.value)
+    assert len(compiles) == 2
+
+
+def test_hashed_and_plain_payloads_share_a_key(tmp_path: Path) -> None:
+    payload = _handoff(tmp_path)
+    body = {k: v for k, v in payload.items() if k != "payload_sha256"}
+    cache = ValidationCache()
+
+    assert cache.key_for(payload, "scope") == cache.key_for(
+        payload, "scope", HashedPayload.from_payload(body)
+    )
+    assert cache.key_for(payload, "scope") != cache.key_for(payload, "other scope")
+
+
+def test_schema_change_invalidates(
+    tmp_path: Path, compiles: list, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    payload = _handoff(tmp_path)
+    configure_validation_cache()
+    sv.validate_payload(payload)
+    compiles.clear()
+
+    monkeypatch.setattr(sv, "schema_scope", lambda root: f"{root}|edited")
+    sv.validate_payload(payload)
+    assert len(compiles) == 1
+
+
+def test_wiring_errors_are_not_memoized(tmp_path: Path) -> None:
+    bogus = dict(_handoff(tmp_path), contract="no_such_contract")
+    cache = configure_validation_cache()
+
+    for _ in range(2):
+        with pytest.raises(sv.SchemaValidationError, match="could not resolve schema"):
+            sv.validate_payload(bogus)
+    assert len(cache) == 0
+
+
+def test_disk_tier_is_shared(tmp_path: Path, compiles: list) -> None:
+    payload = _handoff(tmp_path / "store")
+    disk = tmp_path / "vcache"
+    configure_validation_cache(disk_dir=disk)
+    sv.validate_payload(payload)
+    assert len(list(disk.rglob("*.json"))) == 1
+
+    # A fresh process-wide cache (as in another process) reads the verdict from disk.
+    other = configure_validation_cache(disk_dir=disk)
+    compiles.clear()
+    sv.validate_payload(payload)
+    assert compiles == [] and other.hits == 1
+
+    key = next(disk.rglob("*.json")).stem
+    assert ValidationCache(disk_dir=disk).get(key) == Verdict(ok=True)
+
+
+def test_cli_cache_flag_populates_disk_tier(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    plans = make_run_plans([("T1", "a", ""), ("T2", "b", "")])
+    persist_plan_batch(GuiStore(base_dir=tmp_path), plans, reviewer="r", runner_label="R")
+    disk = tmp_path / "vcache"
+
+    args = [
+        "--store",
+        "--root",
+        str(tmp_path),
+        "--workers",
+        "1",
+        "--cache",
+        "disk",
+        "--cache-dir",
+        str(disk),
+    ]
+    assert validate_cli.main(args) == 0
+    assert len(list(disk.rglob("*.json"))) == 2
+    capsys.readouterr()
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_cli_cache_flag_does_not_leak_into_the_process(
+    tmp_path: Path, workers: str, capsys: pytest.CaptureFixture
+) -> None:
+    plans = make_run_plans([("T1", "a", "")])
+    persist_plan_batch(GuiStore(base_dir=tmp_path), plans, reviewer="r", runner_label="R")
+    disk = tmp_path / "vcache"
+
+    args = ["--store", "--root", str(tmp_path), "--workers", workers, "--cache-dir", str(disk)]
+    assert validate_cli.main(args) == 0
+    assert len(list(disk.rglob("*.json"))) == 1
+    assert VALIDATION_CACHE_ENV not in os.environ and VALIDATION_CACHE_DIR_ENV not in os.environ
+    assert active_validation_cache() is None  # later in-process validation stays uncached
+    capsys.readouterr()
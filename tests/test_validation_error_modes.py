@@ -0,0 +1,115 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.gui.planner import make_run_plans, persist_plan_batch
+from app.gui.store import GuiStore
+from app.validation import validate_cli
+from app.validation.schema_validation import (
+    SchemaIssue,
+    SchemaValidationError,
+    validate_many,
+    validate_payload,
+)
+from app.validation.validation_cache import configure_validation_cache, reset_validation_cache
+from app.validation.vendor_schema_loader import VendorSchemaErrors, validate_against_vendor_schema
+
+
+def _handoff(tmp_path: Path) -> dict:
+    plans = make_run_plans([("T1", "t", "")])
+    res = persist_plan_batch(GuiStore(base_dir=tmp_path), plans, reviewer="r", runner_label="R")
+    return json.loads(res.handoffs[0].body)
+
+
+def _broken(tmp_path: Path) -> dict:
+    bad = dict(_handoff(tmp_path), commands=["ok", 7], surprise=True, notes=3)
+    del bad["runner_label"]
+    return bad
+
+
+def test_fail_fast_reports_one_structured_issue(tmp_path: Path) -> None:
+    with pytest.raises(SchemaValidationError) as e:
+        validate_payload(_broken(tmp_path))
+
+    (issue,) = e.value.issues
+    assert issue.keyword in {"required", "type", "additionalProperties"}
+    assert issue.message in str(e.value)
+
+
+def test_collect_n_finds_every_error_in_one_pass(tmp_path: Path) -> None:
+    bad = _broken(tmp_path)
+
+    with pytest.raises(SchemaValidationError) as two:
+        validate_payload(bad, max_errors=2)
+    assert len(two.value.issues) == 2
+    assert str(two.value) == two.value.issues[0].message + " (+1 more)"
+
+    with pytest.raises(SchemaValidationError) as every:
+        validate_payload(bad, max_errors=None)
+    by_keyword = {(i.keyword, i.path) for i in every.value.issues}
+    assert ("type", "/commands/1") in by_keyword
+    assert ("type", "/notes") in by_keyword
+    assert ("required", "") in by_keyword
+    assert ("additionalProperties", "") in by_keyword
+    assert ("payload_sha256", "/payload_sha256") in by_keyword
+    assert all(
+        i.schema_path.startswith("/") for i in every.value.issues if i.keyword != "payload_sha256"
+    )
+
+
+def test_collect_mode_on_valid_payload_passes(tmp_path: Path) -> None:
+    validate_payload(_handoff(tmp_path), max_errors=None)
+
+
+def test_validate_many_and_issue_round_trip(tmp_path: Path) -> None:
+    good, bad = _handoff(tmp_path / "a"), _broken(tmp_path / "b")
+
+    res = validate_many([good, bad, []], max_errors=None)
+
+    assert res[0].ok and res[0].issues == ()
+    assert len(res[1].issues) >= 5
+    assert res[2].issues == (SchemaIssue("payload must be an object", keyword="type"),)
+    assert [SchemaIssue.from_dict(i.to_dict()) for i in res[1].issues] == list(res[1].issues)
+
+
+def test_vendor_loader_collect_mode(tmp_path: Path) -> None:
+    with pytest.raises(VendorSchemaErrors) as e:
+        validate_against_vendor_schema(_broken(tmp_path), max_errors=3)
+    assert len(e.value.errors) == 3
+    assert str(e.value).endswith("(+2 more)")
+
+
+def test_bad_budget_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        validate_payload(_handoff(tmp_path), max_errors=0)
+
+
+def test_memoized_verdicts_keep_issues(tmp_path: Path) -> None:
+    bad = _broken(tmp_path)
+    configure_validation_cache(disk_dir=tmp_path / "vcache")
+    try:
+        for _ in range(2):
+            with pytest.raises(SchemaValidationError) as e:
+                validate_payload(bad, max_errors=None)
+            assert len(e.value.issues) >= 5
+        with pytest.raises(SchemaValidationError) as fast:
+            validate_payload(bad)
+        assert len(fast.value.issues) == 1
+    finally:
+        reset_validation_cache()
+
+
+def test_cli_max_errors(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    (inbox / "bad.json").write_text(json.dumps(_broken(tmp_path / "s")), encoding="utf-8")
+
+    assert validate_cli.main(["--dir", str(inbox), "--workers", "1"]) == 1
+    (one,) = [json.loads(x) for x in capsys.readouterr().out.splitlines()]
+    assert validate_cli.main(["--dir", str(inbox), "--workers", "1", "--max-errors", "0"]) == 1
+    (every,) = [json.loads(x) for x in capsys.readouterr().out.splitlines()]
+
+    assert len(one["issues"]) == 1
+    assert len(every["issues"]) >= 5
+    assert {"message", "path", "keyword", "schema_path"} == set(every["issues"][0])
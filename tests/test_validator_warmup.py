@@ -0,0 +1,124 @@
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from app.validation import schema_catalog
+from app.validation import vendor_schema_loader as vsl
+from app.validation import warmup
+
+SCHEMA = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "title": "Widget",
+    "type": "object",
+    "required": ["contract"],
+    "properties": {"contract": {"type": "string"}},
+}
+
+
+@pytest.fixture()
+def schema_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "schemas"
+    for contract in ("widget/1.0", "gadget/2.1"):
+        p = root / f"{contract}.schema.json"
+        p.parent.mkdir(parents=True)
+        p.write_text(json.dumps(dict(SCHEMA, title=contract)), encoding="utf-8")
+    # Not a contract (no title or $id): catalogued but not compiled.
+    (root / "README.json").write_text(json.dumps({"$schema": SCHEMA["$schema"]}), encoding="utf-8")
+
+    monkeypatch.setenv(schema_catalog.CATALOG_DIR_ENV, str(tmp_path / "catalog"))
+    schema_catalog.clear_catalog_cache()
+    vsl.clear_validator_cache()
+    warmup.reset_warmup()
+    yield root
+    warmup.wait_for_warmup()
+    warmup.reset_warmup()
+    vsl.clear_validator_cache()
+
+
+def test_warm_validators_compiles_every_catalog_contract(
+    schema_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    res = warmup.warm_validators(schema_root)
+
+    assert sorted(res.compiled) == ["gadget/2.1", "widget/1.0"]
+    assert res.failed == {} and res.schema_root == str(schema_root.resolve())
+
+    def _no_compile(*a, **k):
+        raise AssertionError("validator compiled again after warm-up")
+
+    monkeypatch.setattr(vsl, "_compile_vendor_validator", _no_compile)
+    vsl.compile_vendor_validator("widget/1.0", schema_root).validate({"contract": "x"})
+
+
+def test_warm_list_uses_the_ids_the_resolver_matches(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    root = tmp_path / "ids"
+    (root / "contracts").mkdir(parents=True)
+    # No layout-derived id: identified only by title / by $id.
+    titled = dict(SCHEMA, title="run_handoff/1.0")
+    (root / "contracts" / "run_handoff.schema.json").write_text(
+        json.dumps(titled), encoding="utf-8"
+    )
+    with_id = {k: v for k, v in SCHEMA.items() if k != "title"}
+    with_id["$id"] = "https://schemas.example.test/order/3.0"
+    (root / "contracts" / "order.json").write_text(json.dumps(with_id), encoding="utf-8")
+    monkeypatch.setenv(schema_catalog.CATALOG_DIR_ENV, str(tmp_path / "catalog"))
+    schema_catalog.clear_catalog_cache()
+    vsl.clear_validator_cache()
+
+    res = warmup.warm_validators(root)
+
+    assert sorted(res.compiled) == ["order/3.0", "run_handoff/1.0"] and res.failed == {}
+
+    def _no_compile(*a, **k):
+        raise AssertionError("validator compiled on first use despite warm-up")
+
+    monkeypatch.setattr(vsl, "_compile_vendor_validator", _no_compile)
+    vsl.compile_vendor_validator("run_handoff/1.0", root).validate({"contract": "run_handoff/1.0"})
+    vsl.compile_vendor_validator("order/3.0", root).validate({"contract": "order/3.0"})
+    vsl.clear_validator_cache()
+
+
+def test_ids_of_one_schema_file_compile_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    root = tmp_path / "aliases"
+    (root / "contracts").mkdir(parents=True)
+    doc = dict(
+        SCHEMA, title="Invoice", **{"$id": "https://schemas.example.test/billing/invoice/1.0"}
+    )
+    (root / "contracts" / "invoice.json").write_text(json.dumps(doc), encoding="utf-8")
+    monkeypatch.setenv(schema_catalog.CATALOG_DIR_ENV, str(tmp_path / "catalog"))
+    schema_catalog.clear_catalog_cache()
+    vsl.clear_validator_cache()
+    calls = []
+    real = vsl._compile_vendor_validator
+    monkeypatch.setattr(vsl, "_compile_vendor_validator", lambda *a: calls.append(a) or real(*a))
+
+    res = warmup.warm_validators(root)
+
+    assert res.compiled == ["Invoice", "invoice/1.0"] and len(calls) == 1
+    assert vsl.compile_vendor_validator(
+        "billing/invoice/1.0", root
+    ) is vsl.compile_vendor_validator("invoice/1.0", root)
+    assert len(calls) == 1
+    vsl.clear_validator_cache()
+
+
+def test_start_warmup_runs_once_in_background(schema_root: Path) -> None:
+    t = warmup.start_warmup(schema_root)
+
+    assert t.daemon and t.name == warmup.THREAD_NAME and t is not threading.current_thread()
+    assert warmup.start_warmup(schema_root) is t
+    res = warmup.wait_for_warmup(timeout=30)
+    assert res is not None and sorted(res.compiled) == ["gadget/2.1", "widget/1.0"]
+
+
+def test_failures_are_recorded_not_raised(tmp_path: Path) -> None:
+    res = warmup.warm_validators(tmp_path / "missing")
+
+    assert res.compiled == [] and "*" in res.failed
+    assert warmup.wait_for_warmup() is None
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from app.validation import schema_catalog as sc
+from app.validation import vendor_schema_loader as vsl
+
+CONTRACT = "cache_probe/1.0"
+
+
+def _write_schema(root: Path, required: list[str]) -> Path:
+    p = root / "cache_probe" / "1.0.schema.json"
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(
+        json.dumps(
+            {
+                "$schema": "https://json-schema.org/draft/2020-12/schema",
+                "title": CONTRACT,
+                "type": "object",
+                "required": required,
+            }
+        ),
+        encoding="utf-8",
+    )
+    return p
+
+
+@pytest.fixture()
+def schema_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    vsl.clear_validator_cache()
+    schema_path = _write_schema(tmp_path, ["contract"])
+    monkeypatch.setattr(vsl, "_resolve_schema_path", lambda contract, root: schema_path)
+    yield tmp_path
+    vsl.clear_validator_cache()
+
+
+def test_compiled_validator_is_reused(schema_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    v1 = vsl.compile_vendor_validator(CONTRACT, schema_root)
+
+    def _boom(*_a, **_k):
+        raise AssertionError("registry rebuilt on cache hit")
+
+    monkeypatch.setattr(vsl, "_build_registry", _boom)
+    v2 = vsl.compile_vendor_validator(CONTRACT, schema_root)
+    assert v2 is v1
+
+    vsl.validate_against_vendor_schema({"contract": CONTRACT}, schema_root)
+
+
+def test_schema_edit_invalidates_cache(schema_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(sc.FINGERPRINT_TTL_ENV, "0")
+    v1 = vsl.compile_vendor_validator(CONTRACT, schema_root)
+    vsl.validate_against_vendor_schema({"contract": CONTRACT}, schema_root)
+
+    p = _write_schema(schema_root, ["contract", "extra"])
+    st = p.stat()
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000_000))
+
+    v2 = vsl.compile_vendor_validator(CONTRACT, schema_root)
+    assert v2 is not v1
+    with pytest.raises(Exception):
+        vsl.validate_against_vendor_schema({"contract": CONTRACT}, schema_root)
+
+
+def test_added_schema_file_invalidates_cache(
+    schema_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(sc.FINGERPRINT_TTL_ENV, "0")
+    v1 = vsl.compile_vendor_validator(CONTRACT, schema_root)
+    before = sc.schema_tree_fingerprint(schema_root)
+
+    (schema_root / "other.schema.json").write_text(
+        json.dumps({"$schema": "https://json-schema.org/draft/2020-12/schema"}), encoding="utf-8"
+    )
+
+    assert sc.schema_tree_fingerprint(schema_root)[0] == before[0] + 1
+    assert vsl.compile_vendor_validator(CONTRACT, schema_root) is not v1
+
+
+def test_cache_hit_does_not_walk_the_tree(
+    schema_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(sc.FINGERPRINT_TTL_ENV, "60")
+    v1 = vsl.compile_vendor_validator(CONTRACT, schema_root)
+    walk = sc.schema_tree_fingerprint
+
+    def _boom(*_a, **_k):
+        raise AssertionError("schema tree walked on a cache hit")
+
+    monkeypatch.setattr(sc, "schema_tree_fingerprint", _boom)
+    for _ in range(3):
+        assert vsl.compile_vendor_validator(CONTRACT, schema_root) is v1
+    monkeypatch.setattr(sc, "schema_tree_fingerprint", walk)
+
+    _write_schema(schema_root, ["contract", "extra"])
+    vsl.clear_validator_cache()  # explicit invalidation: no need to wait for the TTL
+    with pytest.raises(Exception):
+        vsl.validate_against_vendor_schema({"contract": CONTRACT}, schema_root)
@@ -0,0 +1,97 @@
+"""
+Benchmark: per-handoff hashing/serialization cost.
+
+legacy : canonical_json + sha256_hex, canonical_sha256_for_payload,
+         legacy SHA variants (validate_payload), json.dumps(indent=2) for storage
+hashed : HashedPayload (compact digest once), json.dumps(indent=2) for storage
+
+Schema validation is excluded (identical in both paths).
+
+Usage:
+  python tools/bench_handoff_hashing.py [--n 2000] [--commands 40]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+_REPO = Path(__file__).resolve().parents[1]
+for _p in (_REPO / "src", _REPO):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+import swe_bootstrap  # noqa: E402
+
+swe_bootstrap.apply()
+
+from app.validation.canonical import HashedPayload, canonical_json, sha256_hex  # noqa: E402
+from app.validation.schema_validation import (  # noqa: E402
+    _enforce_sha_policy,
+    canonical_sha256_for_payload,
+)
+
+
+def _payload(n_commands: int) -> dict:
+    return {
+        "contract": "run_handoff/1.0",
+        "created_utc": "2026-01-01T00:00:00+00:00",
+        "plan_ev_id": "E0001",
+        "approval_ev_id": "E0002",
+        "runner_label": "BENCH_RUNNER",
+        "required_gates": ["py tools\\gates.py --mode local"],
+        "commands": [f"echo step {i} " + "x" * 60 for i in range(n_commands)],
+        "statements": ["NO_EXECUTION_IN_GUI", "EXECUTION_REQUIRES_HUMAN_AUTHORITY"],
+        "notes": "bench " * 50,
+    }
+
+
+def _legacy(p: dict) -> str:
+    sha = sha256_hex(canonical_json(p))
+    payload = dict(p, payload_sha256=sha)
+    payload["payload_sha256"] = canonical_sha256_for_payload(payload)
+    _enforce_sha_policy(payload)
+    stored = dict(p, payload_sha256=sha)
+    return json.dumps(stored, ensure_ascii=False, sort_keys=True, indent=2)
+
+
+def _hashed(p: dict) -> str:
+    hashed = HashedPayload.from_payload(p)
+    payload = hashed.with_sha()
+    _enforce_sha_policy(payload, hashed)
+    return json.dumps(payload, ensure_ascii=False, sort_keys=True, indent=2)
+
+
+def _time(fn, payloads: list[dict]) -> float:
+    t0 = time.perf_counter()
+    for p in payloads:
+        fn(p)
+    return time.perf_counter() - t0
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=2000)
+    ap.add_argument("--commands", type=int, default=40)
+    args = ap.parse_args(argv)
+
+    payloads = [_payload(args.commands) for _ in range(args.n)]
+    _time(_legacy, payloads[:50])
+    _time(_hashed, payloads[:50])
+
+    t_legacy = _time(_legacy, payloads)
+    t_hashed = _time(_hashed, payloads)
+    per_legacy = t_legacy / args.n * 1e6
+    per_hashed = t_hashed / args.n * 1e6
+    print(f"handoffs={args.n} commands={args.commands}")
+    print(f"legacy_us_per_handoff={per_legacy:.1f}")
+    print(f"hashed_us_per_handoff={per_hashed:.1f}")
+    print(f"speedup={per_legacy / per_hashed:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
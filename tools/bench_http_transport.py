@@ -0,0 +1,115 @@
+"""
+Benchmark: per-request overhead of the engine HTTP path against a local stub server.
+
+per_call : a fresh httpx.Client per request (previous Engine/OllamaProvider behaviour)
+pooled   : the shared keep-alive client from app.engine.transport
+
+The stub answers /api/tags and /api/chat with small canned JSON, so the numbers
+are connection + client setup cost only (no model time).
+
+Usage:
+  python tools/bench_http_transport.py [--n 300]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+_REPO = Path(__file__).resolve().parents[1]
+for _p in (_REPO / "src", _REPO):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+import swe_bootstrap  # noqa: E402
+
+swe_bootstrap.apply()
+
+import httpx  # noqa: E402
+
+from app.engine.engine import Engine, EngineConfig  # noqa: E402
+from app.engine.transport import close_shared_client  # noqa: E402
+
+_CHAT = json.dumps(
+    {"message": {"role": "assistant", "content": '{"actions": []}'}, "done": True}
+).encode("utf-8")
+_TAGS = json.dumps({"models": [{"name": "bench"}]}).encode("utf-8")
+
+
+class _Stub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # else delayed-ACK stalls (~40 ms) swamp the numbers
+
+    def _reply(self, body: bytes) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._reply(_TAGS)
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self._reply(_CHAT)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def _per_call(host: str, n: int) -> float:
+    payload = {"model": "bench", "messages": [{"role": "user", "content": "hi"}], "stream": False}
+    t0 = time.perf_counter()
+    for _ in range(n):
+        with httpx.Client(timeout=30.0) as client:
+            client.post(host + "/api/chat", json=payload).raise_for_status()
+    return time.perf_counter() - t0
+
+
+def _pooled(host: str, n: int) -> float:
+    engine = Engine(EngineConfig(ollama_host=host, ollama_model="bench", timeout_seconds=30.0))
+    t0 = time.perf_counter()
+    for _ in range(n):
+        engine.reset()
+        engine.send_user("hi")
+    return time.perf_counter() - t0
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=300)
+    args = ap.parse_args(argv)
+    # Engine honours these; the bench must hit the stub.
+    for var in ("OLLAMA_HOST", "OLLAMA_MODEL"):
+        os.environ.pop(var, None)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        _per_call(host, 20)
+        _pooled(host, 20)
+        t_call = _per_call(host, args.n)
+        t_pool = _pooled(host, args.n)
+    finally:
+        close_shared_client()
+        server.shutdown()
+
+    per_call = t_call / args.n * 1e6
+    per_pool = t_pool / args.n * 1e6
+    print(f"requests={args.n}")
+    print(f"per_call_us_per_request={per_call:.1f}")
+    print(f"pooled_us_per_request={per_pool:.1f}")
+    print(f"speedup={per_call / per_pool:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())